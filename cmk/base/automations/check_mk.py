@@ -297,6 +297,7 @@ class AutomationDiscovery(DiscoveryAutomation):
             selected_sections=NO_SELECTION,
             keep_outdated=file_cache_options.keep_outdated,
             logger=logging.getLogger("cmk.base.discovery"),
+            write_piggyback_data=True,
         )
         fetcher = CMKFetcher(
             config_cache,
@@ -312,6 +313,7 @@ class AutomationDiscovery(DiscoveryAutomation):
             simulation_mode=config.simulation_mode,
             snmp_backend_override=None,
             password_store_file=cmk.utils.password_store.pending_password_store_path(),
+            snmp_oid_cache_max_age=config.snmp_scan_oid_cache_max_age,
         )
         for hostname in hostnames:
 
@@ -631,6 +633,7 @@ def _execute_discovery(
         selected_sections=NO_SELECTION,
         keep_outdated=file_cache_options.keep_outdated,
         logger=logging.getLogger("cmk.base.discovery"),
+        write_piggyback_data=True,
     )
 
     with (
@@ -740,6 +743,7 @@ def _execute_autodiscovery() -> tuple[Mapping[HostName, DiscoveryResult], bool]:
         selected_sections=NO_SELECTION,
         keep_outdated=file_cache_options.keep_outdated,
         logger=logging.getLogger("cmk.base.discovery"),
+        write_piggyback_data=True,
     )
     fetcher = CMKFetcher(
         config_cache,
@@ -1186,6 +1190,7 @@ class AutomationRenameHosts(Automation):
         # HW/SW Inventory
         if self._rename_host_file(var_dir + "/inventory", oldname, newname):
             self._rename_host_file(var_dir + "/inventory", oldname + ".gz", newname + ".gz")
+            self._rename_host_file(var_dir + "/inventory", oldname + ".idx", newname + ".idx")
             actions.append("inv")
 
         if self._rename_host_dir(var_dir + "/inventory_archive", oldname, newname):
@@ -1686,6 +1691,7 @@ class AutomationDeleteHosts(ABCDeleteHosts, Automation):
             f"{var_dir}/persisted/{hostname}",
             f"{var_dir}/inventory/{hostname}",
             f"{var_dir}/inventory/{hostname}.gz",
+            f"{var_dir}/inventory/{hostname}.idx",
             f"{var_dir}/agent_deployment/{hostname}",
         ]
 
@@ -1727,6 +1733,7 @@ class AutomationDeleteHostsKnownRemote(ABCDeleteHosts, Automation):
             f"{var_dir}/persisted/{hostname}",
             f"{var_dir}/inventory/{hostname}",
             f"{var_dir}/inventory/{hostname}.gz",
+            f"{var_dir}/inventory/{hostname}.idx",
         ]
 
     def _delete_host_files(self, hostname: HostName) -> None:
@@ -12,6 +12,7 @@ import itertools
 import logging
 import time
 from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
@@ -20,7 +21,7 @@ from typing import Final, Literal
 import livestatus
 
 import cmk.ccc.debug
-from cmk.ccc.exceptions import MKTimeout, OnError
+from cmk.ccc.exceptions import MKFetcherError, MKTimeout, OnError
 
 import cmk.utils.paths
 import cmk.utils.resulttype as result
@@ -60,7 +61,7 @@ from cmk.checkengine.checkresults import (
     UnsubmittableServiceCheckResult,
 )
 from cmk.checkengine.discovery import AutocheckEntry, DiscoveryPlugin, HostLabelPlugin
-from cmk.checkengine.fetcher import HostKey, SourceInfo, SourceType
+from cmk.checkengine.fetcher import FetcherType, HostKey, SourceInfo, SourceType
 from cmk.checkengine.inventory import InventoryPlugin, InventoryPluginName
 from cmk.checkengine.parameters import Parameters
 from cmk.checkengine.parser import HostSections, NO_SELECTION, parse_raw_data, SectionNameCollection
@@ -104,6 +105,7 @@ from cmk.agent_based.prediction_backend import (
 )
 from cmk.agent_based.v1 import IgnoreResults, IgnoreResultsError, Metric, State
 from cmk.agent_based.v1 import Result as CheckFunctionResult
+from cmk.piggyback import PiggybackRawDataWriter
 
 __all__ = [
     "CheckPluginMapper",
@@ -120,7 +122,13 @@ __all__ = [
 
 
 def _fetch_all(
-    sources: Iterable[Source], *, simulation: bool, file_cache_options: FileCacheOptions, mode: Mode
+    sources: Iterable[Source],
+    *,
+    simulation: bool,
+    file_cache_options: FileCacheOptions,
+    mode: Mode,
+    max_workers: int = 1,
+    source_wait_limit: float | None = None,
 ) -> Sequence[
     tuple[
         SourceInfo,
@@ -129,6 +137,15 @@ def _fetch_all(
     ]
 ]:
     console.verbose(f"{tty.yellow}+{tty.normal} FETCHING DATA")
+    if max_workers > 1:
+        return _fetch_all_concurrently(
+            sources,
+            simulation=simulation,
+            file_cache_options=file_cache_options,
+            mode=mode,
+            max_workers=max_workers,
+            source_wait_limit=source_wait_limit,
+        )
     return [
         _do_fetch(
             source.source_info(),
@@ -140,19 +157,98 @@ def _fetch_all(
     ]
 
 
+def _fetch_all_concurrently(
+    sources: Iterable[Source],
+    *,
+    simulation: bool,
+    file_cache_options: FileCacheOptions,
+    mode: Mode,
+    max_workers: int,
+    source_wait_limit: float | None,
+) -> Sequence[
+    tuple[
+        SourceInfo,
+        result.Result[AgentRawData | SNMPRawData, Exception],
+        Snapshot,
+    ]
+]:
+    """Fetch the sources in a thread pool
+
+    The results are returned in the order of the sources.  A source that has
+    not delivered within `source_wait_limit` is reported as an error and the
+    host is processed without it.  This is no timeout: the fetcher cannot be
+    interrupted and keeps running until its own timeouts (TCP, SNMP, ...) end
+    it, and the process waits for it before it exits.
+
+    """
+    source_infos = []
+    futures = []
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetcher")
+    try:
+        for source in sources:
+            source_info = source.source_info()
+            source_infos.append(source_info)
+            futures.append(
+                executor.submit(
+                    _do_fetch,
+                    source_info,
+                    source.file_cache(simulation=simulation, file_cache_options=file_cache_options),
+                    source.fetcher(),
+                    mode=mode,
+                    per_thread=True,
+                )
+            )
+        # All sources run at the same time, so every one of them gets the
+        # full budget counted from the moment they have all been submitted.
+        deadline = None if source_wait_limit is None else time.monotonic() + source_wait_limit
+        fetched: list[
+            tuple[
+                SourceInfo,
+                result.Result[AgentRawData | SNMPRawData, Exception],
+                Snapshot,
+            ]
+        ] = []
+        for source_info, future in zip(source_infos, futures):
+            try:
+                fetched.append(
+                    future.result(
+                        timeout=None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                    )
+                )
+            except TimeoutError:
+                console.verbose(
+                    f"  Source: {source_info} did not deliver within {source_wait_limit} sec"
+                )
+                fetched.append(
+                    (
+                        source_info,
+                        result.Error(
+                            MKFetcherError(
+                                f"No data within the wait limit of {source_wait_limit} seconds"
+                            )
+                        ),
+                        Snapshot.null(),
+                    )
+                )
+        return fetched
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def _do_fetch(
     source_info: SourceInfo,
     file_cache: FileCache,
     fetcher: Fetcher,
     *,
     mode: Mode,
+    per_thread: bool = False,
 ) -> tuple[
     SourceInfo,
     result.Result[AgentRawData | SNMPRawData, Exception],
     Snapshot,
 ]:
     console.debug(f"  Source: {source_info}")
-    with CPUTracker(console.debug) as tracker:
+    with CPUTracker(console.debug, per_thread=per_thread) as tracker:
         raw_data = get_raw_data(file_cache, fetcher, mode)
     return source_info, raw_data, tracker.duration
 
@@ -166,12 +262,16 @@ class CMKParser:
         selected_sections: SectionNameCollection,
         keep_outdated: bool,
         logger: logging.Logger,
+        write_piggyback_data: bool = False,
     ) -> None:
         self.factory: Final = factory
         self.selected_sections: Final = selected_sections
         self.checking_sections: Final = checking_sections
         self.keep_outdated: Final = keep_outdated
         self.logger: Final = logger
+        # Only for modes that store the piggyback data: it is then written to (hidden)
+        # files in the piggyback directory while parsing, instead of kept in memory.
+        self.write_piggyback_data: Final = write_piggyback_data
 
     def __call__(
         self,
@@ -186,9 +286,22 @@ class CMKParser:
         console.debug(f"{tty.yellow}+{tty.normal} PARSE FETCHER RESULTS")
         output: list[tuple[SourceInfo, result.Result[HostSections, Exception]]] = []
         section_cache_path = Path(cmk.utils.paths.var_dir)
+        # The piggyback data of all agent sources of a host is written to the same files
+        piggyback_writers: dict[HostKey, PiggybackRawDataWriter] = {}
         # Special agents can produce data for the same check_plugin_name on the same host, in this case
         # the section lines need to be extended
         for source, raw_data in fetched:
+            host_key = HostKey(source.hostname, source.source_type)
+            if (
+                self.write_piggyback_data
+                and source.fetcher_type is not FetcherType.SNMP
+                and host_key not in piggyback_writers
+            ):
+                piggyback_writers[host_key] = PiggybackRawDataWriter(
+                    source.hostname, cmk.utils.paths.omd_root
+                )
+            piggyback_writer = piggyback_writers.get(host_key)
+            savepoint = None if piggyback_writer is None else piggyback_writer.savepoint()
             source_result = parse_raw_data(
                 make_parser(
                     self.factory,
@@ -203,10 +316,14 @@ class CMKParser:
                     ),
                     keep_outdated=self.keep_outdated,
                     logger=self.logger,
+                    piggyback_writer=piggyback_writer,
                 ),
                 raw_data,
                 selection=self.selected_sections,
             )
+            if savepoint is not None and source_result.is_error():
+                # Like the in memory data, the piggyback data of a failed source is dropped
+                piggyback_writers[host_key].rollback(savepoint)
             output.append((source, source_result))
         return output
 
@@ -334,6 +451,9 @@ class CMKFetcher:
         simulation_mode: bool,
         max_cachefile_age: MaxAge | None = None,
         snmp_backend_override: SNMPBackendEnum | None,
+        max_workers: int = 1,
+        source_wait_limit: float | None = None,
+        snmp_oid_cache_max_age: int = 0,
     ) -> None:
         self.config_cache: Final = config_cache
         self.factory: Final = factory
@@ -347,6 +467,9 @@ class CMKFetcher:
         self.simulation_mode: Final = simulation_mode
         self.max_cachefile_age: Final = max_cachefile_age
         self.snmp_backend_override: Final = snmp_backend_override
+        self.max_workers: Final = max_workers
+        self.source_wait_limit: Final = source_wait_limit
+        self.snmp_oid_cache_max_age: Final = snmp_oid_cache_max_age
 
     def __call__(
         self, host_name: HostName, *, ip_address: HostAddress | None
@@ -413,6 +536,7 @@ class CMKFetcher:
                             ),
                             on_error=self.on_error if not is_cluster else OnError.RAISE,
                             oid_cache_dir=Path(cmk.utils.paths.snmp_scan_cache_dir),
+                            oid_cache_max_age=self.snmp_oid_cache_max_age,
                         ),
                         selected_sections=(
                             self.selected_sections if not is_cluster else NO_SELECTION
@@ -461,6 +585,8 @@ class CMKFetcher:
             simulation=self.simulation_mode,
             file_cache_options=self.file_cache_options,
             mode=self.mode,
+            max_workers=self.max_workers,
+            source_wait_limit=self.source_wait_limit,
         )
 
 
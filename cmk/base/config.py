@@ -10,6 +10,7 @@ import copy
 import dataclasses
 import enum
 import functools
+import hashlib
 import ipaddress
 import itertools
 import logging
@@ -26,7 +27,7 @@ from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Se
 from enum import Enum
 from importlib.util import MAGIC_NUMBER as _MAGIC_NUMBER
 from pathlib import Path
-from types import ModuleType
+from types import CodeType, ModuleType
 from typing import (
     Any,
     AnyStr,
@@ -651,8 +652,57 @@ class SetFolderPathDict(SetFolderPathAbstract, dict):
         return super().__setitem__(cluster_name, value)
 
 
-def _load_config_file(file_to_load: Path, into_dict: dict[str, Any]) -> None:
-    exec(compile(file_to_load.read_text(), file_to_load, "exec"), into_dict, into_dict)  # nosec B102 # BNS:aee528
+class _CompiledConfigCache:
+    """Persistent cache of the compiled code of configuration files
+
+    The entries are keyed by the path of the configuration file. They are only used
+    if mtime and size of the file and the Python magic number match.
+    """
+
+    # magic number, mtime in ns, size, seconds needed to compile
+    _HEADER = struct.Struct("<4sQQd")
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _cache_file(self, path: Path) -> Path:
+        return self._cache_dir / hashlib.sha256(str(path).encode("utf-8")).hexdigest()
+
+    def compile(self, path: Path) -> CodeType:
+        stat = path.stat()
+        cache_file = self._cache_file(path)
+        try:
+            raw = cache_file.read_bytes()
+            magic, mtime_ns, size, compile_seconds = self._HEADER.unpack_from(raw)
+            if (magic, mtime_ns, size) == (_MAGIC_NUMBER, stat.st_mtime_ns, stat.st_size):
+                code = marshal.loads(raw[self._HEADER.size :])
+                self.hits += 1
+                self.saved_seconds += compile_seconds
+                return code
+        except (OSError, struct.error, ValueError, EOFError, TypeError):
+            pass
+
+        self.misses += 1
+        start = time.perf_counter()
+        code = compile(path.read_text(), path, "exec")
+        header = self._HEADER.pack(
+            _MAGIC_NUMBER, stat.st_mtime_ns, stat.st_size, time.perf_counter() - start
+        )
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            store.save_bytes_to_file(cache_file, header + marshal.dumps(code))
+        except OSError:
+            pass
+        return code
+
+
+def _load_config_file(
+    file_to_load: Path, into_dict: dict[str, Any], compiled_config_cache: _CompiledConfigCache
+) -> None:
+    exec(compiled_config_cache.compile(file_to_load), into_dict, into_dict)  # nosec B102 # BNS:aee528
 
 
 def _load_config(with_conf_d: bool) -> set[str]:
@@ -671,10 +721,12 @@ def _load_config(with_conf_d: bool) -> set[str]:
 
     global_dict |= helper_vars
 
+    compiled_config_cache = _CompiledConfigCache(cmk.utils.paths.tmp_dir / "compiled_config")
+
     # Load assorted experimental parameters if any
     experimental_config = cmk.utils.paths.make_experimental_config_file()
     if experimental_config.exists():
-        _load_config_file(experimental_config, global_dict)
+        _load_config_file(experimental_config, global_dict, compiled_config_cache)
 
     host_storage_loaders = get_host_storage_loaders(config_storage_format)
     config_dir_path = Path(cmk.utils.paths.check_mk_config_dir)
@@ -698,7 +750,7 @@ def _load_config(with_conf_d: bool) -> set[str]:
             if path.name == "hosts.mk":
                 apply_hosts_file_to_object(path.with_suffix(""), host_storage_loaders, global_dict)
             else:
-                _load_config_file(path, global_dict)
+                _load_config_file(path, global_dict, compiled_config_cache)
 
             if not isinstance(all_hosts, SetFolderPathList):
                 raise MKGeneralException(
@@ -717,6 +769,12 @@ def _load_config(with_conf_d: bool) -> set[str]:
                 console.error(f"Cannot read in configuration file {path}: {e}", file=sys.stderr)
             sys.exit(1)
 
+    console.debug(
+        f"Compiled configuration cache: {compiled_config_cache.hits} hits,"
+        f" {compiled_config_cache.misses} misses,"
+        f" {compiled_config_cache.saved_seconds:.3f}s compile time saved"
+    )
+
     # Cleanup global helper vars
     for helper_var in helper_vars:
         del global_dict[helper_var]
@@ -2147,6 +2205,7 @@ class ConfigCache:
                     snmpv2c_hosts,
                 ),
                 bulk_walk_size_of=self._bulk_walk_size(host_name),
+                max_concurrent_walks=self._snmp_max_concurrent_walks(host_name),
                 timing=self._snmp_timing(host_name),
                 oid_range_limits={
                     SectionName(name): rule
@@ -3238,6 +3297,10 @@ class ConfigCache:
         bulk_sizes = self.ruleset_matcher.get_host_values(hostname, snmp_bulk_size)
         return bulk_sizes[0] if bulk_sizes else 10
 
+    def _snmp_max_concurrent_walks(self, hostname: HostName) -> int:
+        entries = self.ruleset_matcher.get_host_values(hostname, snmp_max_concurrent_walks)
+        return entries[0] if entries else 1
+
     def _snmp_character_encoding(self, hostname: HostName) -> str | None:
         entries = self.ruleset_matcher.get_host_values(hostname, snmp_character_encodings)
         return entries[0] if entries else None
@@ -3967,11 +4030,22 @@ class ConfigCache:
     def get_piggybacked_hosts_time_settings(
         self, piggybacked_hostname: HostName | None = None
     ) -> Sequence[tuple[str | None, str, int]]:
-        all_sources = piggyback.get_piggybacked_host_with_sources(cmk.utils.paths.omd_root)
+        # Do not list the whole piggyback tree when we are interested in one host only.
         used_sources = (
-            {m.source for sources in all_sources.values() for m in sources}
+            {
+                m.source
+                for sources in piggyback.get_piggybacked_host_with_sources(
+                    cmk.utils.paths.omd_root
+                ).values()
+                for m in sources
+            }
             if piggybacked_hostname is None
-            else {m.source for m in all_sources.get(piggybacked_hostname, [])}
+            else {
+                m.source
+                for m in piggyback.get_piggyback_meta_data(
+                    piggybacked_hostname, cmk.utils.paths.omd_root
+                )
+            }
         )
 
         return [
@@ -4160,6 +4234,7 @@ class ParserFactory:
         *,
         keep_outdated: bool,
         logger: logging.Logger,
+        piggyback_writer: piggyback.PiggybackRawDataWriter | None = None,
     ) -> AgentParser:
         return AgentParser(
             host_name,
@@ -4169,6 +4244,7 @@ class ParserFactory:
             translation=get_piggyback_translations(self._ruleset_matcher, host_name),
             encoding_fallback=fallback_agent_output_encoding,
             logger=logger,
+            piggyback_writer=piggyback_writer,
         )
 
     def make_snmp_parser(
@@ -4726,6 +4802,7 @@ def get_ruleset_id_mapping() -> Mapping[int, str]:
         id(non_inline_snmp_hosts): "non_inline_snmp_hosts",
         id(snmp_limit_oid_range): "snmp_limit_oid_range",
         id(snmp_bulk_size): "snmp_bulk_size",
+        id(snmp_max_concurrent_walks): "snmp_max_concurrent_walks",
         id(snmp_communities): "snmp_communities",
         id(snmp_timing): "snmp_timing",
         id(snmp_character_encodings): "snmp_character_encodings",
@@ -11,11 +11,17 @@ from ._create_config import (
     create_nagios_host_spec,
     create_nagios_servicedefs,
     format_nagios_object,
+    HostConfig,
     NagiosConfig,
     NagiosCore,
 )
 from ._host_check_config import HostCheckConfig
-from ._precompile_host_checks import dump_precompiled_hostcheck, HostCheckStore, PrecompileMode
+from ._precompile_host_checks import (
+    dump_precompiled_hostcheck,
+    HostCheckStore,
+    precompile_hostchecks,
+    PrecompileMode,
+)
 
 __all__ = [
     "create_config",
@@ -25,8 +31,10 @@ __all__ = [
     "dump_precompiled_hostcheck",
     "format_nagios_object",
     "HostCheckConfig",
+    "HostConfig",
     "HostCheckStore",
     "NagiosConfig",
     "NagiosCore",
+    "precompile_hostchecks",
     "PrecompileMode",
 ]
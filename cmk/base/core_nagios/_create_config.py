@@ -5,17 +5,22 @@
 """Code for support of Nagios (and compatible) cores"""
 
 import base64
+import hashlib
 import itertools
+import pickle
 import socket
 import sys
 from collections import Counter
 from collections.abc import Mapping, Sequence
 from contextlib import suppress
+from dataclasses import dataclass
 from io import StringIO
+from pathlib import Path
 from typing import Any, cast, IO, Literal
 
+import cmk.ccc.version as cmk_version
 from cmk.ccc import store
-from cmk.ccc.exceptions import MKGeneralException
+from cmk.ccc.exceptions import MKGeneralException, MKIPAddressLookupError
 
 import cmk.utils.config_path
 import cmk.utils.paths
@@ -25,6 +30,7 @@ from cmk.utils.hostaddress import HostAddress, HostName, Hosts
 from cmk.utils.ip_lookup import IPStackConfig
 from cmk.utils.labels import Labels
 from cmk.utils.licensing.handler import LicensingHandler
+from cmk.utils.log import console
 from cmk.utils.macros import replace_macros_in_str
 from cmk.utils.notify import NotificationHostConfig, write_notify_host_file
 from cmk.utils.servicename import MAX_SERVICE_NAME_LEN, ServiceName
@@ -42,6 +48,7 @@ from cmk.base.core_config import (
     get_tags_with_groups_from_attributes,
 )
 
+from ._parallel import map_forked
 from ._precompile_host_checks import precompile_hostchecks, PrecompileMode
 
 _ContactgroupName = str
@@ -67,7 +74,9 @@ class NagiosCore(core_config.MonitoringCore):
         hosts_to_update: set[HostName] | None = None,
     ) -> None:
         self._config_cache = config_cache
-        self._create_core_config(config_path, licensing_handler, passwords, ip_address_of)
+        self._create_core_config(
+            config_path, licensing_handler, passwords, ip_address_of, hosts_to_update
+        )
         self._precompile_hostchecks(
             config_path,
             config.legacy_check_plugin_names,
@@ -83,6 +92,7 @@ class NagiosCore(core_config.MonitoringCore):
         licensing_handler: LicensingHandler,
         passwords: Mapping[str, str],
         ip_address_of: config.IPLookup,
+        hosts_to_update: set[HostName] | None,
     ) -> None:
         """Tries to create a new Checkmk object configuration file for the Nagios core
 
@@ -91,11 +101,17 @@ class NagiosCore(core_config.MonitoringCore):
 
         The user can then start the site with the old configuration and fix the configuration issue
         while the monitoring is running.
+
+        If only some hosts need to be updated, the objects of all other hosts are taken from the
+        last configuration.
         """
 
         config_buffer = StringIO()
         hosts_config = self._config_cache.hosts_config
-        create_config(
+        host_config_store = HostConfigStore(
+            Path(cmk.utils.paths.var_dir, "core", "nagios_host_configs")
+        )
+        host_configs = create_config(
             config_buffer,
             config_path,
             self._config_cache,
@@ -109,9 +125,13 @@ class NagiosCore(core_config.MonitoringCore):
             licensing_handler=licensing_handler,
             passwords=passwords,
             ip_address_of=ip_address_of,
+            hosts_to_update=hosts_to_update,
+            previous_host_configs=None if hosts_to_update is None else host_config_store.load(),
+            processes=config.config_generation_processes,
         )
 
         store.save_text_to_file(cmk.utils.paths.nagios_objects_file, config_buffer.getvalue())
+        host_config_store.save(host_configs)
 
     def _precompile_hostchecks(
         self,
@@ -129,6 +149,7 @@ class NagiosCore(core_config.MonitoringCore):
             legacy_check_plugin_names,
             legacy_check_plugin_files,
             precompile_mode=precompile_mode,
+            processes=config.config_generation_processes,
         )
         with suppress(IOError):
             print(tty.ok + "\n", end="", flush=True, file=sys.stdout)
@@ -174,6 +195,48 @@ def _validate_licensing(
         raise MKGeneralException(block_effect.message_raw)
 
 
+@dataclass(frozen=True)
+class HostConfig:
+    """The objects of a host and everything they need to be defined globally"""
+
+    fingerprint: str
+    objects: str
+    notification_config: NotificationHostConfig
+    num_services: int
+    warnings: Sequence[str]
+    failed_ip_lookups: Mapping[HostName, str]
+    hostgroups: frozenset[HostgroupName]
+    servicegroups: frozenset[ServicegroupName]
+    contactgroups: frozenset[_ContactgroupName]
+    checknames: frozenset[CheckPluginName]
+    active_checks: Mapping[str, str]
+    custom_commands: frozenset[CoreCommandName]
+    hostcheck_commands: Sequence[tuple[CoreCommand, str]]
+
+
+class HostConfigStore:
+    """The host configs of the last created configuration
+
+    They are discarded if they were created by another Checkmk version.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def load(self) -> Mapping[HostName, HostConfig]:
+        try:
+            version, host_configs = pickle.loads(self._path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return {}
+        return host_configs if version == cmk_version.__version__ else {}
+
+    def save(self, host_configs: Mapping[HostName, HostConfig]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        store.save_bytes_to_file(
+            self._path, pickle.dumps((cmk_version.__version__, dict(host_configs)))
+        )
+
+
 def create_config(
     outfile: IO[str],
     config_path: VersionedConfigPath,
@@ -182,21 +245,99 @@ def create_config(
     licensing_handler: LicensingHandler,
     passwords: Mapping[str, str],
     ip_address_of: config.IPLookup,
-) -> None:
+    hosts_to_update: set[HostName] | None = None,
+    previous_host_configs: Mapping[HostName, HostConfig] | None = None,
+    processes: int = 1,
+) -> Mapping[HostName, HostConfig]:
+    """Create the objects of all hosts
+
+    The objects of the previous host configs are reused, unless the host has to be updated or
+    the fingerprint of the host changed. The objects of the other hosts are created by the given
+    number of worker processes.
+    """
     cfg = NagiosConfig(outfile, hostnames)
 
     _output_conf_header(cfg)
 
-    licensing_counter = Counter("services")
-    all_notify_host_configs: dict[HostName, NotificationHostConfig] = {}
+    outdated_hosts = (
+        set(hostnames)
+        if hosts_to_update is None or previous_host_configs is None
+        else _hosts_affected_by(config_cache, hosts_to_update)
+    )
+    # The objects of a host may refer to other hosts and to stored passwords
+    global_fingerprint = _fingerprint((hostnames, sorted(passwords.items())))
+
+    reusable_host_configs: dict[HostName, HostConfig] = {}
+    hosts_to_regenerate: list[tuple[HostName, ObjectAttributes, str]] = []
     for hostname in hostnames:
-        all_notify_host_configs[hostname] = _create_nagios_config_host(
-            cfg, config_cache, hostname, passwords, licensing_counter, ip_address_of
+        host_attrs = config_cache.get_host_attributes(hostname, ip_address_of)
+        fingerprint = _fingerprint(
+            (
+                sorted(host_attrs.items()),
+                _autochecks_stats(config_cache, hostname),
+                global_fingerprint,
+            )
         )
+        if (
+            hostname in outdated_hosts
+            or previous_host_configs is None
+            or (host_config := previous_host_configs.get(hostname)) is None
+            or host_config.fingerprint != fingerprint
+            # Retry the IP lookups
+            or host_config.failed_ip_lookups
+        ):
+            hosts_to_regenerate.append((hostname, host_attrs, fingerprint))
+        else:
+            reusable_host_configs[hostname] = host_config
+
+    regenerated_host_configs = {
+        hostname: result
+        for (hostname, _attrs, _fp), result in zip(
+            hosts_to_regenerate,
+            map_forked(
+                lambda args: _create_nagios_config_host(
+                    config_cache, hostnames, *args, passwords, ip_address_of
+                ),
+                hosts_to_regenerate,
+                processes,
+            ),
+        )
+    }
+    regenerated_hosts = list(regenerated_host_configs)
+
+    licensing_counter = Counter("services")
+    host_configs: dict[HostName, HostConfig] = {}
+    for hostname in hostnames:
+        if hostname in reusable_host_configs:
+            host_config = reusable_host_configs[hostname]
+            for warning in host_config.warnings:
+                config_warnings.warn(warning)
+        elif isinstance(result := regenerated_host_configs[hostname], Exception):
+            raise result
+        else:
+            host_config = result
+            # Already shown while creating the objects
+            config_warnings.g_configuration_warnings.extend(host_config.warnings)
+            _report_failed_ip_lookups(ip_address_of, host_config.failed_ip_lookups)
+
+        _add_host_config(cfg, host_config)
+        licensing_counter["services"] += host_config.num_services
+        host_configs[hostname] = host_config
+
+    console.verbose(
+        f"Regenerated the objects of {len(regenerated_hosts)} of {len(hostnames)} hosts"
+    )
+    console.debug(f"Regenerated hosts: {', '.join(regenerated_hosts)}")
 
     _validate_licensing(config_cache.hosts_config, licensing_handler, licensing_counter)
 
-    write_notify_host_file(config_path, all_notify_host_configs)
+    write_notify_host_file(
+        config_path,
+        {
+            hostname: host_config.notification_config
+            for hostname, host_config in host_configs.items()
+        },
+    )
 
     _create_nagios_config_contacts(cfg, hostnames)
     _create_nagios_config_hostgroups(cfg)
@@ -209,6 +350,54 @@ def create_config(
         cfg.write("\n# extra_nagios_conf\n\n")
         cfg.write(config.extra_nagios_conf)
 
+    return host_configs
+
+
+def _fingerprint(data: object) -> str:
+    return hashlib.sha256(repr(data).encode("utf-8")).hexdigest()
+
+
+def _hosts_affected_by(config_cache: ConfigCache, hostnames: set[HostName]) -> set[HostName]:
+    # Clusters depend on the services of their nodes and vice versa
+    return (
+        hostnames
+        | {cluster for hostname in hostnames for cluster in config_cache.clusters_of(hostname)}
+        | {node for hostname in hostnames for node in config_cache.nodes(hostname)}
+    )
+
+
+def _autochecks_stats(
+    config_cache: ConfigCache, hostname: HostName
+) -> Sequence[tuple[HostName, int, int] | HostName]:
+    stats: list[tuple[HostName, int, int] | HostName] = []
+    for name in (hostname, *config_cache.nodes(hostname)):
+        try:
+            stat = Path(cmk.utils.paths.autochecks_dir, f"{name}.mk").stat()
+        except FileNotFoundError:
+            stats.append(name)
+        else:
+            stats.append((name, stat.st_mtime_ns, stat.st_size))
+    return stats
+
+
+def _report_failed_ip_lookups(
+    ip_address_of: config.IPLookup, failed_ip_lookups: Mapping[HostName, str]
+) -> None:
+    if isinstance(ip_address_of, config.ConfiguredIPLookup):
+        for hostname, message in failed_ip_lookups.items():
+            ip_address_of.error_handler(hostname, MKIPAddressLookupError(message))
+
+
+def _add_host_config(cfg: NagiosConfig, host_config: HostConfig) -> None:
+    cfg.write(host_config.objects)
+    cfg.hostgroups_to_define.update(host_config.hostgroups)
+    cfg.servicegroups_to_define.update(host_config.servicegroups)
+    cfg.contactgroups_to_define.update(host_config.contactgroups)
+    cfg.checknames_to_define.update(host_config.checknames)
+    cfg.active_checks_to_define.update(host_config.active_checks)
+    cfg.custom_commands_to_define.update(host_config.custom_commands)
+    cfg.hostcheck_commands_to_define.extend(host_config.hostcheck_commands)
+
 
 def _output_conf_header(cfg: NagiosConfig) -> None:
     cfg.write(
@@ -221,26 +410,38 @@ def _output_conf_header(cfg: NagiosConfig) -> None:
 
 
 def _create_nagios_config_host(
-    cfg: NagiosConfig,
     config_cache: ConfigCache,
+    hostnames: Sequence[HostName],
     hostname: HostName,
+    host_attrs: ObjectAttributes,
+    fingerprint: str,
     stored_passwords: Mapping[str, str],
-    license_counter: Counter,
     ip_address_of: config.IPLookup,
-) -> NotificationHostConfig:
-    cfg.write("\n# ----------------------------------------------------\n")
-    cfg.write("# %s\n" % hostname)
-    cfg.write("# ----------------------------------------------------\n")
+) -> HostConfig:
+    objects = StringIO()
+    host_cfg = NagiosConfig(objects, hostnames)
+    license_counter = Counter("services")
+    num_warnings = len(config_warnings.g_configuration_warnings)
+    failed_ip_lookups = ip_lookup.CollectFailedHosts()
+    if isinstance(ip_address_of, config.ConfiguredIPLookup):
+        # The failures are returned with the host config, like the warnings. The error handler
+        # of a forked worker process would not reach the parent process.
+        ip_address_of = config.ConfiguredIPLookup(config_cache, error_handler=failed_ip_lookups)
+
+    host_cfg.write("\n# ----------------------------------------------------\n")
+    host_cfg.write("# %s\n" % hostname)
+    host_cfg.write("# ----------------------------------------------------\n")
 
-    host_attrs = config_cache.get_host_attributes(hostname, ip_address_of)
     if config.generate_hostconf:
-        host_spec = create_nagios_host_spec(cfg, config_cache, hostname, host_attrs, ip_address_of)
-        cfg.write(format_nagios_object("host", host_spec))
+        host_spec = create_nagios_host_spec(
+            host_cfg, config_cache, hostname, host_attrs, ip_address_of
+        )
+        host_cfg.write(format_nagios_object("host", host_spec))
 
-    return NotificationHostConfig(
+    notification_config = NotificationHostConfig(
         host_labels=get_labels_from_attributes(list(host_attrs.items())),
         service_labels=create_nagios_servicedefs(
-            cfg,
+            host_cfg,
             config_cache,
             hostname,
             host_attrs,
@@ -251,6 +452,27 @@ def _create_nagios_config_host(
         tags=get_tags_with_groups_from_attributes(list(host_attrs.items())),
     )
 
+    warnings = config_warnings.g_configuration_warnings[num_warnings:]
+    del config_warnings.g_configuration_warnings[num_warnings:]
+
+    return HostConfig(
+        fingerprint=fingerprint,
+        objects=objects.getvalue(),
+        notification_config=notification_config,
+        num_services=license_counter["services"],
+        warnings=warnings,
+        failed_ip_lookups={
+            hostname: str(exc) for hostname, exc in failed_ip_lookups.failed_ip_lookups.items()
+        },
+        hostgroups=frozenset(host_cfg.hostgroups_to_define),
+        servicegroups=frozenset(host_cfg.servicegroups_to_define),
+        contactgroups=frozenset(host_cfg.contactgroups_to_define),
+        checknames=frozenset(host_cfg.checknames_to_define),
+        active_checks=host_cfg.active_checks_to_define,
+        custom_commands=frozenset(host_cfg.custom_commands_to_define),
+        hostcheck_commands=host_cfg.hostcheck_commands_to_define,
+    )
+
 
 def create_nagios_host_spec(  # pylint: disable=too-many-branches
     cfg: NagiosConfig,
@@ -290,7 +512,8 @@ def create_nagios_host_spec(  # pylint: disable=too-many-branches
             host_spec[key] = value
 
     def host_check_via_service_status(service: ServiceName) -> CoreCommand:
-        command = "check-mk-host-custom-%d" % (len(cfg.hostcheck_commands_to_define) + 1)
+        # Named after the host, the objects of every host are created independently.
+        command = f"check-mk-host-custom-{hostname}"
         service_with_hostname = replace_macros_in_str(
             service,
             {"$HOSTNAME$": hostname},
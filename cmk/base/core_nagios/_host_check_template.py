@@ -69,17 +69,17 @@ def _simple_arg_parsing(executable: str, *opts: str) -> tuple[int, bool]:
     return j_opts.count("v"), "d" in j_opts
 
 
-def main() -> int:
+def main(host_check_config: HostCheckConfig = CONFIG) -> int:
     loglevel, debug = _simple_arg_parsing(*sys.argv)
 
-    if CONFIG.verify_site_python and not sys.executable.startswith("/omd"):
+    if host_check_config.verify_site_python and not sys.executable.startswith("/omd"):
         sys.stdout.write("ERROR: Only executable with sites python\\n")
         return 2
 
-    if CONFIG.delay_precompile:
-        _self_compile(CONFIG.src, CONFIG.dst)
+    if host_check_config.delay_precompile:
+        _self_compile(host_check_config.src, host_check_config.dst)
 
-    for location in CONFIG.locations:
+    for location in host_check_config.locations:
         module = import_module(location.module)
         if location.name is not None:
             register_plugin_by_type(location, getattr(module, location.name), validate=debug)
@@ -91,18 +91,18 @@ def main() -> int:
     if debug:
         cmk.ccc.debug.enable()
 
-    config.load_checks(check_api.get_check_api_context, CONFIG.checks_to_load)
+    config.load_checks(check_api.get_check_api_context, host_check_config.checks_to_load)
 
     config.load_packed_config(LATEST_CONFIG)
 
-    config.ipaddresses = CONFIG.ipaddresses
-    config.ipv6addresses = CONFIG.ipv6addresses
+    config.ipaddresses = host_check_config.ipaddresses
+    config.ipv6addresses = host_check_config.ipv6addresses
 
     try:
         return mode_check(
             get_submitter,
             {},
-            [CONFIG.hostname],
+            [host_check_config.hostname],
             active_check_handler=lambda *args: None,
             keepalive=False,
             precompiled_host_check=True,
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Copyright (C) 2019 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Distribute the per host work of the config generation to forked processes
+
+The workers are forked after the configuration has been loaded, so they share the
+initialized ConfigCache with the parent process (copy-on-write).
+"""
+
+import multiprocessing
+import pickle
+from collections.abc import Callable, Sequence
+from multiprocessing.connection import Connection
+from typing import TypeVar
+
+from cmk.ccc.exceptions import MKGeneralException
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def map_forked(
+    function: Callable[[_T], _R], items: Sequence[_T], processes: int
+) -> Sequence[_R | Exception]:
+    """Apply the function to all items
+
+    Each worker process handles a contiguous shard of the items. The results are returned in the
+    order of the items. An exception raised for an item is returned in place of its result.
+    Without worker processes, the items are processed only up to the first exception, so the
+    results end with it.
+    """
+    if processes <= 1 or len(items) <= 1:
+        results: list[_R | Exception] = []
+        for item in items:
+            results.append(result := _apply(function, item))
+            if isinstance(result, Exception):
+                break
+        return results
+
+    context = multiprocessing.get_context("fork")
+    shard_size = -(-len(items) // processes)
+    workers: list[tuple[multiprocessing.process.BaseProcess, Connection]] = []
+    for start in range(0, len(items), shard_size):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_run_shard,
+            args=(function, items[start : start + shard_size], sender),
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        workers.append((process, receiver))
+
+    results = []
+    for process, receiver in workers:
+        with receiver:
+            try:
+                results.extend(receiver.recv())
+            except EOFError:
+                process.join()
+                raise MKGeneralException(
+                    f"Worker process {process.pid} died (exit code: {process.exitcode})"
+                )
+        process.join()
+    return results
+
+
+def _apply(function: Callable[[_T], _R], item: _T) -> _R | Exception:
+    try:
+        return function(item)
+    except Exception as e:
+        return e
+
+
+def _run_shard(function: Callable[[_T], _R], shard: Sequence[_T], sender: Connection) -> None:
+    results = [_apply(function, item) for item in shard]
+    with sender:
+        try:
+            sender.send(results)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            # Not every exception survives the trip to the parent process
+            sender.send(
+                [MKGeneralException(str(r)) if isinstance(r, Exception) else r for r in results]
+            )
@@ -12,15 +12,18 @@ in adhoc mode (about 75%).
 """
 
 import enum
+import hashlib
 import itertools
 import os
 import py_compile
 import re
 import socket
 import sys
+import time
 from collections.abc import Mapping
+from dataclasses import replace
 from pathlib import Path
-from typing import assert_never
+from typing import assert_never, NoReturn
 
 from cmk.ccc import store
 
@@ -45,6 +48,7 @@ from cmk.base.config import ConfigCache, FilterMode, lookup_ip_address, save_pac
 from cmk.discover_plugins import PluginLocation
 
 from ._host_check_config import HostCheckConfig
+from ._parallel import map_forked
 
 _TEMPLATE_FILE = Path(__file__).parent / "_host_check_template.py"
 
@@ -53,6 +57,30 @@ _INSTANTIATION_PATTERN = re.compile(
     re.DOTALL,
 )
 
+_STUB_TEMPLATE = """#!/usr/bin/env python3
+# Host check of {hostname}, the checks are run by the shared module of its plug-ins
+import sys
+from dataclasses import replace
+from importlib import import_module
+
+sys.path.insert(0, {module_dir!r})
+_SHARED = import_module({module_name!r})
+
+if __name__ == "__main__":
+    sys.exit(
+        _SHARED.main(
+            replace(
+                _SHARED.CONFIG,
+                src={src!r},
+                dst={dst!r},
+                ipaddresses={ipaddresses!r},
+                ipv6addresses={ipv6addresses!r},
+                hostname={hostname!r},
+            )
+        )
+    )
+"""
+
 
 class PrecompileMode(enum.Enum):
     DELAYED = enum.auto()
@@ -72,6 +100,37 @@ class HostCheckStore:
         path = HostCheckStore.host_check_file_path(config_path, hostname)
         return path.with_suffix(path.suffix + ".py")
 
+    @staticmethod
+    def shared_module_dir(config_path: VersionedConfigPath) -> Path:
+        return Path(config_path) / "host_check_modules"
+
+    @staticmethod
+    def shared_module_source_file_path(config_path: VersionedConfigPath, module_name: str) -> Path:
+        return HostCheckStore.shared_module_dir(config_path) / f"{module_name}.py"
+
+    def write_shared_module(
+        self,
+        config_path: VersionedConfigPath,
+        module_name: str,
+        source: str,
+        *,
+        precompile_mode: PrecompileMode,
+    ) -> None:
+        source_filename = self.shared_module_source_file_path(config_path, module_name)
+
+        store.makedirs(source_filename.parent)
+
+        store.save_text_to_file(source_filename, source)
+
+        # Delayed: the bytecode is cached in __pycache__ when the module is imported first.
+        match precompile_mode:
+            case PrecompileMode.DELAYED:
+                pass
+            case PrecompileMode.INSTANT:
+                py_compile.compile(file=str(source_filename), doraise=True)
+            case other:
+                assert_never(other)
+
     def write(
         self,
         config_path: VersionedConfigPath,
@@ -102,8 +161,6 @@ class HostCheckStore:
             case other:
                 assert_never(other)
 
-        console.verbose(f" ==> {compiled_filename}.", file=sys.stderr)
-
 
 def precompile_hostchecks(
     config_path: VersionedConfigPath,
@@ -112,48 +169,138 @@ def precompile_hostchecks(
     legacy_check_plugin_files: Mapping[str, str],
     *,
     precompile_mode: PrecompileMode,
+    processes: int = 1,
 ) -> None:
+    """Write a shared module per set of needed plug-ins and a host check stub per host
+
+    The stubs only bind the host specific data and call their shared module.
+    """
     console.verbose("Creating precompiled host check config...")
     hosts_config = config_cache.hosts_config
 
     save_packed_config(config_path, config_cache)
 
     console.verbose("Precompiling host checks...")
+    start_time = time.monotonic()
 
-    host_check_store = HostCheckStore()
-    for hostname in {
+    hostnames = sorted(
         # Inconsistent with `create_config` above.
         hn
-        for hn in itertools.chain(hosts_config.hosts, hosts_config.clusters)
+        for hn in set(itertools.chain(hosts_config.hosts, hosts_config.clusters))
         if config_cache.is_active(hn) and config_cache.is_online(hn)
-    }:
-        try:
-            console.verbose_no_lf(
-                f"{tty.bold}{tty.blue}{hostname:<16}{tty.normal}:", file=sys.stderr
-            )
-            host_check = dump_precompiled_hostcheck(
+    )
+    host_check_configs: dict[HostName, HostCheckConfig] = {}
+    for hostname, result in zip(
+        hostnames,
+        map_forked(
+            lambda hostname: _make_host_check_config(
                 config_cache,
                 config_path,
                 hostname,
                 legacy_check_plugin_names,
                 legacy_check_plugin_files,
                 precompile_mode=precompile_mode,
-            )
-            if host_check is None:
-                console.verbose("(no Checkmk checks)")
-                continue
+            ),
+            hostnames,
+            processes,
+        ),
+    ):
+        if isinstance(result, Exception):
+            _handle_precompile_error(hostname, result)
+        if result is not None:
+            host_check_configs[hostname] = result
 
-            host_check_store.write(
-                config_path, hostname, host_check, precompile_mode=precompile_mode
-            )
-        except Exception as e:
-            if cmk.ccc.debug.enabled():
-                raise
-            console.error(f"Error precompiling checks for host {hostname}: {e}", file=sys.stderr)
-            sys.exit(5)
+    host_check_store = HostCheckStore()
+    module_names: dict[HostName, str] = {}
+    for hostname, host_check_config in host_check_configs.items():
+        shared_config = _shared_host_check_config(host_check_config)
+        module_name = _shared_module_name(shared_config)
+        if module_name not in module_names.values():
+            try:
+                host_check_store.write_shared_module(
+                    config_path,
+                    module_name,
+                    _instantiate_template(shared_config),
+                    precompile_mode=precompile_mode,
+                )
+            except Exception as e:
+                _handle_precompile_error(hostname, e)
+        module_names[hostname] = module_name
+
+    for hostname, result in zip(
+        module_names,
+        map_forked(
+            lambda hostname: host_check_store.write(
+                config_path,
+                hostname,
+                _make_host_check_stub(
+                    config_path, module_names[hostname], host_check_configs[hostname]
+                ),
+                precompile_mode=precompile_mode,
+            ),
+            list(module_names),
+            processes,
+        ),
+    ):
+        if isinstance(result, Exception):
+            _handle_precompile_error(hostname, result)
+
+    disk_usage = _disk_usage(
+        Path(config_path) / "host_checks", host_check_store.shared_module_dir(config_path)
+    )
+    console.verbose(
+        f"Precompiled {len(module_names)} host check stubs and"
+        f" {len(set(module_names.values()))} shared modules"
+        f" in {time.monotonic() - start_time:.2f}s ({disk_usage} bytes)"
+    )
+
+
+def _handle_precompile_error(hostname: HostName, e: Exception) -> NoReturn:
+    if cmk.ccc.debug.enabled():
+        raise e
+    console.error(f"Error precompiling checks for host {hostname}: {e}", file=sys.stderr)
+    sys.exit(5)
 
 
-def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
+def _shared_host_check_config(host_check_config: HostCheckConfig) -> HostCheckConfig:
+    return replace(
+        host_check_config,
+        src="",
+        dst="",
+        ipaddresses={},
+        ipv6addresses={},
+        hostname=HostName(""),
+    )
+
+
+def _shared_module_name(shared_config: HostCheckConfig) -> str:
+    return f"host_check_{hashlib.sha256(repr(shared_config).encode('utf-8')).hexdigest()}"
+
+
+def _make_host_check_stub(
+    config_path: VersionedConfigPath, module_name: str, host_check_config: HostCheckConfig
+) -> str:
+    return _STUB_TEMPLATE.format(
+        hostname=host_check_config.hostname,
+        module_dir=str(HostCheckStore.shared_module_dir(config_path)),
+        module_name=module_name,
+        src=host_check_config.src,
+        dst=host_check_config.dst,
+        ipaddresses=host_check_config.ipaddresses,
+        ipv6addresses=host_check_config.ipv6addresses,
+    )
+
+
+def _disk_usage(*directories: Path) -> int:
+    return sum(
+        path.lstat().st_size
+        for directory in directories
+        for path in directory.rglob("*")
+        if not path.is_dir()
+    )
+
+
+def dump_precompiled_hostcheck(
     config_cache: ConfigCache,
     config_path: VersionedConfigPath,
     hostname: HostName,
@@ -163,6 +310,41 @@ def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
     verify_site_python: bool = True,
     precompile_mode: PrecompileMode,
 ) -> str | None:
+    """Create a self-contained host check of the host"""
+    host_check_config = _make_host_check_config(
+        config_cache,
+        config_path,
+        hostname,
+        legacy_check_plugin_names,
+        legacy_check_plugin_files,
+        verify_site_python=verify_site_python,
+        precompile_mode=precompile_mode,
+    )
+    return None if host_check_config is None else _instantiate_template(host_check_config)
+
+
+def _instantiate_template(host_check_config: HostCheckConfig) -> str:
+    template = _TEMPLATE_FILE.read_text()
+    if (m_placeholder := _INSTANTIATION_PATTERN.search(template)) is None:
+        raise ValueError(f"broken template at: {_TEMPLATE_FILE})")
+
+    return template.replace(
+        m_placeholder.group(0),
+        f" = {host_check_config!r}",
+    )
+
+
+def _make_host_check_config(  # pylint: disable=too-many-branches
+    config_cache: ConfigCache,
+    config_path: VersionedConfigPath,
+    hostname: HostName,
+    legacy_check_plugin_names: Mapping[CheckPluginName, str],
+    legacy_check_plugin_files: Mapping[str, str],
+    *,
+    verify_site_python: bool = True,
+    precompile_mode: PrecompileMode,
+) -> HostCheckConfig | None:
+    console.verbose_no_lf(f"{tty.bold}{tty.blue}{hostname:<16}{tty.normal}:", file=sys.stderr)
     (
         needed_legacy_check_plugin_names,
         needed_agent_based_check_plugin_names,
@@ -197,6 +379,7 @@ def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
             needed_agent_based_inventory_plugin_names,
         )
     ):
+        console.verbose("(no Checkmk checks)")
         return None
 
     locations = _get_needed_agent_based_locations(
@@ -262,8 +445,12 @@ def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
                 config_cache, hostname, family=socket.AddressFamily.AF_INET6
             )
 
+    console.verbose(
+        f" ==> {HostCheckStore.host_check_file_path(config_path, hostname)}.", file=sys.stderr
+    )
+
     # assign the values here, just to let the type checker do its job
-    host_check_config = HostCheckConfig(
+    return HostCheckConfig(
         delay_precompile=precompile_mode
         is PrecompileMode.DELAYED,  # propagation of enum would break b/c of the repr() below :-(
         src=str(HostCheckStore.host_check_source_file_path(config_path, hostname)),
@@ -276,15 +463,6 @@ def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
         hostname=hostname,
     )
 
-    template = _TEMPLATE_FILE.read_text()
-    if (m_placeholder := _INSTANTIATION_PATTERN.search(template)) is None:
-        raise ValueError(f"broken template at: {_TEMPLATE_FILE})")
-
-    return template.replace(
-        m_placeholder.group(0),
-        f" = {host_check_config!r}",
-    )
-
 
 def _get_needed_plugin_names(
     config_cache: ConfigCache,
@@ -52,8 +52,15 @@ agent_exclude_sections: list[RuleSpec[dict[str, str]]] = []
 snmp_ports: list[RuleSpec[int]] = []
 tcp_connect_timeout = 5.0
 tcp_connect_timeouts: list[RuleSpec[float]] = []
+# Number of data sources of one host that are fetched at the same time (1: one after another)
+fetcher_max_workers = 1
+# Seconds to wait for the data sources when fetching concurrently (None: unlimited). Sources
+# exceeding it are reported as failed, but still run until their own timeouts end them.
+fetcher_source_wait_limit: float | None = None
 use_dns_cache = True  # prevent DNS by using own cache file
 delay_precompile = False  # delay Python compilation to Nagios execution
+# Number of processes creating the per host configuration of the core (1: no worker processes)
+config_generation_processes = 1
 restart_locking: Literal["abort", "wait"] | None = "abort"
 check_submission: Literal["file", "pipe"] = "file"
 default_host_group = "check_mk"
@@ -91,6 +98,8 @@ use_inline_snmp: bool = True
 
 # Ruleset to enable specific SNMP Backend for each host.
 snmp_backend_hosts: list[RuleSpec[object]] = []
+# Seconds the OIDs fetched during an SNMP scan are reused by the service discovery (0: never)
+snmp_scan_oid_cache_max_age = 0
 # Deprecated: Replaced by snmp_backend_hosts
 non_inline_snmp_hosts: list[RuleSpec[object]] = []
 
@@ -98,6 +107,8 @@ non_inline_snmp_hosts: list[RuleSpec[object]] = []
 snmp_limit_oid_range: list[RuleSpec[tuple[str, Sequence[RangeLimit]]]] = []
 # Ruleset to customize bulk size
 snmp_bulk_size: list[RuleSpec[int]] = []
+# Number of walks sent to a device at the same time
+snmp_max_concurrent_walks: list[RuleSpec[int]] = []
 snmp_default_community = "public"
 snmp_communities: list[RuleSpec[SNMPCredentials]] = []
 # override the rule based configuration
@@ -5,8 +5,10 @@
 
 import dataclasses
 import itertools
+import json
 import logging
 import os
+import socket
 import subprocess
 import sys
 import time
@@ -15,7 +17,7 @@ from contextlib import suppress
 from functools import partial
 from pathlib import Path
 from types import ModuleType
-from typing import Final, Literal, NamedTuple, overload, Protocol, TypedDict, TypeVar
+from typing import Final, Literal, NamedTuple, overload, Protocol, TextIO, TypedDict, TypeVar
 
 import livestatus
 
@@ -1797,6 +1799,7 @@ def mode_check_discovery(
         selected_sections=NO_SELECTION,
         keep_outdated=file_cache_options.keep_outdated,
         logger=logging.getLogger("cmk.base.discovery"),
+        write_piggyback_data=True,
     )
     summarizer = CMKSummarizer(
         hostname,
@@ -1952,7 +1955,7 @@ _option_detect_plugins = Option(
 
 @overload
 def _extract_plugin_selection(
-    options: "_CheckingOptions | _DiscoveryOptions",
+    options: "_CheckingOptions | _CheckBatchOptions | _DiscoveryOptions",
     type_: type[CheckPluginName],
 ) -> tuple[SectionNameCollection, Container[CheckPluginName]]:
     pass
@@ -1967,7 +1970,7 @@ def _extract_plugin_selection(
 
 
 def _extract_plugin_selection(
-    options: "_CheckingOptions | _DiscoveryOptions | _InventoryOptions",
+    options: "_CheckingOptions | _CheckBatchOptions | _DiscoveryOptions | _InventoryOptions",
     type_: type,
 ) -> tuple[SectionNameCollection, Container]:
     detect_plugins = options.get("detect-plugins")
@@ -2099,6 +2102,7 @@ def mode_discover(options: _DiscoveryOptions, args: list[str]) -> None:
         selected_sections=selected_sections,
         keep_outdated=file_cache_options.keep_outdated,
         logger=logging.getLogger("cmk.base.discovery"),
+        write_piggyback_data=True,
     )
     fetcher = CMKFetcher(
         config_cache,
@@ -2114,6 +2118,7 @@ def mode_discover(options: _DiscoveryOptions, args: list[str]) -> None:
         simulation_mode=config.simulation_mode,
         snmp_backend_override=snmp_backend_override,
         password_store_file=cmk.utils.password_store.pending_password_store_path(),
+        snmp_oid_cache_max_age=config.snmp_scan_oid_cache_max_age,
     )
     for hostname in sorted(
         _preprocess_hostnames(
@@ -2258,8 +2263,51 @@ def mode_check(
         ipaddress = HostAddress(args[1])
 
     config_cache = config.get_config_cache()
-    hosts_config = config.make_hosts_config()
     config_cache.ruleset_matcher.ruleset_optimizer.set_all_processed_hosts({hostname})
+    check_result = _check_host(
+        get_submitter_,
+        options,
+        config_cache,
+        config.make_hosts_config(),
+        hostname,
+        ipaddress,
+        file_cache_options=file_cache_options,
+        snmp_backend_override=snmp_backend_override,
+        keepalive=keepalive,
+        precompiled_host_check=precompiled_host_check,
+    )
+
+    active_check_handler(hostname, check_result.as_text())
+    if keepalive:
+        console.verbose_no_lf(check_result.as_text())
+    else:
+        with suppress(IOError):
+            sys.stdout.write(check_result.as_text() + "\n")
+            sys.stdout.flush()
+
+    # TODO: Nur fuer die aktuellen tests (cmk -v heute)
+    #       Denke wir sollten fuer das stats recording so etwas aehnliches wie
+    #       den --profile schalter fuers profiling einbauen
+    if config.ruleset_matching_stats:
+        config_cache.ruleset_matcher.persist_matching_stats(
+            "tmp/ruleset_matching_stats", config.get_ruleset_id_mapping()
+        )
+    return check_result.state
+
+
+def _check_host(
+    get_submitter_: GetSubmitter,
+    options: "_CheckingOptions | _CheckBatchOptions",
+    config_cache: ConfigCache,
+    hosts_config: Hosts,
+    hostname: HostName,
+    ipaddress: HostAddress | None,
+    *,
+    file_cache_options: FileCacheOptions,
+    snmp_backend_override: SNMPBackendEnum | None,
+    keepalive: bool,
+    precompiled_host_check: bool,
+) -> ActiveCheckResult:
     selected_sections, run_plugin_names = _extract_plugin_selection(options, CheckPluginName)
     fetcher = CMKFetcher(
         config_cache,
@@ -2274,6 +2322,8 @@ def mode_check(
         selected_sections=selected_sections,
         simulation_mode=config.simulation_mode,
         snmp_backend_override=snmp_backend_override,
+        max_workers=config.fetcher_max_workers,
+        source_wait_limit=config.fetcher_source_wait_limit,
         password_store_file=(
             cmk.utils.password_store.core_password_store_path(LATEST_CONFIG)
             if precompiled_host_check
@@ -2288,6 +2338,7 @@ def mode_check(
         selected_sections=selected_sections,
         keep_outdated=file_cache_options.keep_outdated,
         logger=logging.getLogger("cmk.base.checking"),
+        write_piggyback_data=True,
     )
     summarizer = CMKSummarizer(
         hostname,
@@ -2319,7 +2370,8 @@ def mode_check(
         ) as value_store_manager,
     ):
         console.debug(f"Checkmk version {cmk_version.__version__}")
-        fetched = fetcher(hostname, ip_address=ipaddress)
+        with CPUTracker(console.debug) as fetch_tracker:
+            fetched = fetcher(hostname, ip_address=ipaddress)
         check_plugins = CheckPluginMapper(
             config_cache,
             value_store_manager,
@@ -2361,7 +2413,7 @@ def mode_check(
         checks_result = [
             *checks_result,
             make_timing_results(
-                tracker.duration,
+                fetch_tracker.duration + tracker.duration,
                 tuple((f[0], f[2]) for f in fetched),
                 perfdata_with_times=config.check_mk_perfdata_with_times,
             ),
@@ -2370,24 +2422,102 @@ def mode_check(
     if error_handler.result is not None:
         checks_result = [error_handler.result]
 
-    check_result = ActiveCheckResult.from_subresults(*checks_result)
+    return ActiveCheckResult.from_subresults(*checks_result)
 
-    active_check_handler(hostname, check_result.as_text())
-    if keepalive:
-        console.verbose_no_lf(check_result.as_text())
+
+_CheckBatchOptions = TypedDict(
+    "_CheckBatchOptions",
+    {
+        "cache": Literal[True],
+        "no-cache": Literal[True],
+        "no-tcp": Literal[True],
+        "usewalk": Literal[True],
+        "no-submit": bool,
+        "perfdata": bool,
+        "detect-sections": frozenset[SectionName],
+        "plugins": frozenset[CheckPluginName],
+        "detect-plugins": frozenset[str],
+        "socket": str,
+    },
+    total=False,
+)
+
+
+def mode_check_batch(get_submitter_: GetSubmitter, options: _CheckBatchOptions) -> None:
+    file_cache_options = _handle_fetcher_options(options)
+    try:
+        snmp_backend_override = parse_snmp_backend(options.get("snmp-backend"))
+    except ValueError as exc:
+        raise MKBailOut("Unknown SNMP backend") from exc
+
+    config_cache = config.get_config_cache()
+    hosts_config = config.make_hosts_config()
+    # Keep all hosts processed for the whole batch.  The matching caches of the
+    # ruleset optimizer are then valid for every host we are asked to check.
+    config_cache.ruleset_matcher.ruleset_optimizer.set_all_processed_hosts(
+        itertools.chain(hosts_config.hosts, hosts_config.clusters)
+    )
+
+    def check(line: str) -> str | None:
+        if not (args := line.split()):
+            return None
+        try:
+            check_result = _check_host(
+                get_submitter_,
+                options,
+                config_cache,
+                hosts_config,
+                HostName(args[0]),
+                HostAddress(args[1]) if len(args) > 1 else None,
+                file_cache_options=file_cache_options,
+                snmp_backend_override=snmp_backend_override,
+                keepalive=False,
+                precompiled_host_check=False,
+            )
+        except MKTimeout:
+            raise
+        except Exception as exc:
+            if cmk.ccc.debug.enabled():
+                raise
+            check_result = ActiveCheckResult(3, str(exc))
+        return json.dumps(
+            {"host": args[0], "state": check_result.state, "output": check_result.as_text()}
+        )
+
+    if (socket_path := options.get("socket")) is None:
+        _check_batch_stream(sys.stdin, sys.stdout, check)
     else:
-        with suppress(IOError):
-            sys.stdout.write(check_result.as_text() + "\n")
-            sys.stdout.flush()
+        _serve_check_batch(Path(socket_path), check)
 
-    # TODO: Nur fuer die aktuellen tests (cmk -v heute)
-    #       Denke wir sollten fuer das stats recording so etwas aehnliches wie
-    #       den --profile schalter fuers profiling einbauen
     if config.ruleset_matching_stats:
         config_cache.ruleset_matcher.persist_matching_stats(
             "tmp/ruleset_matching_stats", config.get_ruleset_id_mapping()
         )
-    return check_result.state
+
+
+def _check_batch_stream(
+    instream: Iterable[str], outstream: TextIO, check: Callable[[str], str | None]
+) -> None:
+    for line in instream:
+        if (answer := check(line)) is not None:
+            outstream.write(answer + "\n")
+            outstream.flush()
+
+
+def _serve_check_batch(socket_path: Path, check: Callable[[str], str | None]) -> None:
+    with suppress(FileNotFoundError):
+        socket_path.unlink()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(socket_path))
+        server.listen()
+        console.verbose(f"Waiting for host names on {socket_path}")
+        while True:
+            connection, _address = server.accept()
+            with connection, connection.makefile("rw", encoding="utf-8") as stream:
+                try:
+                    _check_batch_stream(stream, stream, check)
+                except OSError as exc:
+                    console.verbose(f"Connection closed: {exc}")
 
 
 def register_mode_check(
@@ -2442,6 +2572,41 @@ def register_mode_check(
             ],
         )
     )
+    modes.register(
+        Mode(
+            long_option="check-batch",
+            handler_function=partial(mode_check_batch, get_submitter_),
+            short_help="Check all services on many hosts with one loaded configuration",
+            long_help=[
+                "Reads one line per host in the format 'HOST [IPADDRESS]' from stdin "
+                "and checks all services on each of these hosts. The configuration "
+                "and the check plugins are only loaded once for the whole batch.",
+                "For every host a line containing a JSON object with the keys "
+                "'host', 'state' and 'output' is written to stdout.",
+                "With '--socket PATH' the host names are read from connections "
+                "to the UNIX socket PATH instead, and the results are sent back "
+                "on the same connection.",
+            ],
+            sub_options=[
+                *_FETCHER_OPTIONS,
+                _SNMP_BACKEND_OPTION,
+                Option(
+                    long_option="no-submit",
+                    short_option="n",
+                    short_help="Do not submit results to core, do not save counters",
+                ),
+                _option_sections,
+                _get_plugins_option(CheckPluginName),
+                _option_detect_plugins,
+                Option(
+                    long_option="socket",
+                    argument=True,
+                    argument_descr="PATH",
+                    short_help="Read host names from the UNIX socket PATH instead of stdin",
+                ),
+            ],
+        )
+    )
 
 
 if cmk_version.edition(cmk.utils.paths.omd_root) is cmk_version.Edition.CRE:
@@ -2651,6 +2816,7 @@ def _execute_active_check_inventory(
     tree_or_archive_store = TreeOrArchiveStore(
         cmk.utils.paths.inventory_output_dir,
         cmk.utils.paths.inventory_archive_dir,
+        cmk.utils.paths.inventory_delta_cache_dir,
     )
     previous_tree = tree_or_archive_store.load_previous(host_name=host_name)
 
@@ -16,6 +16,8 @@ from cmk.snmplib import SNMPRawDataElem
 from cmk.checkengine.fetcher import FetcherType
 from cmk.checkengine.parser import AgentRawDataSectionElem, Parser, SectionStore
 
+from cmk.piggyback import PiggybackRawDataWriter
+
 __all__ = ["make_parser", "ParserFactory"]
 
 
@@ -37,6 +39,7 @@ class ParserFactory(Protocol):
         *,
         keep_outdated: bool,
         logger: logging.Logger,
+        piggyback_writer: PiggybackRawDataWriter | None = None,
     ) -> Parser: ...
 
 
@@ -50,6 +53,7 @@ def make_parser(
     persisted_section_dir: Path,
     keep_outdated: bool,
     logger: logging.Logger,
+    piggyback_writer: PiggybackRawDataWriter | None = None,
 ) -> Parser:
     if fetcher_type is FetcherType.SNMP:
         return factory.make_snmp_parser(
@@ -71,4 +75,5 @@ def make_parser(
         ),
         keep_outdated=keep_outdated,
         logger=logger,
+        piggyback_writer=piggyback_writer,
     )
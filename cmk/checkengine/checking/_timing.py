@@ -24,7 +24,6 @@ def make_timing_results(
 ) -> ActiveCheckResult:
     summary: DefaultDict[str, Snapshot] = defaultdict(Snapshot.null)
     for source, duration in fetched:
-        total_times += duration
         with suppress(KeyError):
             summary[
                 {
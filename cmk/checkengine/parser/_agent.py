@@ -18,6 +18,8 @@ from cmk.utils.hostaddress import HostName
 from cmk.utils.sectionname import MutableSectionMap, SectionName
 from cmk.utils.translations import TranslationOptions
 
+from cmk.piggyback import PiggybackRawDataWriter
+
 from ._markers import PiggybackMarker, SectionMarker
 from ._parser import (
     AgentRawDataSection,
@@ -92,6 +94,7 @@ class ParserState(abc.ABC):
         translation: TranslationOptions,
         encoding_fallback: str,
         logger: logging.Logger,
+        selection: SectionNameCollection = NO_SELECTION,
     ) -> None:
         self.hostname: Final = hostname
         self.sections = sections
@@ -99,6 +102,8 @@ class ParserState(abc.ABC):
         self.translation: Final = translation
         self.encoding_fallback: Final = encoding_fallback
         self._logger: Final = logger
+        # Lines of other sections are dropped right away.
+        self.selection: Final = selection
 
     @abc.abstractmethod
     def do_action(self, line: bytes) -> ParserState:
@@ -129,6 +134,7 @@ class ParserState(abc.ABC):
             translation=self.translation,
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
+            selection=self.selection,
         )
 
     def to_host_section_parser(
@@ -151,6 +157,7 @@ class ParserState(abc.ABC):
             translation=self.translation,
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
+            selection=self.selection,
         )
 
     def to_piggyback_parser(
@@ -172,6 +179,7 @@ class ParserState(abc.ABC):
             translation=self.translation,
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
+            selection=self.selection,
         )
 
     def to_piggyback_section_parser(
@@ -200,6 +208,7 @@ class ParserState(abc.ABC):
             translation=self.translation,
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
+            selection=self.selection,
         )
 
     def to_piggyback_noop_parser(
@@ -214,6 +223,7 @@ class ParserState(abc.ABC):
             translation=self.translation,
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
+            selection=self.selection,
         )
 
     def to_piggyback_ignore_parser(self) -> PiggybackIgnoreParser:
@@ -224,6 +234,7 @@ class ParserState(abc.ABC):
             translation=self.translation,
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
+            selection=self.selection,
         )
 
     def to_error(self, line: bytes) -> ParserState:
@@ -302,6 +313,7 @@ class PiggybackParser(ParserState):
         translation: TranslationOptions,
         encoding_fallback: str,
         logger: logging.Logger,
+        selection: SectionNameCollection = NO_SELECTION,
     ) -> None:
         super().__init__(
             hostname,
@@ -310,6 +322,7 @@ class PiggybackParser(ParserState):
             translation=translation,
             encoding_fallback=encoding_fallback,
             logger=logger,
+            selection=selection,
         )
         self.current_host: Final = current_host
 
@@ -348,6 +361,7 @@ class PiggybackSectionParser(ParserState):
         translation: TranslationOptions,
         encoding_fallback: str,
         logger: logging.Logger,
+        selection: SectionNameCollection = NO_SELECTION,
     ) -> None:
         super().__init__(
             hostname,
@@ -356,12 +370,15 @@ class PiggybackSectionParser(ParserState):
             translation=translation,
             encoding_fallback=encoding_fallback,
             logger=logger,
+            selection=selection,
         )
         self.current_host: Final = current_host
         self.current_section: Final = current_section
+        self._keep_lines: Final = selection is NO_SELECTION or current_section.name in selection
 
     def do_action(self, line: bytes) -> ParserState:
-        self.piggyback_sections[self.current_host][-1].section.append(AgentRawData(line))
+        if self._keep_lines:
+            self.piggyback_sections[self.current_host][-1].section.append(AgentRawData(line))
         return self
 
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
@@ -391,6 +408,7 @@ class PiggybackNOOPParser(ParserState):
         translation: TranslationOptions,
         encoding_fallback: str,
         logger: logging.Logger,
+        selection: SectionNameCollection = NO_SELECTION,
     ) -> None:
         super().__init__(
             hostname,
@@ -399,6 +417,7 @@ class PiggybackNOOPParser(ParserState):
             translation=translation,
             encoding_fallback=encoding_fallback,
             logger=logger,
+            selection=selection,
         )
         self.current_host: Final = current_host
 
@@ -457,6 +476,7 @@ class HostSectionParser(ParserState):
         translation: TranslationOptions,
         encoding_fallback: str,
         logger: logging.Logger,
+        selection: SectionNameCollection = NO_SELECTION,
     ) -> None:
         super().__init__(
             hostname,
@@ -465,13 +485,16 @@ class HostSectionParser(ParserState):
             translation=translation,
             encoding_fallback=encoding_fallback,
             logger=logger,
+            selection=selection,
         )
         self.current_section: Final = current_section
+        self._keep_lines: Final = selection is NO_SELECTION or current_section.name in selection
 
     def do_action(self, line: bytes) -> ParserState:
-        self.sections[-1].section.append(
-            AgentRawData(line if self.current_section.nostrip else line.strip())
-        )
+        if self._keep_lines:
+            self.sections[-1].section.append(
+                AgentRawData(line if self.current_section.nostrip else line.strip())
+            )
         return self
 
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
@@ -506,6 +529,7 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
         translation: TranslationOptions,
         encoding_fallback: str,
         logger: logging.Logger,
+        piggyback_writer: PiggybackRawDataWriter | None = None,
     ) -> None:
         super().__init__()
         self.hostname: Final = hostname
@@ -515,6 +539,8 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
         self.keep_outdated: Final = keep_outdated
         self.translation: Final = translation
         self.encoding_fallback: Final = encoding_fallback
+        # Piggyback sections are handed to the writer as soon as they are complete.
+        self.piggyback_writer: Final = piggyback_writer
         self._logger = logger
 
     def parse(
@@ -525,7 +551,9 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
     ) -> HostSections[AgentRawDataSection]:
         now = int(time.time())
 
-        raw_sections, piggyback_sections = self._parse_host_section(raw_data)
+        raw_sections, piggyback_sections = self._parse_host_section(
+            raw_data, selection, cached_at=now
+        )
         section_info = {
             header.name: header
             for header, _ in raw_sections
@@ -540,50 +568,27 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
                 out.setdefault(header.name, []).extend(header.parse_line(line) for line in content)
             return out
 
-        def flatten_piggyback_section(
-            sections: ImmutableSection,
-            *,
-            cached_at: int,
-            cache_for: int,
-            selection: SectionNameCollection,
-        ) -> Iterator[bytes]:
-            for header, content in sections:
-                if not (selection is NO_SELECTION or header.name in selection):
-                    continue
-
-                if header.cached is not None or header.persist is not None:
-                    yield str(header).encode(header.encoding)
-                else:
-                    # Add cache information.
-                    yield str(
-                        SectionMarker(
-                            header.name,
-                            (cached_at, cache_for),
-                            header.encoding,
-                            header.nostrip,
-                            header.persist,
-                            header.separator,
-                        )
-                    ).encode(header.encoding)
-                yield from (bytes(line) for line in content)
-
         sections = {
             name: content
             for name, content in decode_sections(raw_sections).items()
             if selection is NO_SELECTION or name in selection
         }
-        piggybacked_raw_data = {
-            header.hostname: list(
-                flatten_piggyback_section(
-                    content,
-                    cached_at=now,
-                    cache_for=self.cache_piggybacked_data_for,
-                    selection=selection,
+        piggybacked_raw_data: Mapping[HostName, Sequence[bytes]] = (
+            {
+                header.hostname: list(
+                    _flatten_piggyback_sections(
+                        content,
+                        cached_at=now,
+                        cache_for=self.cache_piggybacked_data_for,
+                        selection=selection,
+                    )
                 )
-            )
-            for header, content in piggyback_sections.items()
-            if header.hostname is not None
-        }
+                for header, content in piggyback_sections.items()
+                if header.hostname is not None
+            }
+            if self.piggyback_writer is None
+            else self.piggyback_writer
+        )
         cache_info = {
             header.name: cache_info_tuple
             for header in section_info.values()
@@ -613,6 +618,9 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
     def _parse_host_section(
         self,
         raw_data: AgentRawData,
+        selection: SectionNameCollection,
+        *,
+        cached_at: int = 0,
     ) -> tuple[ImmutableSection, Mapping[PiggybackMarker, ImmutableSection]]:
         """Split agent output in chunks, splits lines by whitespaces."""
         parser: ParserState = NOOPParser(
@@ -622,8 +630,120 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
             translation=self.translation,
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
+            selection=selection,
         )
-        for line in raw_data.split(b"\n"):
-            parser = parser(line.rstrip(b"\r"))
-
+        if (writer := self.piggyback_writer) is None:
+            for line in _iter_lines(raw_data):
+                parser = parser(line.rstrip(b"\r"))
+            return parser.sections, parser.piggyback_sections
+
+        written_headers: dict[PiggybackMarker, SectionMarker] = {}
+        for line in _iter_lines(raw_data):
+            state = parser(line.rstrip(b"\r"))
+            if state is not parser and isinstance(parser, PiggybackSectionParser):
+                # The current section is complete. Only a section that has just been
+                # started for the same piggybacked host is kept.
+                self._write_piggyback_sections(
+                    writer,
+                    parser.current_host,
+                    parser.piggyback_sections[parser.current_host],
+                    written_headers,
+                    keep_last=isinstance(state, PiggybackSectionParser)
+                    and state.current_host == parser.current_host,
+                    cached_at=cached_at,
+                    selection=selection,
+                )
+            parser = state
+
+        for piggyback_header, sections in parser.piggyback_sections.items():
+            self._write_piggyback_sections(
+                writer,
+                piggyback_header,
+                sections,
+                written_headers,
+                keep_last=False,
+                cached_at=cached_at,
+                selection=selection,
+            )
         return parser.sections, parser.piggyback_sections
+
+    def _write_piggyback_sections(
+        self,
+        writer: PiggybackRawDataWriter,
+        piggyback_header: PiggybackMarker,
+        sections: MutableSection,
+        written_headers: MutableMapping[PiggybackMarker, SectionMarker],
+        *,
+        keep_last: bool,
+        cached_at: int,
+        selection: SectionNameCollection,
+    ) -> None:
+        if (complete := sections[:-1] if keep_last else sections[:]) and (
+            piggyback_header.hostname is not None
+        ):
+            writer.append(
+                piggyback_header.hostname,
+                _flatten_piggyback_sections(
+                    complete,
+                    cached_at=cached_at,
+                    cache_for=self.cache_piggybacked_data_for,
+                    selection=selection,
+                    continued=written_headers.get(piggyback_header),
+                ),
+            )
+            written_headers[piggyback_header] = complete[-1].header
+        elif not keep_last and piggyback_header.hostname is not None:
+            # Every piggybacked host is reported, even without sections.
+            writer.append(piggyback_header.hostname, ())
+        del sections[: len(complete)]
+
+
+def _flatten_piggyback_sections(
+    sections: ImmutableSection,
+    *,
+    cached_at: int,
+    cache_for: int,
+    selection: SectionNameCollection,
+    continued: SectionMarker | None = None,
+) -> Iterator[bytes]:
+    """Serialize the sections of a piggybacked host
+
+    The header of the first section is omitted if it continues the section `continued`.
+    """
+    for index, (header, content) in enumerate(sections):
+        if not (selection is NO_SELECTION or header.name in selection):
+            continue
+
+        if index or header != continued:
+            if header.cached is not None or header.persist is not None:
+                yield str(header).encode(header.encoding)
+            else:
+                # Add cache information.
+                yield str(
+                    SectionMarker(
+                        header.name,
+                        (cached_at, cache_for),
+                        header.encoding,
+                        header.nostrip,
+                        header.persist,
+                        header.separator,
+                    )
+                ).encode(header.encoding)
+        yield from (bytes(line) for line in content)
+
+
+def _iter_lines(raw_data: bytes, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """Same as `raw_data.split(b"\\n")` without creating all lines at once
+
+    The lines of a chunk are released as soon as they have been consumed.
+    """
+    start = 0
+    while True:
+        end = raw_data.find(b"\n", start + chunk_size)
+        lines = (raw_data[start:] if end == -1 else raw_data[start:end]).split(b"\n")
+        lines.reverse()
+        while lines:
+            yield lines.pop()
+        if end == -1:
+            return
+        start = end + 1
@@ -3,10 +3,26 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+"""Persisted sections
+
+The sections are stored in a compact binary file::
+
+    header       magic, format version, length of the index
+    index        pickled list of (name, created_at, valid_until, offset, length)
+    payloads     per section: the pickled section content
+
+The index at the head allows us to read the file at once and to not
+unpickle the sections that are superseded by live data.  Payloads of sections that are kept when
+the store is updated are copied verbatim.  Files in the former pickle format
+are still read and converted on the next write.
+"""
+
 import logging
-from collections.abc import Callable
+import pickle
+import struct
+from collections.abc import Callable, Mapping
 from pathlib import Path
-from typing import Final, Generic, TypeVar
+from typing import Final, Generic, NamedTuple, TypeVar
 
 import cmk.ccc.store as _store
 
@@ -16,6 +32,57 @@ __all__ = ["SectionStore"]
 
 _T = TypeVar("_T")
 
+_MAGIC: Final = b"CMKSECST"
+_VERSION: Final = 1
+# magic, version, length of the index
+_HEADER: Final = struct.Struct("<8sHQ")
+
+
+class _PersistedSection(NamedTuple):
+    created_at: int
+    valid_until: int
+    payload: bytes | memoryview  # the pickled section content
+
+
+def _serialize(sections: Mapping[SectionName, _PersistedSection]) -> bytes:
+    index = []
+    offset = 0
+    for name, entry in sections.items():
+        length = len(entry.payload)
+        index.append((str(name), entry.created_at, entry.valid_until, offset, length))
+        offset += length
+    raw_index = pickle.dumps(index, pickle.HIGHEST_PROTOCOL)
+    return b"".join(
+        (
+            _HEADER.pack(_MAGIC, _VERSION, len(raw_index)),
+            raw_index,
+            *(entry.payload for entry in sections.values()),
+        )
+    )
+
+
+def _deserialize(raw: bytes) -> dict[SectionName, _PersistedSection] | None:
+    """Read the index, the payloads are not unpickled
+
+    Returns None if the data is not in the binary format.
+    """
+    if len(raw) < _HEADER.size or not raw.startswith(_MAGIC):
+        return None
+    _magic, version, index_length = _HEADER.unpack_from(raw)
+    if version != _VERSION:
+        raise ValueError(f"unsupported section store version: {version}")
+
+    view = memoryview(raw)
+    start = _HEADER.size + index_length
+    sections = {}
+    for name, created_at, valid_until, offset, length in pickle.loads(view[_HEADER.size : start]):
+        if start + offset + length > len(raw):
+            raise ValueError(f"truncated section store: {name}")
+        sections[SectionName(name)] = _PersistedSection(
+            created_at, valid_until, view[start + offset : start + offset + length]
+        )
+    return sections
+
 
 class SectionStore(Generic[_T]):
     def __init__(
@@ -32,21 +99,53 @@ class SectionStore(Generic[_T]):
         return f"{type(self).__name__}({self.path!r}, logger={self._logger!r})"
 
     def store(self, sections: MutableSectionMap[tuple[int, int, _T]]) -> None:
+        self._store(
+            {
+                section_name: _PersistedSection(
+                    created_at,
+                    valid_until,
+                    pickle.dumps(section_content, pickle.HIGHEST_PROTOCOL),
+                )
+                for section_name, (created_at, valid_until, section_content) in sections.items()
+            }
+        )
+
+    def _store(self, sections: Mapping[SectionName, _PersistedSection]) -> None:
         if not sections:
             self._logger.debug("No persisted sections")
             self.path.unlink(missing_ok=True)
             return
 
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        _store.save_object_to_pickle_file(
-            self.path,
-            {str(k): v for k, v in sections.items()},
-        )
+        _store.save_bytes_to_file(self.path, _serialize(sections))
         self._logger.debug("Stored persisted sections: %s", ", ".join(str(s) for s in sections))
 
     def load(self) -> MutableSectionMap[tuple[int, int, _T]]:
-        raw_sections_data = _store.load_object_from_pickle_file(self.path, default={})
-        return {SectionName(k): v for k, v in raw_sections_data.items()}
+        return {
+            section_name: (entry.created_at, entry.valid_until, pickle.loads(entry.payload))
+            for section_name, entry in self._load().items()
+        }
+
+    def _load(self) -> dict[SectionName, _PersistedSection]:
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return {}
+
+        if not raw:
+            return {}
+
+        if (sections := _deserialize(raw)) is not None:
+            return sections
+
+        # Former format: one pickled dictionary
+        return {
+            SectionName(k): _PersistedSection(
+                v[0], v[1], pickle.dumps(v[2], pickle.HIGHEST_PROTOCOL)
+            )
+            for k, v in pickle.loads(raw).items()
+            if len(v) == 3  # Skip entries of "old" format
+        }
 
     def update(
         self,
@@ -78,14 +177,16 @@ class SectionStore(Generic[_T]):
         *,
         now: int,
         keep_outdated: bool,
-    ) -> MutableSectionMap[tuple[int, int, _T]]:
+    ) -> MutableSectionMap[_PersistedSection]:
         # TODO: This is not race condition free when modifying the data. Either remove
         # the possible write here and simply ignore the outdated sections or lock when
         # reading and unlock after writing
-        persisted_sections = self.load()
+        persisted_sections = self._load()
 
         new_sections = {
-            section_name: persist_info + (section_content,)
+            section_name: _PersistedSection(
+                *persist_info, pickle.dumps(section_content, pickle.HIGHEST_PROTOCOL)
+            )
             for section_name, section_content in sections.items()
             if (persist_info := lookup_persist(section_name)) is not None
         }
@@ -94,33 +195,29 @@ class SectionStore(Generic[_T]):
 
         if not keep_outdated:
             for section_name in tuple(persisted_sections):
-                (_created_at, valid_until, _section_content) = persisted_sections[section_name]
-                if section_outdated(valid_until, now):
+                if section_outdated(persisted_sections[section_name].valid_until, now):
                     store_sections = True
                     del persisted_sections[section_name]
 
         if store_sections:
-            self.store(persisted_sections)
+            self._store(persisted_sections)
         return persisted_sections
 
     def _add_persisted_sections(
         self,
         sections: SectionMap[_T],
         cache_info: MutableSectionMap[tuple[int, int]],
-        persisted_sections: MutableSectionMap[tuple[int, int, _T]],
+        persisted_sections: Mapping[SectionName, _PersistedSection],
     ) -> SectionMap[_T]:
         cache_info.update(
             {
-                section_name: (created_at, valid_until - created_at)
-                for section_name, (created_at, valid_until, *_rest) in persisted_sections.items()
+                section_name: (entry.created_at, entry.valid_until - entry.created_at)
+                for section_name, entry in persisted_sections.items()
                 if section_name not in sections
             }
         )
         result: MutableSectionMap[_T] = dict(sections.items())
         for section_name, entry in persisted_sections.items():
-            if len(entry) == 2:
-                continue  # Skip entries of "old" format
-
             # Don't overwrite sections that have been received from the source with this call
             if section_name in sections:
                 self._logger.debug(
@@ -130,5 +227,5 @@ class SectionStore(Generic[_T]):
                 continue
 
             self._logger.debug("Using persisted section %r", section_name)
-            result[section_name] = entry[-1]
+            result[section_name] = pickle.loads(entry.payload)
         return result
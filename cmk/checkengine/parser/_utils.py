@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Mapping
+from collections.abc import Callable, Iterable, Mapping, Sequence
 
 from cmk.utils.hostaddress import HostName
 from cmk.utils.sectionname import MutableSectionMap
@@ -23,7 +23,9 @@ def group_by_host(
 ) -> Mapping[HostKey, HostSections]:
     out_sections: dict[HostKey, MutableSectionMap[list]] = defaultdict(dict)
     out_cache_info: dict[HostKey, MutableSectionMap[tuple[int, int]]] = defaultdict(dict)
-    out_piggybacked_raw_data: dict[HostKey, dict[HostName, list[bytes]]] = defaultdict(dict)
+    out_piggybacked_raw_data: dict[HostKey, list[Mapping[HostName, Sequence[bytes]]]] = defaultdict(
+        list
+    )
     host_keys: list[HostKey] = []
 
     for host_key, host_section in host_sections:
@@ -32,8 +34,11 @@ def group_by_host(
         log(f"  {host_key!s}  -> Add sections: {section_names}")
         for section_name, section_content in host_section.sections.items():
             out_sections[host_key].setdefault(section_name, []).extend(section_content)
-        for hostname, raw_lines in host_section.piggybacked_raw_data.items():
-            out_piggybacked_raw_data[host_key].setdefault(hostname, []).extend(raw_lines)
+        # Sources that share a piggyback writer all report the same data.
+        if (raw_data := host_section.piggybacked_raw_data) and not any(
+            other is raw_data for other in out_piggybacked_raw_data[host_key]
+        ):
+            out_piggybacked_raw_data[host_key].append(raw_data)
         # TODO: It should be supported that different sources produce equal sections.
         # this is handled for the output[host_key].sections data by simply concatenating the lines
         # of the sections, but for the output[host_key].cache_info this is not done. Why?
@@ -45,7 +50,19 @@ def group_by_host(
         hk: HostSections(
             out_sections[hk],
             cache_info=out_cache_info[hk],
-            piggybacked_raw_data=out_piggybacked_raw_data[hk],
+            piggybacked_raw_data=_merge_piggybacked_raw_data(out_piggybacked_raw_data[hk]),
         )
         for hk in host_keys
     }
+
+
+def _merge_piggybacked_raw_data(
+    piggybacked_raw_data: Sequence[Mapping[HostName, Sequence[bytes]]],
+) -> Mapping[HostName, Sequence[bytes]]:
+    if len(piggybacked_raw_data) == 1:
+        return piggybacked_raw_data[0]
+    out: dict[HostName, list[bytes]] = {}
+    for raw_data in piggybacked_raw_data:
+        for hostname, raw_lines in raw_data.items():
+            out.setdefault(hostname, []).extend(raw_lines)
+    return out
@@ -4,11 +4,12 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 from __future__ import annotations
 
+import socket
 import threading
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 from logging import Logger
 from types import TracebackType
-from typing import Literal, TypeAlias, TypeVar
+from typing import Any, Literal, TypeAlias, TypeVar
 
 # Our tokens are bytes, so we use a memoryview as a stream of bytes.
 Tokens: TypeAlias = memoryview
@@ -111,6 +112,21 @@ def parse_bytes_into_syslog_messages(data: bytes) -> tuple[Iterable[bytes], byte
     return messages, bytes(rest)
 
 
+def receive_datagrams(sock: socket.socket, bufsize: int, limit: int) -> Sequence[tuple[bytes, Any]]:
+    """Receive the datagrams already queued on a socket without blocking, at most limit
+
+    Draining the socket on every wakeup keeps the kernel receive buffer from overflowing
+    during bursts.
+    """
+    datagrams: list[tuple[bytes, Any]] = []
+    while len(datagrams) < limit:
+        try:
+            datagrams.append(sock.recvfrom(bufsize, socket.MSG_DONTWAIT))
+        except BlockingIOError:
+            break
+    return datagrams
+
+
 class ECLock:
     def __init__(self, logger: Logger) -> None:
         self._logger = logger
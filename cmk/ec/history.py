@@ -51,6 +51,10 @@ class History(ABC):
     @abstractmethod
     def close(self) -> None: ...
 
+    def write_behind_status(self) -> tuple[int, float]:
+        """Returns the number of entries waiting to be written and the duration of the last write"""
+        return 0, 0.0
+
 
 class TimedHistory(History):
     """Decorate History methods with timing information."""
@@ -89,6 +93,9 @@ class TimedHistory(History):
         with self._timing("close"):
             return self._history.close()
 
+    def write_behind_status(self) -> tuple[int, float]:
+        return self._history.write_behind_status()
+
 
 def _log_event(
     config: Config, logger: Logger, event: Event, what: HistoryWhat, who: str, addinfo: str
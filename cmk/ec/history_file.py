@@ -3,15 +3,21 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import bisect
 import itertools
+import pickle
 import shlex
 import subprocess
 import threading
 import time
+from array import array
 from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
 from logging import Logger
 from pathlib import Path
-from typing import Any
+from typing import Any, Final
+
+from cmk.ccc import store
 
 from cmk.utils.log import VERBOSE
 from cmk.utils.render import date_and_time
@@ -83,6 +89,7 @@ class FileHistory(History):
         self._logger.debug("Limit: %r", limit)
 
         grep_pipeline = _grep_pipeline(filters)
+        column_positions = _indexed_column_positions(self._history_columns)
 
         time_filters = [
             (f.operator_name, f.argument) for f in filters if f.column_name.split("_")[-1] == "time"
@@ -114,12 +121,28 @@ class FileHistory(History):
             if not _intersects(time_range, _get_logfile_timespan(path)):
                 self._logger.debug("skipping history file %s because of time filters", path)
                 continue
-            tac = f"nl -b a {shlex.quote(str(path))} | tac"  # Process younger lines first
-            cmd = " | ".join([tac] + grep_pipeline)
-            self._logger.debug("preprocessing history file with command [%s]", cmd)
-            new_entries = parse_history_file(
-                self._history_columns, path, query.filter_row, cmd, limit, self._logger
-            )
+            try:
+                index = _updated_logfile_index(path, column_positions)
+            except Exception:
+                self._logger.exception("Cannot index history file %s", path)
+                index = None
+            if index is not None:
+                new_entries = parse_indexed_history_file(
+                    self._history_columns,
+                    path,
+                    index,
+                    filters,
+                    query.filter_row,
+                    limit,
+                    self._logger,
+                )
+            else:
+                tac = f"nl -b a {shlex.quote(str(path))} | tac"  # Process younger lines first
+                cmd = " | ".join([tac] + grep_pipeline)
+                self._logger.debug("preprocessing history file with command [%s]", cmd)
+                new_entries = parse_history_file(
+                    self._history_columns, path, query.filter_row, cmd, limit, self._logger
+                )
             history_entries += new_entries
             if limit is not None:
                 limit -= len(new_entries)
@@ -152,6 +175,9 @@ def _expire_logfiles(
                         "Deleting log file %s (age %s)", path, date_and_time(path.stat().st_mtime)
                     )
                     path.unlink()
+            for index_path in settings.paths.history_dir.value.glob(f"*{_INDEX_SUFFIX}"):
+                if not index_path.with_suffix(".log").exists():
+                    index_path.unlink(missing_ok=True)
         except Exception as e:
             if settings.options.debug:
                 raise
@@ -292,6 +318,148 @@ def parse_history_file(
     return entries
 
 
+# Lines matching "=", "=~" and "in" filters on these columns are looked up in the index.
+_INDEXED_COLUMNS: Final = ("event_id", "event_host", "event_rule_id", "event_application")
+_INDEX_SUFFIX: Final = ".idx"
+_INDEX_VERSION: Final = 1
+
+
+@dataclass
+class LogfileIndex:
+    """Sidecar index of a history file
+
+    It contains the byte offset, the time and the event ID of each complete line and the
+    numbers of the lines by the lower case values of the other indexed columns. Event IDs are
+    nearly unique, so a mapping would be much bigger and slower to load than the plain array.
+    As history files are only appended to, the index is brought up to date by indexing the
+    lines after the indexed size.
+    """
+
+    size: int = 0
+    offsets: array = field(default_factory=lambda: array("Q"))
+    times: array = field(default_factory=lambda: array("d"))
+    times_sorted: bool = True
+    event_ids: array = field(default_factory=lambda: array("q"))
+    postings: dict[str, dict[str, array]] = field(default_factory=dict)
+    version: int = _INDEX_VERSION
+
+    def add_lines(self, data: bytes, column_positions: dict[str, int]) -> None:
+        """Index the complete lines of data, which was read from the indexed size on"""
+        offset = self.size
+        for line in data[: data.rfind(b"\n") + 1].split(b"\n")[:-1]:
+            number = len(self.offsets)
+            parts = line.split(b"\t")
+            try:
+                entry_time = float(parts[0])
+            except ValueError:
+                entry_time = float("nan")
+            if self.times and not self.times[-1] <= entry_time:
+                self.times_sorted = False
+            self.offsets.append(offset)
+            self.times.append(entry_time)
+            for column_name, position in column_positions.items():
+                raw_value = parts[position] if position < len(parts) else b""
+                if column_name == "event_id":
+                    self.event_ids.append(int(raw_value) if raw_value.isdigit() else -1)
+                    continue
+                value = raw_value.decode("utf-8", errors="replace").lower()
+                self.postings.setdefault(column_name, {}).setdefault(value, array("I")).append(
+                    number
+                )
+            offset += len(line) + 1
+        self.size = offset
+
+    def candidates(self, filters: Sequence[QueryFilter]) -> Iterable[int]:
+        """Numbers of the lines which may match the filters, youngest first"""
+        lines: set[int] | None = None
+        for f in filters:
+            if f.column_name not in _INDEXED_COLUMNS or f.operator_name not in ("=", "=~", "in"):
+                continue
+            values = f.argument if f.operator_name == "in" else [f.argument]
+            if f.column_name == "event_id":
+                event_ids = set(values)
+                matching = {n for n, event_id in enumerate(self.event_ids) if event_id in event_ids}
+            else:
+                postings = self.postings.get(f.column_name, {})
+                matching = {n for value in values for n in postings.get(str(value).lower(), ())}
+            lines = matching if lines is None else lines & matching
+
+        time_filters = [f for f in filters if f.column_name == "history_time"]
+        first, end = 0, len(self.offsets)
+        if self.times_sorted:
+            time_filter_values = [(f.operator_name, f.argument) for f in time_filters]
+            if (lower := _greatest_lower_bound_for_filters(time_filter_values)) is not None:
+                first = bisect.bisect_left(self.times, lower - 1)
+            if (upper := _least_upper_bound_for_filters(time_filter_values)) is not None:
+                end = bisect.bisect_right(self.times, upper + 1)
+
+        numbers = (
+            range(end - 1, first - 1, -1)
+            if lines is None
+            else (n for n in sorted(lines, reverse=True) if first <= n < end)
+        )
+        return (n for n in numbers if all(f.predicate(self.times[n]) for f in time_filters))
+
+
+def _indexed_column_positions(history_columns: Sequence[tuple[str, Any]]) -> dict[str, int]:
+    # The lines of the history files lack the history_line column.
+    return {
+        column_name: position - 1
+        for position, (column_name, _default) in enumerate(history_columns)
+        if column_name in _INDEXED_COLUMNS
+    }
+
+
+def _updated_logfile_index(path: Path, column_positions: dict[str, int]) -> LogfileIndex:
+    index_path = path.with_suffix(_INDEX_SUFFIX)
+    size = path.stat().st_size
+    try:
+        index = pickle.loads(index_path.read_bytes())
+        if not isinstance(index, LogfileIndex) or index.version != _INDEX_VERSION:
+            raise ValueError(index_path)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+        index = LogfileIndex()
+    if index.size > size:  # the history file has been replaced
+        index = LogfileIndex()
+    if index.size == size:
+        return index
+    with path.open("rb") as f:
+        f.seek(index.size)
+        data = f.read(size - index.size)
+    indexed_size = index.size
+    index.add_lines(data, column_positions)
+    if index.size != indexed_size:
+        store.save_bytes_to_file(index_path, pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+    return index
+
+
+def parse_indexed_history_file(
+    history_columns: Sequence[tuple[str, Any]],
+    path: Path,
+    index: LogfileIndex,
+    filters: Sequence[QueryFilter],
+    filter_row: Callable[[Sequence[Any]], bool],
+    limit: int | None,
+    logger: Logger,
+) -> list[Any]:
+    """Read the lines the index selects for the filters, youngest first"""
+    entries: list[Any] = []
+    with path.open("rb") as f:
+        for number in index.candidates(filters):
+            if limit is not None and len(entries) > limit:
+                break
+            f.seek(index.offsets[number])
+            line = f.readline()
+            try:
+                parts: list[Any] = [number + 1, *line.decode("utf-8").rstrip("\n").split("\t")]
+                convert_history_line(history_columns, parts)
+                if filter_row(parts):
+                    entries.append(parts)
+            except Exception:
+                logger.exception("Invalid line '%s' in history file %s", line, path)
+    return entries
+
+
 def parse_history_file_python(
     history_columns: Sequence[tuple[str, Any]],
     path: Path,
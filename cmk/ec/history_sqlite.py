@@ -7,8 +7,9 @@
 import itertools
 import json
 import sqlite3
+import threading
 import time
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
 from datetime import timedelta
 from logging import Logger
@@ -130,6 +131,82 @@ def filters_to_sqlite_query(filters: Iterable[QueryFilter]) -> tuple[str, list[o
     )
 
 
+class HistoryWriter(threading.Thread):
+    """Writes buffered history entries in the background
+
+    The entries are written at least every flush_interval seconds in transactions of at most
+    batch_size entries. If max_pending entries are waiting, adding entries blocks.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Sequence[Sequence[object]]], None],
+        lock: threading.RLock,
+        logger: Logger,
+        *,
+        flush_interval: float = 1.0,
+        batch_size: int = 1000,
+        max_pending: int = 100000,
+    ) -> None:
+        super().__init__(name="SQLiteHistoryWriter", daemon=True)
+        self._write = write
+        self._lock = lock
+        self._logger = logger
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+        self._entries: list[Sequence[object]] = []
+        self._condition = threading.Condition()
+        self._terminate = False
+        self.last_flush_duration = 0.0
+
+    @property
+    def pending(self) -> int:
+        return len(self._entries)
+
+    def put(self, entry: Sequence[object]) -> None:
+        with self._condition:
+            while len(self._entries) >= self._max_pending and not self._terminate:
+                self._condition.wait()
+            self._entries.append(entry)
+            if len(self._entries) >= self._batch_size:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Write all pending entries"""
+        # The lock keeps the order of the entries when flushing from several threads.
+        with self._lock:
+            with self._condition:
+                entries, self._entries = self._entries, []
+                self._condition.notify_all()
+            if not entries:
+                return
+            tic = time.monotonic()
+            try:
+                for start in range(0, len(entries), self._batch_size):
+                    self._write(entries[start : start + self._batch_size])
+            except Exception:
+                self._logger.exception("Cannot write %d history entries", len(entries))
+            self.last_flush_duration = time.monotonic() - tic
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._terminate and len(self._entries) < self._batch_size:
+                    self._condition.wait(self._flush_interval)
+                terminate = self._terminate
+            self.flush()
+            if terminate:
+                return
+
+    def stop(self) -> None:
+        """Write the pending entries and terminate"""
+        with self._condition:
+            self._terminate = True
+            self._condition.notify_all()
+        self.join()
+
+
 @dataclass
 class SQLiteSettings:
     paths: Paths
@@ -159,6 +236,8 @@ class SQLiteHistory(History):
         self._history_columns = history_columns
         self._last_housekeeping = 0.0
         self._page_size = 4096
+        # Serializes the use of the connection by the history writer and the other threads
+        self._lock = threading.RLock()
 
         if isinstance(self._settings.database, Path):
             self._settings.database.parent.mkdir(parents=True, exist_ok=True)
@@ -220,40 +299,57 @@ class SQLiteHistory(History):
             for index_statement in SQLITE_INDEXES:
                 connection.execute(index_statement)
 
+        self._writer: HistoryWriter | None = None
+        if self._config["sqlite_write_behind"]:
+            self._writer = HistoryWriter(self.add_entries, self._lock, self._logger)
+            self._writer.start()
+
+    def _flush_pending(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
     def flush(self) -> None:
         """Delete all entries the history table."""
-        with self.conn as connection:
-            connection.execute("DELETE FROM history;")
+        with self._lock:
+            self._flush_pending()
+            with self.conn as connection:
+                connection.execute("DELETE FROM history;")
 
     def add(self, event: Event, what: HistoryWhat, who: str = "", addinfo: str = "") -> None:
         """Add a single entry to the history table.
 
         No need to include the line column, as it is autoincremented.
+        In write behind mode the entry is only queued for the history writer.
         """
-        with self.conn as connection:
+        values = tuple(
+            itertools.chain(
+                (time.time(), what, who, addinfo),
+                [
+                    event.get(colname.removeprefix("event_"), defval)
+                    for colname, defval in self._event_columns
+                ],
+            )
+        )
+        if self._writer is not None:
+            self._writer.put((None, *values))
+            return
+        with self._lock, self.conn as connection:
             cur = connection.cursor()
             cur.execute(
                 f"""INSERT INTO
                     history ({', '.join(TABLE_COLUMNS[1:])})
                         VALUES ({', '.join(itertools.repeat('?', len(TABLE_COLUMNS[1:])))});""",
-                tuple(
-                    itertools.chain(
-                        (time.time(), what, who, addinfo),
-                        [
-                            event.get(colname.removeprefix("event_"), defval)
-                            for colname, defval in self._event_columns
-                        ],
-                    )
-                ),
+                values,
             )
 
     def add_entries(self, entries: Sequence[Sequence[object]]) -> None:
         """Add multiple entries to the history table.
 
-        Used only by the cmk-update-config during EC history migration to sqlite.
-        The first column is the line number, which is autoincremented, so ignored in TABLE_COLUMNS.
+        Used by the cmk-update-config during EC history migration to sqlite and by the history
+        writer. The first column is the line number, which is autoincremented, so ignored in
+        TABLE_COLUMNS.
         """
-        with self.conn as connection:
+        with self._lock, self.conn as connection:
             cur = connection.cursor()
             cur.executemany(
                 f"""INSERT INTO
@@ -271,10 +367,12 @@ class SQLiteHistory(History):
         if query.limit:
             sqlite_query += " LIMIT ?"
             sqlite_arguments += f" {query.limit + 1}"
-        with self.conn as connection:
-            cur = connection.cursor()
-            cur.execute(sqlite_query, sqlite_arguments)
-            return cur.fetchall()
+        with self._lock:
+            self._flush_pending()
+            with self.conn as connection:
+                cur = connection.cursor()
+                cur.execute(sqlite_query, sqlite_arguments)
+                return cur.fetchall()
 
     def housekeeping(self) -> None:
         """Remove old entries from the history table.
@@ -284,7 +382,7 @@ class SQLiteHistory(History):
         now = time.time()
         if now - self._last_housekeeping > self._config["sqlite_housekeeping_interval"]:
             delta = now - timedelta(days=self._config["history_lifetime"]).total_seconds()
-            with self.conn as connection:
+            with self._lock, self.conn as connection:
                 cur = connection.cursor()
                 cur.execute("DELETE FROM history WHERE time <= ?;", (delta,))
             # should be executed outside of the transaction
@@ -293,18 +391,27 @@ class SQLiteHistory(History):
 
     def _vacuum(self) -> None:
         """Run VACUUM command only if the free pages in DB are greater than 50 Mb."""
-        with self.conn as connection:
+        with self._lock, self.conn as connection:
             freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
             freelist_size = freelist_count * self._page_size
 
         if freelist_size > self._config["sqlite_freelist_size"]:
-            self.conn.execute("VACUUM;")
+            with self._lock:
+                self.conn.execute("VACUUM;")
+
+    def write_behind_status(self) -> tuple[int, float]:
+        if self._writer is None:
+            return 0, 0.0
+        return self._writer.pending, self._writer.last_flush_duration
 
     def close(self) -> None:
         """Explicitly close the connection to the sqlite database.
 
         Used during a new object instantiation,
         to avoid sqlite3.OperationalError: database is locked.
+        Pending entries of the history writer are written before.
         """
+        if self._writer is not None:
+            self._writer.stop()
         self.conn.commit()
         self.conn.close()
@@ -22,6 +22,7 @@ import json
 import os
 import pprint
 import select
+import selectors
 import signal
 import socket
 import sys
@@ -64,7 +65,7 @@ from .config import (
 from .core_queries import HostInfo, query_hosts_scheduled_downtime_depth
 from .crash_reporting import CrashReportStore, ECCrashReport
 from .event import create_events_from_syslog_messages, Event, scrub_string
-from .helpers import ECLock, parse_bytes_into_syslog_messages
+from .helpers import ECLock, parse_bytes_into_syslog_messages, receive_datagrams
 from .history import ActiveHistoryPeriod, get_logfile, History, HistoryWhat, quote_tab, TimedHistory
 from .history_file import FileHistory
 from .history_mongo import MongoDBHistory
@@ -81,7 +82,16 @@ from .query import (
     QueryREPLICATE,
     StatusTable,
 )
-from .rule_matcher import compile_rule, match, MatchFailure, MatchResult, MatchSuccess, RuleMatcher
+from .rule_matcher import (
+    compile_rule,
+    match,
+    MatchFailure,
+    MatchResult,
+    MatchSuccess,
+    required_message_literals,
+    RuleMatcher,
+    RulePrefilter,
+)
 from .rule_packs import load_active_config
 from .settings import create_settings, FileDescriptor, PortNumber, Settings
 from .snmp import SNMPTrapParser
@@ -390,6 +400,7 @@ class EventServer(ECServerThread):
         self._rules: list[Rule] = []
         self._rule_by_id: dict[str | None, Rule] = {}
         self._rule_hash: dict[int, dict[int, Any]] = {}
+        self._rule_prefilters: dict[tuple[int, int], RulePrefilter] = {}
         self._hash_stats: list[list[int]] = []  # facility/priority
         for _unused_facility in range(32):
             self._hash_stats.append([0] * 8)
@@ -430,6 +441,7 @@ class EventServer(ECServerThread):
                 Perfcounters.status_columns(),
                 cls._replication_columns(),
                 cls._event_limit_columns(),
+                cls._history_columns(),
             )
         )
 
@@ -460,6 +472,13 @@ class EventServer(ECServerThread):
             ("status_event_limit_active_overall", False),
         ]
 
+    @classmethod
+    def _history_columns(cls) -> Columns:
+        return [
+            ("status_history_queue_length", 0),
+            ("status_history_flush_time", 0.0),
+        ]
+
     def get_status(self) -> Iterable[Sequence[object]]:
         return [
             [
@@ -467,6 +486,7 @@ class EventServer(ECServerThread):
                 *self._perfcounters.get_status(),
                 *self._add_replication_status(),
                 *self._add_event_limit_status(),
+                *self._history.write_behind_status(),
             ]
         ]
 
@@ -500,6 +520,9 @@ class EventServer(ECServerThread):
             self.is_overall_event_limit_active(),
         ]
 
+    def close_history(self) -> None:
+        self._history.close()
+
     def create_pipe(self) -> None:
         path = self.settings.paths.event_pipe.value
         with contextlib.suppress(Exception):
@@ -672,90 +695,104 @@ class EventServer(ECServerThread):
         client_sockets: dict[FileDescr, tuple[socket.socket, tuple[str, int] | None, bytes]] = {}
         select_timeout = 1
         unprocessed_pipe_data = b""
-        while not self._terminate_event.is_set():
-            try:
-                readable: list[FileDescr | socket.socket] = select.select(
-                    listen_list + list(client_sockets.keys()), [], [], select_timeout
-                )[0]
-            except OSError as e:
-                if e.args[0] != errno.EINTR:
-                    raise
-                continue
-            address: tuple[str, int] | None  # host/port
-
-            # Accept new connection on event unix socket
-            if self._eventsocket in readable:
-                client_socket, remote_address = self._eventsocket.accept()
-                # We have a AF_UNIX socket, so the remote address is a str, which is always ''.
-                if not (isinstance(remote_address, str) and remote_address == ""):
-                    raise ValueError(
-                        f"Invalid remote address '{remote_address!r}' for event socket"
+        spool_dir = self.settings.paths.spool_dir.value
+        # The spool directory is only listed when its mtime changed. Additionally it is listed
+        # once per second, because the mtime may not change within the timestamp granularity.
+        spool_mtime: int | None = None
+        last_spool_scan = 0.0
+        with selectors.DefaultSelector() as selector:
+            for f in listen_list:
+                selector.register(f, selectors.EVENT_READ)
+            while not self._terminate_event.is_set():
+                readable = {key.fileobj for key, _mask in selector.select(select_timeout)}
+                address: tuple[str, int] | None  # host/port
+
+                # Accept new connection on event unix socket
+                if self._eventsocket in readable:
+                    client_socket, remote_address = self._eventsocket.accept()
+                    # We have a AF_UNIX socket, so the remote address is a str, which is always ''.
+                    if not (isinstance(remote_address, str) and remote_address == ""):
+                        raise ValueError(
+                            f"Invalid remote address '{remote_address!r}' for event socket"
+                        )
+                    client_sockets[client_socket.fileno()] = (client_socket, None, b"")
+                    selector.register(client_socket.fileno(), selectors.EVENT_READ)
+
+                # Same for the TCP syslog socket
+                if self._syslog_tcp is not None and self._syslog_tcp in readable:
+                    client_socket, address = self._syslog_tcp.accept()
+                    client_sockets[client_socket.fileno()] = (
+                        client_socket,
+                        parse_address("syslog socket (TCP)", address),
+                        b"",
                     )
-                client_sockets[client_socket.fileno()] = (client_socket, None, b"")
-
-            # Same for the TCP syslog socket
-            if self._syslog_tcp is not None and self._syslog_tcp in readable:
-                client_socket, address = self._syslog_tcp.accept()
-                client_sockets[client_socket.fileno()] = (
-                    client_socket,
-                    parse_address("syslog socket (TCP)", address),
-                    b"",
-                )
-
-            # Read data from existing event unix socket connections
-            # NOTE: We modify client_socket in the loop, so we need to copy below!
-            for fd, (cs, address, previous_data) in list(client_sockets.items()):
-                if fd in readable:
+                    selector.register(client_socket.fileno(), selectors.EVENT_READ)
+
+                # Read data from existing event unix socket connections
+                # NOTE: We modify client_socket in the loop, so we need to copy below!
+                for fd, (cs, address, previous_data) in list(client_sockets.items()):
+                    if fd in readable:
+                        try:
+                            new_data = cs.recv(65536)
+                        except Exception:
+                            new_data = b""
+                            self._logger.exception("Exception during syslog socket_tcp recv")
+
+                        if new_data:
+                            messages, unprocessed = parse_bytes_into_syslog_messages(
+                                previous_data + new_data
+                            )
+                            self.process_syslog_messages(messages, address)
+                            client_sockets[fd] = (cs, address, unprocessed)
+                        else:  # the other side is gone, no more data will ever come
+                            # discarding previous_data is OK, it's incomplete
+                            del client_sockets[fd]
+                            selector.unregister(fd)
+                            cs.close()  # do this *after* the bookkeeping above, close() can throw
+
+                # Read data from pipe
+                if pipe in readable:
                     try:
-                        new_data = cs.recv(4096)
+                        unprocessed_pipe_data += os.read(pipe, 65536)
                     except Exception:
-                        new_data = b""
-                        self._logger.exception("Exception during syslog socket_tcp recv")
+                        self._logger.exception("General exception during pipe os.read")
 
-                    if new_data:
-                        messages, unprocessed = parse_bytes_into_syslog_messages(
-                            previous_data + new_data
-                        )
-                        self.process_syslog_messages(messages, address)
-                        client_sockets[fd] = (cs, address, unprocessed)
-                    else:  # the other side is gone, no more data will ever come
-                        del client_sockets[fd]  # discarding previous_data is OK, it's incomplete
-                        cs.close()  # do this *after* the bookkeeping above, close() can throw
-
-            # Read data from pipe
-            if pipe in readable:
-                try:
-                    unprocessed_pipe_data += os.read(pipe, 4096)
-                except Exception:
-                    self._logger.exception("General exception during pipe os.read")
-
-                messages, unprocessed_pipe_data = parse_bytes_into_syslog_messages(
-                    unprocessed_pipe_data
-                )
-                self.process_syslog_messages(messages, None)
+                    messages, unprocessed_pipe_data = parse_bytes_into_syslog_messages(
+                        unprocessed_pipe_data
+                    )
+                    self.process_syslog_messages(messages, None)
 
-            # Read events from builtin syslog server
-            if self._syslog_udp is not None and self._syslog_udp in readable:
-                message, address = self._syslog_udp.recvfrom(4096)
-                self.process_syslog_messages(
-                    [message], parse_address("syslog socket (UDP)", address)
-                )
+                # Read events from builtin syslog server
+                if self._syslog_udp is not None and self._syslog_udp in readable:
+                    for message, address in receive_datagrams(self._syslog_udp, 4096, 1000):
+                        self.process_syslog_messages(
+                            [message], parse_address("syslog socket (UDP)", address)
+                        )
 
-            # Read events from builtin snmptrap server
-            if self._snmp_trap_socket is not None and self._snmp_trap_socket in readable:
-                message, address = self._snmp_trap_socket.recvfrom(65535)
-                self.process_potential_event_instrumented(
-                    self.create_events_from_trap(message, parse_address("SNMP trap", address))
-                )
+                # Read events from builtin snmptrap server
+                if self._snmp_trap_socket is not None and self._snmp_trap_socket in readable:
+                    for message, address in receive_datagrams(self._snmp_trap_socket, 65535, 1000):
+                        self.process_potential_event_instrumented(
+                            self.create_events_from_trap(
+                                message, parse_address("SNMP trap", address)
+                            )
+                        )
 
-            if spool_files := sorted(
-                self.settings.paths.spool_dir.value.glob("[!.]*"), key=lambda x: x.stat().st_mtime
-            ):
-                self.process_syslog_messages(spool_files[0].read_bytes().splitlines(), None)
-                spool_files[0].unlink()
-                select_timeout = 0  # enable fast processing to process further files
-            else:
-                select_timeout = 1  # restore default select timeout
+                try:
+                    mtime: int | None = spool_dir.stat().st_mtime_ns
+                except FileNotFoundError:
+                    mtime = None
+                now = time.monotonic()
+                if select_timeout == 0 or mtime != spool_mtime or now - last_spool_scan >= 1:
+                    spool_mtime, last_spool_scan = mtime, now
+                    if spool_files := sorted(
+                        spool_dir.glob("[!.]*"), key=lambda x: x.stat().st_mtime
+                    ):
+                        self.process_syslog_messages(spool_files[0].read_bytes().splitlines(), None)
+                        spool_files[0].unlink()
+                        select_timeout = 0  # enable fast processing to process further files
+                    else:
+                        select_timeout = 1  # restore default select timeout
 
     def create_events_from_trap(self, data: bytes, address: tuple[str, int]) -> Iterator[Event]:
         try:
@@ -1132,6 +1169,7 @@ class EventServer(ECServerThread):
         self._rule_by_id = {}
         # Speedup-Hash for rule execution
         self._rule_hash = {}
+        self._rule_prefilters = {}
         count_disabled = 0
         count_rules = 0
         count_unspecific = 0
@@ -1181,6 +1219,15 @@ class EventServer(ECServerThread):
             "Compiled %d active rules (ignoring %d disabled rules)", count_rules, count_disabled
         )
         if self._config["rule_optimizer"]:
+            # The rules of a bucket are preselected by the literals of their message patterns
+            message_literals = {id(rule): required_message_literals(rule) for rule in self._rules}
+            self._rule_prefilters = {
+                (facility, prio): RulePrefilter(
+                    [(rule, message_literals[id(rule)]) for rule in rules]
+                )
+                for facility, prio_hash in self._rule_hash.items()
+                for prio, rules in prio_hash.items()
+            }
             self._logger.info(
                 "Rule hash: %d rules - %d hashed, %d unspecific",
                 len(self._rules),
@@ -1258,9 +1305,16 @@ class EventServer(ECServerThread):
             self.log_message(event)
 
         # Rule optimizer
+        rule_candidates: Sequence[Rule]
         if self._config["rule_optimizer"]:
             self._hash_stats[event["facility"]][event["priority"]] += 1
-            rule_candidates = self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
+            prefilter = self._rule_prefilters.get((event["facility"], event["priority"]))
+            if prefilter is None:
+                rule_candidates = []
+            elif self._config["debug_rules"]:
+                rule_candidates = prefilter.rules  # trace all rules of the bucket
+            else:
+                rule_candidates = prefilter.candidates(event["text"])
         else:
             rule_candidates = self._rules
 
@@ -3504,6 +3558,9 @@ def main() -> None:
         logger.log(VERBOSE, "Saving final event state")
         event_status.save_status()
 
+        logger.log(VERBOSE, "Writing pending history entries")
+        event_server.close_history()
+
         logger.log(VERBOSE, "Cleaning up sockets")
         settings.paths.unix_socket.value.unlink()
         settings.paths.event_socket.value.unlink()
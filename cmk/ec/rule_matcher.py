@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import ipaddress
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from logging import Logger
 from typing import Literal, NamedTuple
@@ -163,6 +163,112 @@ def match_ip_network(pattern: str, ipaddress_text: str) -> bool:
     return ipaddress_ in network
 
 
+def _required_regex_literal(pattern: re.Pattern[str]) -> str | None:
+    """Returns the longest ASCII literal contained in each text matched by the regex
+
+    This walks the parse tree of the private regex parser of the re module. If it is not
+    available or behaves differently, there is no literal and the rule is not prefiltered.
+    """
+    try:
+        from re import _constants, _parser  # pylint: disable=no-name-in-module
+
+        def longest_literal(subpattern: _parser.SubPattern) -> str:
+            longest = current = ""
+            for op, av in subpattern:
+                if op is _constants.LITERAL and av < 128:
+                    current += chr(av).lower()
+                    longest = max(longest, current, key=len)
+                    continue
+                current = ""
+                # Groups and repetitions with a minimum have to match as well
+                if op is _constants.SUBPATTERN:
+                    longest = max(longest, longest_literal(av[-1]), key=len)
+                elif op in (_constants.MAX_REPEAT, _constants.MIN_REPEAT) and av[0] >= 1:
+                    longest = max(longest, longest_literal(av[-1]), key=len)
+            return longest
+
+        return longest_literal(_parser.parse(pattern.pattern, pattern.flags)) or None
+    except Exception:
+        return None
+
+
+def required_literal(pattern: TextPattern) -> str | None:
+    """Returns a lower case text that is contained in each (lower case) text matched by pattern
+
+    Only ASCII characters are taken from regexes, so the literal can only be relied on for
+    ASCII texts: The case insensitive matching of regexes is not equivalent to str.lower()
+    for some non ASCII characters.
+    """
+    if isinstance(pattern, str):
+        return pattern or None
+    return _required_regex_literal(pattern)
+
+
+def required_message_literals(rule: Rule) -> tuple[str, ...] | None:
+    """Returns the literals one of which a message text needs to contain to match the rule
+
+    None means that the rule can match any text.
+    """
+    if rule.get("invert_matching") or "match" not in rule:
+        return None
+    literals = []
+    for key in ("match", "match_ok"):
+        if key not in rule:
+            continue
+        if (literal := required_literal(rule[key])) is None:
+            return None
+        literals.append(literal)
+    return tuple(literals)
+
+
+class RulePrefilter:
+    """Preselects the rules which may match the text of a message
+
+    Instead of trying the message patterns of all rules one after another, the message text
+    is searched once for the literals required by the rules. Literals of at least
+    _ANCHOR_LENGTH characters are looked up by their start, so the effort depends on the
+    length of the text, not on the number of rules. The order of the rules is kept.
+    """
+
+    _ANCHOR_LENGTH = 3
+
+    def __init__(self, rules: Sequence[tuple[Rule, tuple[str, ...] | None]]) -> None:
+        self.rules: Sequence[Rule] = [rule for rule, _literals in rules]
+        self._unfiltered: list[int] = []
+        self._by_literal: dict[str, list[int]] = {}
+        for index, (_rule, literals) in enumerate(rules):
+            if literals is None:
+                self._unfiltered.append(index)
+                continue
+            for literal in literals:
+                self._by_literal.setdefault(literal, []).append(index)
+
+        self._short_literals: list[str] = []
+        self._by_anchor: dict[str, list[str]] = {}
+        for literal in self._by_literal:
+            if len(literal) < self._ANCHOR_LENGTH:
+                self._short_literals.append(literal)
+            else:
+                self._by_anchor.setdefault(literal[: self._ANCHOR_LENGTH], []).append(literal)
+
+    def candidates(self, text: str) -> Sequence[Rule]:
+        if not self._by_literal or not text.isascii():
+            return self.rules
+
+        text = text.lower()
+        found = {literal for literal in self._short_literals if literal in text}
+        by_anchor = self._by_anchor
+        for start in range(len(text) - self._ANCHOR_LENGTH + 1):
+            for literal in by_anchor.get(text[start : start + self._ANCHOR_LENGTH], ()):
+                if text.startswith(literal, start):
+                    found.add(literal)
+
+        indices = set(self._unfiltered)
+        for literal in found:
+            indices.update(self._by_literal[literal])
+        return [self.rules[index] for index in sorted(indices)]
+
+
 class RuleMatcher:
     def __init__(
         self,
@@ -12,12 +12,32 @@ from typing import Final
 
 from cmk.ccc.exceptions import MKFetcherError
 
+from cmk.utils import cpu_tracking
 from cmk.utils.agentdatatype import AgentRawData
 from cmk.utils.log import VERBOSE
 
 from ._abstract import Fetcher, Mode
 
 
+class _Popen(subprocess.Popen[bytes]):
+    """Account the CPU times of the program to the thread that reaps it
+
+    The per thread CPU tracking cannot tell which thread the children times of the
+    process belong to.  `_try_wait` is where `subprocess.Popen` reaps the child; should
+    it ever not be called, the times are just not accounted.
+    """
+
+    def _try_wait(self, wait_flags: int) -> tuple[int, int]:
+        try:
+            pid, sts, usage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            # Same as subprocess.Popen
+            return self.pid, 0
+        if pid == self.pid:
+            cpu_tracking.add_child_usage(usage)
+        return pid, sts
+
+
 class ProgramFetcher(Fetcher[AgentRawData]):
     def __init__(
         self,
@@ -31,7 +51,7 @@ class ProgramFetcher(Fetcher[AgentRawData]):
         self.stdin: Final = stdin
         self.is_cmc: Final = is_cmc
         self._logger: Final = logging.getLogger("cmk.helper.program")
-        self._process: subprocess.Popen | None = None
+        self._process: _Popen | None = None
 
     def __repr__(self) -> str:
         return (
@@ -75,7 +95,7 @@ class ProgramFetcher(Fetcher[AgentRawData]):
             # rather than doing it in a preexec_fn. The start_new_session parameter can take
             # the place of a previously common use of preexec_fn to call os.setsid() in the
             # child.
-            self._process = subprocess.Popen(  # nosec 602 # BNS:b00359
+            self._process = _Popen(  # nosec 602 # BNS:b00359
                 self.cmdline,
                 shell=True,
                 stdin=subprocess.PIPE if self.stdin else subprocess.DEVNULL,
@@ -88,7 +108,7 @@ class ProgramFetcher(Fetcher[AgentRawData]):
             # We can not create a separate process group when running Nagios
             # Upon reaching the service_check_timeout Nagios only kills the process
             # group of the active check.
-            self._process = subprocess.Popen(  # nosec 602 # BNS:b00359 # pylint: disable=consider-using-with
+            self._process = _Popen(  # nosec 602 # BNS:b00359 # pylint: disable=consider-using-with
                 self.cmdline,
                 shell=True,
                 stdin=subprocess.PIPE if self.stdin else subprocess.DEVNULL,
@@ -17,6 +17,7 @@ from cmk.utils.sectionname import SectionMap, SectionName
 
 from cmk.snmplib import (
     get_snmp_table,
+    prefetch_snmpwalks,
     SNMPBackend,
     SNMPHostConfig,
     SNMPRawData,
@@ -321,25 +322,37 @@ class SNMPFetcher(Fetcher[SNMPRawData]):
             walk_cache.clear()
             walk_cache_msg = "SNMP walk cache cleared"
 
-        fetched_data: dict[SectionName, SNMPRawDataElem] = {}
-        for section_name in self._sort_section_names(section_names):
-            try:
-                _from, until, _section = persisted_sections[section_name]
-                if now > until:
-                    raise LookupError(section_name)
-            except LookupError:
-                self._logger.debug("%s: Fetching data (%s)", section_name, walk_cache_msg)
-
-                fetched_data[section_name] = [
-                    get_snmp_table(
-                        section_name=section_name,
-                        tree=tree,
-                        walk_cache=walk_cache,
-                        backend=self._backend,
-                        log=self._logger.debug,
-                    )
+        fetch_section_names = [
+            section_name
+            for section_name in self._sort_section_names(section_names)
+            if section_name not in persisted_sections or now > persisted_sections[section_name][1]
+        ]
+        if self.snmp_config.max_concurrent_walks > 1:
+            prefetch_snmpwalks(
+                (
+                    (section_name, tree)
+                    for section_name in fetch_section_names
                     for tree in self.plugin_store[section_name].trees
-                ]
+                ),
+                walk_cache=walk_cache,
+                backend=self._backend,
+                max_workers=self.snmp_config.max_concurrent_walks,
+                log=self._logger.debug,
+            )
+
+        fetched_data: dict[SectionName, SNMPRawDataElem] = {}
+        for section_name in fetch_section_names:
+            self._logger.debug("%s: Fetching data (%s)", section_name, walk_cache_msg)
+            fetched_data[section_name] = [
+                get_snmp_table(
+                    section_name=section_name,
+                    tree=tree,
+                    walk_cache=walk_cache,
+                    backend=self._backend,
+                    log=self._logger.debug,
+                )
+                for tree in self.plugin_store[section_name].trees
+            ]
 
         walk_cache.save()
 
@@ -5,6 +5,7 @@
 """SNMP caching"""
 
 import os
+import time
 from pathlib import Path
 
 from cmk.ccc import store
@@ -18,12 +19,20 @@ from cmk.snmplib import OID, SNMPDecodedString
 _g_single_oid_hostname: HostName | None = None
 _g_single_oid_ipaddress: HostAddress | None = None
 _g_single_oid_cache: dict[OID, SNMPDecodedString | None] | None = None
+# The content and the creation time of the cache file the cache was loaded from
+_g_single_oid_cache_from_disk: tuple[dict[OID, SNMPDecodedString | None], float] | None = None
 
 
 def initialize_single_oid_cache(
-    host_name: HostName, ipaddress: HostAddress | None, from_disk: bool = False, *, cache_dir: Path
+    host_name: HostName, ipaddress: HostAddress | None, *, cache_dir: Path, max_age: int = 0
 ) -> None:
+    """Initialize the single OID cache of a host
+
+    The results of a former scan are used if its cache file is younger than
+    `max_age` seconds.
+    """
     global _g_single_oid_cache, _g_single_oid_ipaddress, _g_single_oid_hostname
+    global _g_single_oid_cache_from_disk
 
     if (
         _g_single_oid_hostname != host_name
@@ -32,10 +41,14 @@ def initialize_single_oid_cache(
     ):
         _g_single_oid_hostname = host_name
         _g_single_oid_ipaddress = ipaddress
-        if from_disk:
-            _g_single_oid_cache = _load_single_oid_cache(host_name, ipaddress, cache_dir=cache_dir)
-        else:
-            _g_single_oid_cache = {}
+        _g_single_oid_cache_from_disk = (
+            _load_single_oid_cache(host_name, ipaddress, cache_dir=cache_dir, max_age=max_age)
+            if max_age > 0
+            else None
+        )
+        _g_single_oid_cache = (
+            {} if _g_single_oid_cache_from_disk is None else dict(_g_single_oid_cache_from_disk[0])
+        )
 
 
 def write_single_oid_cache(
@@ -44,17 +57,45 @@ def write_single_oid_cache(
     if not _g_single_oid_cache:
         return
 
-    if not os.path.exists(cache_dir):
-        os.makedirs(cache_dir)
-    cache_path = f"{cache_dir}/{host_name}.{ipaddress}"
+    cache_path = _cache_path(host_name, ipaddress, cache_dir)
+    if _g_single_oid_cache_from_disk is None:
+        created_at = None
+    else:
+        loaded, created_at = _g_single_oid_cache_from_disk
+        if loaded == _g_single_oid_cache:
+            return
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # The file is replaced atomically, readers do not need to lock.
     store.save_object_to_file(cache_path, _g_single_oid_cache, pretty=False)
+    if created_at is not None:
+        # OIDs added to a loaded cache must not extend the life of the older ones.
+        os.utime(cache_path, (created_at, created_at))
+
+
+def invalidate_single_oid_cache(
+    host_name: HostName, ipaddress: HostAddress | None, *, cache_dir: Path
+) -> None:
+    _clear_other_hosts_oid_cache(None)
+    _cache_path(host_name, ipaddress, cache_dir).unlink(missing_ok=True)
+
+
+def _cache_path(host_name: HostName, ipaddress: HostAddress | None, cache_dir: Path) -> Path:
+    # The address is part of the name: a changed address invalidates the cache.
+    return cache_dir / f"{host_name}.{ipaddress}"
 
 
 def _load_single_oid_cache(
-    host_name: HostName, ipaddress: HostAddress | None, cache_dir: Path
-) -> dict[OID, SNMPDecodedString | None]:
-    cache_path = cache_dir / f"{host_name}.{ipaddress}"
-    return store.load_object_from_file(cache_path, default={})
+    host_name: HostName, ipaddress: HostAddress | None, *, cache_dir: Path, max_age: int
+) -> tuple[dict[OID, SNMPDecodedString | None], float] | None:
+    cache_path = _cache_path(host_name, ipaddress, cache_dir)
+    try:
+        created_at = cache_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if time.time() - created_at >= max_age:
+        return None
+    return store.load_object_from_file(cache_path, default={}), created_at
 
 
 def single_oid_cache() -> dict[OID, SNMPDecodedString | None]:
@@ -71,7 +112,9 @@ cmk.utils.cleanup.register_cleanup(cleanup_host_caches)
 
 def _clear_other_hosts_oid_cache(hostname: HostName | None) -> None:
     global _g_single_oid_cache, _g_single_oid_ipaddress, _g_single_oid_hostname
+    global _g_single_oid_cache_from_disk
     if _g_single_oid_hostname != hostname:
         _g_single_oid_cache = None
+        _g_single_oid_cache_from_disk = None
         _g_single_oid_hostname = hostname
         _g_single_oid_ipaddress = None
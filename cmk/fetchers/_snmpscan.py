@@ -29,6 +29,8 @@ class SNMPScanConfig:
     on_error: OnError
     missing_sys_description: bool
     oid_cache_dir: Path
+    # Results of a former scan younger than this are used (in seconds, 0: never)
+    oid_cache_max_age: int = 0
 
 
 # gather auto_discovered check_plugin_names for this host
@@ -46,6 +48,10 @@ def gather_available_raw_section_names(
     except MKTimeout:
         raise
     except Exception as e:
+        # Do not keep what may be the answers of another device.
+        snmp_cache.invalidate_single_oid_cache(
+            backend.config.hostname, backend.config.ipaddress, cache_dir=scan_config.oid_cache_dir
+        )
         if scan_config.on_error is OnError.RAISE:
             raise
         if scan_config.on_error is OnError.WARN:
@@ -65,7 +71,10 @@ def _snmp_scan(
     backend: SNMPBackend,
 ) -> frozenset[SectionName]:
     snmp_cache.initialize_single_oid_cache(
-        backend.config.hostname, backend.config.ipaddress, cache_dir=scan_config.oid_cache_dir
+        backend.config.hostname,
+        backend.config.ipaddress,
+        cache_dir=scan_config.oid_cache_dir,
+        max_age=scan_config.oid_cache_max_age,
     )
     backend.logger.debug("  SNMP scan:")
 
@@ -5,14 +5,14 @@
 
 from __future__ import annotations
 
-import functools
-import operator
 from abc import ABC, abstractmethod
 from collections.abc import Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from itertools import chain
-from typing import Annotated, assert_never, Callable, final, Literal, TypeVar
+from typing import Annotated, assert_never, Callable, final, Literal
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel, computed_field, PlainValidator, SerializeAsAny
 
 from livestatus import SiteId
@@ -74,63 +74,57 @@ def _derive_num_points_twindow(rrd_data: RRDData) -> tuple[int, tuple[int, int,
     return 1, (0, 60, 60)
 
 
-_TOperatorReturn = TypeVar("_TOperatorReturn")
+def clean_time_series_point(tsp: TimeSeries | TimeSeriesValues) -> list[float]:
+    """removes "None" entries from input list"""
+    return [x for x in tsp if x is not None]
 
 
-def op_func_wrapper(
-    op_func: Callable[[TimeSeries | TimeSeriesValues], _TOperatorReturn],
-    tsp: TimeSeries | TimeSeriesValues,
-) -> _TOperatorReturn | None:
-    if tsp.count(None) < len(tsp):  # At least one non-None value
-        try:
-            return op_func(tsp)
-        except ZeroDivisionError:
-            pass
-    return None
+# The operators work on an array of operands x points, missing values are NaN. A point is NaN
+# in the result if no operand has a value for it.
 
 
-def clean_time_series_point(tsp: TimeSeries | TimeSeriesValues) -> list[float]:
-    """removes "None" entries from input list"""
-    return [x for x in tsp if x is not None]
+def _time_series_operator_sum(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    result = np.nansum(operands, axis=0)
+    result[np.isnan(operands).all(axis=0)] = np.nan
+    return result
 
 
-def _time_series_operator_sum(tsp: TimeSeries | TimeSeriesValues) -> float:
-    return sum(clean_time_series_point(tsp))
+def _time_series_operator_product(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return np.prod(operands, axis=0)
 
 
-def _time_series_operator_product(tsp: TimeSeries | TimeSeriesValues) -> float | None:
-    if None in tsp:
-        return None
-    return functools.reduce(operator.mul, tsp, 1)
+def _time_series_operator_difference(
+    operands: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    return operands[0] - operands[1]
 
 
-def _time_series_operator_difference(tsp: TimeSeries | TimeSeriesValues) -> float | None:
-    if None in tsp:
-        return None
-    assert tsp[0] is not None
-    assert tsp[1] is not None
-    return tsp[0] - tsp[1]
+def _time_series_operator_fraction(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = operands[0] / operands[1]
+    result[operands[1] == 0] = np.nan
+    return result
 
 
-def _time_series_operator_fraction(tsp: TimeSeries | TimeSeriesValues) -> float | None:
-    if None in tsp or tsp[1] == 0:
-        return None
-    assert tsp[0] is not None
-    assert tsp[1] is not None
-    return tsp[0] / tsp[1]
+def _time_series_operator_maximum(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return np.fmax.reduce(operands, axis=0)
 
 
-def _time_series_operator_maximum(tsp: TimeSeries | TimeSeriesValues) -> float:
-    return max(clean_time_series_point(tsp))
+def _time_series_operator_minimum(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return np.fmin.reduce(operands, axis=0)
 
 
-def _time_series_operator_minimum(tsp: TimeSeries | TimeSeriesValues) -> float:
-    return min(clean_time_series_point(tsp))
+def _time_series_operator_average(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    counts = (~np.isnan(operands)).sum(axis=0)
+    result = np.nansum(operands, axis=0)
+    np.divide(result, counts, out=result, where=counts > 0)
+    result[counts == 0] = np.nan
+    return result
 
 
-def _time_series_operator_average(tsp: TimeSeries | TimeSeriesValues) -> float:
-    tsp_clean = clean_time_series_point(tsp)
-    return sum(tsp_clean) / len(tsp_clean)
+def _time_series_operator_merge(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    first_valid = np.argmax(~np.isnan(operands), axis=0)
+    return np.take_along_axis(operands, first_valid[np.newaxis], axis=0)[0]
 
 
 def time_series_operators() -> (
@@ -138,7 +132,7 @@ def time_series_operators() -> (
         Operators,
         tuple[
             str,
-            Callable[[TimeSeries | TimeSeriesValues], float | None],
+            Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]],
         ],
     ]
 ):
@@ -150,10 +144,18 @@ def time_series_operators() -> (
         "MAX": (_("Maximum"), _time_series_operator_maximum),
         "MIN": (_("Minimum"), _time_series_operator_minimum),
         "AVERAGE": (_("Average"), _time_series_operator_average),
-        "MERGE": ("First non None", lambda x: next(iter(clean_time_series_point(x)))),
+        "MERGE": ("First non None", _time_series_operator_merge),
     }
 
 
+def apply_time_series_operator(
+    op_func: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]],
+    operands: Sequence[TimeSeries],
+) -> npt.NDArray[np.float64]:
+    num_points = min(len(operand) for operand in operands)
+    return op_func(np.array([operand.array[:num_points] for operand in operands]))
+
+
 @dataclass(frozen=True)
 class TranslationKey:
     host_name: HostName
@@ -268,9 +270,7 @@ def _time_series_math(
     _op_title, op_func = operators[operator_id]
     twindow = operands_evaluated[0].twindow
 
-    return TimeSeries(
-        [op_func_wrapper(op_func, list(tsp)) for tsp in zip(*operands_evaluated)], twindow
-    )
+    return TimeSeries(apply_time_series_operator(op_func, operands_evaluated), twindow)
 
 
 class MetricOpOperator(MetricOperation, frozen=True):
@@ -5,13 +5,11 @@
 """Core for getting the actual raw data points via Livestatus from RRD"""
 
 import collections
-import contextlib
 import time
-from collections.abc import Callable, Iterable, Iterator, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from functools import lru_cache
 
-import livestatus
-from livestatus import livestatus_lql, SiteId
+from livestatus import lq_logic, lqencode, SiteId
 
 import cmk.ccc.version as cmk_version
 from cmk.ccc.exceptions import MKGeneralException
@@ -35,8 +33,8 @@ from ._legacy import (
     LegacyUnitSpecification,
 )
 from ._metric_operation import (
+    apply_time_series_operator,
     GraphConsolidationFunction,
-    op_func_wrapper,
     RRDData,
     RRDDataKey,
     time_series_operators,
@@ -60,30 +58,28 @@ def fetch_rrd_data_for_graph(
         for key in metric.operation.keys()
         if isinstance(key, RRDDataKey)
     )
-    rrd_data: dict[RRDDataKey, TimeSeries] = {}
-    for (site, host_name, service_description), metrics in by_service.items():
-        with contextlib.suppress(livestatus.MKLivestatusNotFoundError):
-            for (metric_name, consolidation_function, scale), data in _fetch_rrd_data(
-                site,
-                host_name,
-                service_description,
-                metrics,
-                graph_recipe.consolidation_function,
-                graph_data_range,
-            ):
-                rrd_data[
-                    RRDDataKey(
-                        site,
-                        host_name,
-                        service_description,
-                        metric_name,
-                        consolidation_function,
-                        scale,
-                    )
-                ] = TimeSeries(
-                    data,
-                    conversion=conversion,
-                )
+    rrd_data: dict[RRDDataKey, TimeSeries] = {
+        RRDDataKey(
+            site,
+            host_name,
+            service_description,
+            metric_name,
+            consolidation_function,
+            scale,
+        ): TimeSeries(
+            data,
+            conversion=conversion,
+        )
+        for (site, host_name, service_description), (
+            metric_name,
+            consolidation_function,
+            scale,
+        ), data in _fetch_rrd_data(
+            by_service,
+            graph_recipe.consolidation_function,
+            graph_data_range,
+        )
+    }
     _align_and_resample_rrds(rrd_data, graph_recipe.consolidation_function)
     _chop_last_empty_step(graph_data_range, rrd_data)
 
@@ -148,7 +144,7 @@ def _chop_last_empty_step(graph_data_range: GraphDataRange, rrd_data: RRDData) -
 
 def _chop_end_of_the_curve(rrd_data: RRDData, step: int) -> None:
     for data in rrd_data.values():
-        del data.values[-1]
+        data.array = data.array[:-1]
         data.end -= step
 
 
@@ -173,13 +169,14 @@ def _group_needed_rrd_data_by_service(
 
 
 def _fetch_rrd_data(
-    site: SiteId,
-    host_name: HostName,
-    service_description: ServiceName,
-    metrics: set[MetricProperties],
+    by_service: Mapping[tuple[SiteId, HostName, ServiceName], set[MetricProperties]],
     consolidation_function: GraphConsolidationFunction | None,
     graph_data_range: GraphDataRange,
-) -> list[tuple[MetricProperties, TimeSeriesValues]]:
+) -> Iterator[tuple[tuple[SiteId, HostName, ServiceName], MetricProperties, TimeSeriesValues]]:
+    """Fetch the RRD data of all services needing the same metrics with a single query
+
+    The sites are queried in parallel. The rows are assigned to the services by the prepended
+    site and the host and service name columns. Services without a row are left out."""
     start_time, end_time = graph_data_range.time_range
 
     step = graph_data_range.step
@@ -188,11 +185,63 @@ def _fetch_rrd_data(
         step = max(1, step)
 
     point_range = ":".join(map(str, (start_time, end_time, step)))
-    lql_columns = list(rrd_columns(metrics, consolidation_function, point_range))
-    query = livestatus_lql([host_name], lql_columns, service_description)
 
-    with sites.only_sites(site):
-        return list(zip(metrics, sites.live().query_row(query)))
+    # One query for all hosts or services needing the same metrics
+    by_metrics: dict[
+        tuple[bool, frozenset[MetricProperties]],
+        set[tuple[SiteId, HostName, ServiceName]],
+    ] = collections.defaultdict(set)
+    for service, metrics in by_service.items():
+        by_metrics[(service[2] == "_HOST_", frozenset(metrics))].add(service)
+
+    for (is_host, metric_set), services in by_metrics.items():
+        ordered_metrics = tuple(metric_set)
+        lql_columns = list(rrd_columns(ordered_metrics, consolidation_function, point_range))
+        with (
+            sites.only_sites(sorted({site for site, _host, _service in services})),
+            sites.prepend_site(),
+        ):
+            rows = sites.live().query(_rrd_data_query(services, is_host, lql_columns))
+
+        for row in rows:
+            if is_host:
+                site, host_name, *data = row
+                service = (site, host_name, ServiceName("_HOST_"))
+            else:
+                site, host_name, service_description, *data = row
+                service = (site, host_name, service_description)
+            if service in services:
+                for metric, values in zip(ordered_metrics, data):
+                    yield service, metric, values
+
+
+def _rrd_data_query(
+    services: Iterable[tuple[SiteId, HostName, ServiceName]],
+    is_host: bool,
+    lql_columns: Sequence[ColumnName],
+) -> str:
+    if is_host:
+        return "GET hosts\nColumns: %s\n%s" % (
+            " ".join(["host_name", *lql_columns]),
+            lq_logic(
+                "Filter: host_name =", sorted({host for _site, host, _service in services}), "Or"
+            ),
+        )
+
+    service_filters = sorted({(host, service) for _site, host, service in services})
+    query = "GET services\nColumns: %s\n" % " ".join(
+        ["host_name", "service_description", *lql_columns]
+    )
+    for host_name, service_description in service_filters:
+        query += "Filter: host_name = %s\nFilter: service_description = %s\n" % (
+            lqencode(host_name),
+            lqencode(service_description),
+        )
+        if len(service_filters) > 1:
+            query += "And: 2\n"
+    if len(service_filters) > 1:
+        query += "Or: %d\n" % len(service_filters)
+    return query
 
 
 def rrd_columns(
@@ -304,7 +353,7 @@ def translate_and_merge_rrd_columns(
         return TimeSeries([0, 0, 0])
 
     _op_title, op_func = time_series_operators()["MERGE"]
-    single_value_series = [op_func_wrapper(op_func, list(tsp)) for tsp in zip(*relevant_ts)]
+    single_value_series = apply_time_series_operator(op_func, relevant_ts)
 
     return TimeSeries(
         single_value_series,
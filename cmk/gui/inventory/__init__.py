@@ -21,7 +21,7 @@ from cmk.ccc.exceptions import MKException
 
 import cmk.utils.paths
 from cmk.utils.hostaddress import HostAddress, HostName
-from cmk.utils.structured_data import SDRawTree
+from cmk.utils.structured_data import DeltaHistoryStore, SDRawTree
 
 from cmk.gui import sites
 from cmk.gui.config import active_config
@@ -275,7 +275,7 @@ class InventoryHousekeeping:
             for filename in [
                 x.name
                 for x in (self._inventory_delta_cache_path / hostname).iterdir()
-                if not x.is_dir()
+                if not x.is_dir() and x.name != DeltaHistoryStore.INDEX_FILE_NAME
             ]:
                 delete = False
                 try:
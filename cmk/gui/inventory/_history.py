@@ -13,7 +13,13 @@ from cmk.ccc.exceptions import MKGeneralException
 
 import cmk.utils.paths
 from cmk.utils.hostaddress import HostName
-from cmk.utils.structured_data import ImmutableDeltaTree, ImmutableTree, load_tree, SDFilterChoice
+from cmk.utils.structured_data import (
+    DeltaHistoryStore,
+    ImmutableDeltaTree,
+    ImmutableTree,
+    load_tree,
+    SDFilterChoice,
+)
 
 from cmk.gui.i18n import _
 
@@ -133,6 +139,10 @@ def _get_history(
     except FilterInventoryHistoryPathsError:
         return [], []
 
+    # Deltas of archived trees are computed when archiving
+    indexed_deltas = DeltaHistoryStore(cmk.utils.paths.inventory_delta_cache_dir).load(
+        host_name=hostname
+    )
     cached_tree_loader = _CachedTreeLoader()
     corrupted_history_files: set[Path] = set()
     history: list[HistoryEntry] = []
@@ -153,6 +163,20 @@ def _get_history(
             filters,
         )
 
+        if (
+            indexed_delta := indexed_deltas.get((previous.timestamp, current.timestamp))
+        ) is not None:
+            if (indexed_delta.new or indexed_delta.changed or indexed_delta.removed) and (
+                history_entry := cached_delta_tree_loader.make_history_entry(
+                    indexed_delta.new,
+                    indexed_delta.changed,
+                    indexed_delta.removed,
+                    indexed_delta.delta_tree,
+                )
+            ) is not None:
+                history.append(history_entry)
+            continue
+
         if (cached_history_entry := cached_delta_tree_loader.get_cached_entry()) is not None:
             history.append(cached_history_entry)
             continue
@@ -258,7 +282,7 @@ class _CachedDeltaTreeLoader:
             return None
 
         new, changed, removed, raw_delta_tree = cached_data
-        return self._make_history_entry(
+        return self.make_history_entry(
             new,
             changed,
             removed,
@@ -280,10 +304,10 @@ class _CachedDeltaTreeLoader:
                 self._path,
                 repr((new, changed, removed, delta_tree.serialize())),
             )
-            return self._make_history_entry(new, changed, removed, delta_tree)
+            return self.make_history_entry(new, changed, removed, delta_tree)
         return None
 
-    def _make_history_entry(
+    def make_history_entry(
         self, new: int, changed: int, removed: int, delta_tree: ImmutableDeltaTree
     ) -> HistoryEntry | None:
         if self.filters is None:
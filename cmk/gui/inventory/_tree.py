@@ -134,7 +134,10 @@ def make_filter_choices_from_api_request_paths(
 
 @request_memoize(maxsize=None)
 def _load_tree_from_file(
-    *, tree_type: Literal["inventory", "status_data"], host_name: HostName | None
+    *,
+    tree_type: Literal["inventory", "status_data"],
+    host_name: HostName | None,
+    paths: tuple[SDPath, ...] | None = None,
 ) -> ImmutableTree:
     """Load data of a host, cache it in the current HTTP request"""
     if not host_name:
@@ -148,7 +151,8 @@ def _load_tree_from_file(
             if tree_type == "inventory"
             else cmk.utils.paths.status_data_dir
         )
-        / host_name
+        / host_name,
+        paths=paths,
     )
 
 
@@ -189,17 +193,23 @@ def _get_permitted_inventory_paths() -> Sequence[PermittedPath] | None:
     return permitted_paths
 
 
-def load_filtered_and_merged_tree(row: Row) -> ImmutableTree:
+def load_filtered_and_merged_tree(
+    row: Row, paths: tuple[SDPath, ...] | None = None
+) -> ImmutableTree:
     """Load inventory tree from file, status data tree from row,
-    merge these trees and returns the filtered tree"""
+    merge these trees and returns the filtered tree
+
+    If paths are given, only the subtrees below these paths are loaded from the files."""
     host_name = row.get("host_name")
-    inventory_tree = _load_tree_from_file(tree_type="inventory", host_name=host_name)
+    inventory_tree = _load_tree_from_file(tree_type="inventory", host_name=host_name, paths=paths)
     if raw_status_data_tree := row.get("host_structured_status"):
         status_data_tree = ImmutableTree.deserialize(
             ast.literal_eval(raw_status_data_tree.decode("utf-8"))
         )
     else:
-        status_data_tree = _load_tree_from_file(tree_type="status_data", host_name=host_name)
+        status_data_tree = _load_tree_from_file(
+            tree_type="status_data", host_name=host_name, paths=paths
+        )
 
     merged_tree = inventory_tree.merge(status_data_tree)
     if isinstance(permitted_paths := _get_permitted_inventory_paths(), list):
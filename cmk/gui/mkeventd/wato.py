@@ -242,6 +242,7 @@ def register(
     config_var_registry.register(ConfigVariableEventConsoleServiceLevels)
     config_var_registry.register(ConfigVariableEventConsoleSqliteHousekeepingInterval)
     config_var_registry.register(ConfigVariableEventConsoleSqliteFreelistSize)
+    config_var_registry.register(ConfigVariableEventConsoleSqliteWriteBehind)
 
     rulespec_group_registry.register(RulespecGroupEventConsole)
     rulespec_registry.register(ECEventLimitRulespec)
@@ -4098,6 +4099,30 @@ class ConfigVariableEventConsoleSqliteFreelistSize(ConfigVariable):
         )
 
 
+class ConfigVariableEventConsoleSqliteWriteBehind(ConfigVariable):
+    def group(self) -> type[ConfigVariableGroup]:
+        return ConfigVariableGroupEventConsoleGeneric
+
+    def domain(self) -> type[ABCConfigDomain]:
+        return ConfigDomainEventConsole
+
+    def ident(self) -> str:
+        return "sqlite_write_behind"
+
+    def valuespec(self) -> ValueSpec:
+        return Checkbox(
+            title=_("Write Event Console history in the background"),
+            label=_("Buffer history entries and write them in batches"),
+            help=_(
+                "Usually every history entry is written to the history database in its own "
+                "transaction while the event is processed. With this option the entries are "
+                "buffered and written by a background thread at least once per second. This "
+                "increases the event throughput, but on a crash of the Event Console the "
+                "entries of the last second may be lost."
+            ),
+        )
+
+
 class ConfigVariableEventConsoleStatisticsInterval(ConfigVariable):
     def group(self) -> type[ConfigVariableGroup]:
         return ConfigVariableGroupEventConsoleGeneric
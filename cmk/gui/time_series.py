@@ -3,8 +3,11 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import math
 from collections.abc import Callable, Iterator, Sequence
-from statistics import fmean
+
+import numpy as np
+import numpy.typing as npt
 
 Timestamp = int
 
@@ -18,24 +21,51 @@ def rrd_timestamps(time_window: TimeWindow) -> list[Timestamp]:
     return [] if step == 0 else [t + step for t in range(start, end, step)]
 
 
-def aggregation_functions(series: TimeSeriesValues, aggr: str | None) -> TimeSeriesValue:
-    """Aggregate data in series list according to aggr
+def _rrd_timestamps_array(time_window: TimeWindow) -> npt.NDArray[np.int64]:
+    start, end, step = time_window
+    if step == 0:
+        return np.array([], dtype=np.int64)
+    return np.arange(start, end, step, dtype=np.int64) + step
+
+
+def values_to_array(values: TimeSeriesValues) -> npt.NDArray[np.float64]:
+    """Missing values (None) become NaN"""
+    return np.array(values, dtype=np.float64)
 
-    If series has None values they are dropped before aggregation"""
-    cleaned_series = [x for x in series if x is not None]
-    if not cleaned_series:
-        return None
 
+def array_to_values(array: npt.NDArray[np.float64]) -> list[TimeSeriesValue]:
+    """NaN becomes None again"""
+    values: list[TimeSeriesValue] = np.where(np.isnan(array), None, array).tolist()
+    return values
+
+
+def aggregate_buckets(
+    values: npt.NDArray[np.float64],
+    buckets: npt.NDArray[np.intp],
+    num_buckets: int,
+    aggr: str | None,
+) -> npt.NDArray[np.float64]:
+    """Aggregate the values into the buckets they are assigned to
+
+    NaN values are dropped before aggregation, buckets without values are NaN."""
     aggr = "max" if aggr is None else aggr.lower()
+    valid = ~np.isnan(values)
+    values, buckets = values[valid], buckets[valid]
+    counts = np.bincount(buckets, minlength=num_buckets)
     match aggr:
         case "average":
-            return fmean(cleaned_series)
+            result = np.bincount(buckets, weights=values, minlength=num_buckets)
+            np.divide(result, counts, out=result, where=counts > 0)
         case "max":
-            return max(cleaned_series)
+            result = np.full(num_buckets, -np.inf)
+            np.maximum.at(result, buckets, values)
         case "min":
-            return min(cleaned_series)
+            result = np.full(num_buckets, np.inf)
+            np.minimum.at(result, buckets, values)
         case _:
             raise ValueError(f"Invalid Aggregation function {aggr}, only max, min, average allowed")
+    result[counts == 0] = np.nan
+    return result
 
 
 class TimeSeries:
@@ -59,12 +89,12 @@ class TimeSeries:
 
     def __init__(
         self,
-        data: TimeSeriesValues,
+        data: TimeSeriesValues | npt.NDArray[np.float64],
         time_window: TimeWindow | None = None,
-        conversion: Callable[[float], float] = lambda v: v,
+        conversion: Callable[[float], float] | None = None,
     ) -> None:
         if time_window is None:
-            if not data or data[0] is None or data[1] is None or data[2] is None:
+            if len(data) < 3 or data[0] is None or data[1] is None or data[2] is None:
                 raise ValueError(data)
 
             time_window = int(data[0]), int(data[1]), int(data[2])
@@ -74,7 +104,18 @@ class TimeSeries:
         self.start = int(time_window[0])
         self.end = int(time_window[1])
         self.step = int(time_window[2])
-        self.values = [v if v is None else conversion(v) for v in data]
+        # Missing values are stored as NaN
+        self.array = values_to_array(
+            data if conversion is None else [v if v is None else conversion(v) for v in data]
+        )
+
+    @property
+    def values(self) -> list[TimeSeriesValue]:
+        return array_to_values(self.array)
+
+    @values.setter
+    def values(self, values: TimeSeriesValues) -> None:
+        self.array = values_to_array(values)
 
     @property
     def twindow(self) -> TimeWindow:
@@ -89,12 +130,8 @@ class TimeSeries:
         if twindow == self.twindow:
             return self.values
 
-        idx_max = len(self.values) - 1
-
-        return [
-            self.values[max(0, min(int((t - self.start) / self.step), idx_max))]
-            for t in range(*twindow)
-        ]
+        indices = np.clip((np.arange(*twindow) - self.start) // self.step, 0, len(self.array) - 1)
+        return array_to_values(self.array[indices])
 
     def downsample(self, twindow: TimeWindow, cf: str | None = "max") -> TimeSeriesValues:
         """Downsample time series by consolidation function
@@ -107,23 +144,19 @@ class TimeSeries:
         if twindow == self.twindow:
             return self.values
 
-        dwsa = []
-        co: list[TimeSeriesValue] = []
-        desired_times = rrd_timestamps(twindow)
-        i = 0
-        for t, val in self.time_data_pairs():
-            if t > desired_times[i]:
-                dwsa.append(aggregation_functions(co, cf))
-                co = []
-                i += 1
-            co.append(val)
-
-        diff_len = len(desired_times) - len(dwsa)
-        if diff_len > 0:
-            dwsa.append(aggregation_functions(co, cf))
-            dwsa += [None] * (diff_len - 1)
-
-        return dwsa
+        desired_times = _rrd_timestamps_array(twindow)
+        times = _rrd_timestamps_array(self.twindow)[: len(self.array)]
+        # Each value goes to the first desired interval ending at or after its timestamp
+        buckets = np.searchsorted(desired_times, times)
+        in_range = buckets < len(desired_times)
+        return array_to_values(
+            aggregate_buckets(
+                self.array[: len(times)][in_range],
+                buckets[in_range],
+                len(desired_times),
+                cf,
+            )
+        )
 
     def time_data_pairs(self) -> list[tuple[Timestamp, TimeSeriesValue]]:
         return list(zip(rrd_timestamps(self.twindow), self.values))
@@ -139,17 +172,18 @@ class TimeSeries:
             self.start == other.start
             and self.end == other.end
             and self.step == other.step
-            and self.values == other.values
+            and np.array_equal(self.array, other.array, equal_nan=True)
         )
 
     def __getitem__(self, i: int) -> TimeSeriesValue:
-        return self.values[i]
+        value = float(self.array[i])
+        return None if math.isnan(value) else value
 
     def __len__(self) -> int:
-        return len(self.values)
+        return len(self.array)
 
     def __iter__(self) -> Iterator[TimeSeriesValue]:
         yield from self.values
 
     def count(self, /, v: TimeSeriesValue) -> int:
-        return self.values.count(v)
+        return int(np.count_nonzero(np.isnan(self.array) if v is None else self.array == v))
@@ -121,7 +121,7 @@ class RowTableInventory(ABCRowTable):
 
         try:
             table_rows = (
-                load_filtered_and_merged_tree(hostrow)
+                load_filtered_and_merged_tree(hostrow, paths=(self._inventory_path.path,))
                 .get_tree(self._inventory_path.path)
                 .table.rows_with_retentions
             )
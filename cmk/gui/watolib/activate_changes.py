@@ -23,6 +23,7 @@ import io
 import logging
 import multiprocessing
 import os
+import pickle
 import re
 import shutil
 import subprocess
@@ -2237,6 +2238,7 @@ class ReplicationPathType(enum.StrEnum):
 
 def _get_config_sync_file_infos_per_inode(
     replication_paths: Sequence[ReplicationPath],
+    file_hash_cache: _FileHashCache | None = None,
 ) -> Mapping[int, ConfigSyncFileInfo]:
     inode_sync_states = {}
 
@@ -2248,11 +2250,14 @@ def _get_config_sync_file_infos_per_inode(
 
         if replication_path.ty == ReplicationPathType.FILE:
             inode_sync_states[os.stat(replication_path_full).st_ino] = _get_config_sync_file_info(
-                replication_path_full
+                replication_path_full, file_hash_cache
             )
         elif replication_path.ty == ReplicationPathType.DIR:
             _get_replication_dir_config_sync_file_infos_per_inode(
-                inode_sync_states, replication_path_full, replication_path.excludes
+                inode_sync_states,
+                replication_path_full,
+                replication_path.excludes,
+                file_hash_cache,
             )
         else:
             raise NotImplementedError()
@@ -2264,6 +2269,7 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
     inode_sync_states: MutableMapping[int, ConfigSyncFileInfo],
     replication_path: str,
     replication_path_excludes: Sequence[str],
+    file_hash_cache: _FileHashCache | None,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -2278,12 +2284,16 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
                 and os.path.islink(dir_path)
                 and not dir_name == GENERAL_DIR_EXCLUDE
             ):
-                inode_sync_states[os.stat(dir_path).st_ino] = _get_config_sync_file_info(dir_path)
+                inode_sync_states[os.stat(dir_path).st_ino] = _get_config_sync_file_info(
+                    dir_path, file_hash_cache
+                )
 
         for file_name in file_names:
             file_path = os.path.join(root, file_name)
             if os.path.exists(file_path):
-                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(file_path)
+                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(
+                    file_path, file_hash_cache
+                )
 
 
 def _prepare_for_activation_tasks(
@@ -2293,8 +2303,9 @@ def _prepare_for_activation_tasks(
     time_started: float,
     source: ActivationSource,
 ) -> tuple[Mapping[SiteId, ConfigSyncFileInfos], Mapping[SiteId, SiteActivationState]]:
+    file_hash_cache = _FileHashCache(_FILE_HASH_CACHE_PATH)
     config_sync_file_infos_per_inode = _get_config_sync_file_infos_per_inode(
-        get_replication_paths()
+        get_replication_paths(), file_hash_cache
     )
     central_file_infos_per_site = {}
     site_activation_states_per_site = {}
@@ -2312,13 +2323,16 @@ def _prepare_for_activation_tasks(
 
             if activate_changes.is_sync_needed(site_id):
                 central_file_infos_per_site[site_id] = _get_site_central_file_infos(
-                    site_id, snapshot_settings, config_sync_file_infos_per_inode
+                    site_id, snapshot_settings, config_sync_file_infos_per_inode, file_hash_cache
                 )
         except Exception as e:
             _handle_activation_changes_exception(
                 logger.getChild(f"site[{site_id}]"), str(e), site_activation_state
             )
             _cleanup_activation(site_id, activation_id, source)
+
+    file_hash_cache.save()
+    file_hash_cache.log_stats()
     return central_file_infos_per_site, site_activation_states_per_site
 
 
@@ -2326,6 +2340,7 @@ def _get_site_central_file_infos(
     site_id: SiteId,
     snapshot_settings: SnapshotSettings,
     config_sync_file_infos_per_inode: Mapping[int, ConfigSyncFileInfo],
+    file_hash_cache: _FileHashCache,
 ) -> ConfigSyncFileInfos:
     # In case we experience performance issues here, we could postpone the hashing of the
     # central files to only be done ad-hoc in get_file_names_to_sync when the other attributes
@@ -2336,6 +2351,7 @@ def _get_site_central_file_infos(
         snapshot_settings.snapshot_components,
         site_config_dir,
         config_sync_file_infos_per_inode,
+        file_hash_cache,
     )
 
     logger.getChild(f"site[{site_id}]").debug(
@@ -3152,7 +3168,12 @@ class AutomationGetConfigSyncState(AutomationCommand[list[ReplicationPath]]):
 
     def execute(self, api_request: list[ReplicationPath]) -> GetConfigSyncStateResponse:
         with store.lock_checkmk_configuration(configuration_lockfile):
-            file_infos = _get_config_sync_file_infos(api_request, base_dir=cmk.utils.paths.omd_root)
+            file_hash_cache = _FileHashCache(_FILE_HASH_CACHE_PATH)
+            file_infos = _get_config_sync_file_infos(
+                api_request, base_dir=cmk.utils.paths.omd_root, file_hash_cache=file_hash_cache
+            )
+            file_hash_cache.save()
+            file_hash_cache.log_stats()
             transport_file_infos = {
                 k: (v.st_mode, v.st_size, v.link_target, v.file_hash) for k, v in file_infos.items()
             }
@@ -3192,6 +3213,7 @@ def _get_config_sync_file_infos(
     replication_paths: list[ReplicationPath],
     base_dir: Path,
     config_sync_file_infos_per_inode: Mapping[int, ConfigSyncFileInfo] | None = None,
+    file_hash_cache: _FileHashCache | None = None,
 ) -> ConfigSyncFileInfos:
     """Scans the given replication paths for the information needed for the config sync
 
@@ -3211,7 +3233,9 @@ def _get_config_sync_file_infos(
             continue  # Only report back existing things
 
         if replication_path.ty == ReplicationPathType.FILE:
-            infos[replication_path.site_path] = _get_config_sync_file_info(replication_path_full)
+            infos[replication_path.site_path] = _get_config_sync_file_info(
+                replication_path_full, file_hash_cache
+            )
 
         elif replication_path.ty == ReplicationPathType.DIR:
             _get_replication_dir_config_sync_file_infos(
@@ -3220,6 +3244,7 @@ def _get_config_sync_file_infos(
                 base_dir,
                 replication_path_full,
                 replication_path.excludes,
+                file_hash_cache,
             )
         else:
             raise NotImplementedError()
@@ -3232,6 +3257,7 @@ def _get_replication_dir_config_sync_file_infos(
     base_dir: Path,
     replication_path: str,
     replication_path_excludes: Sequence[str],
+    file_hash_cache: _FileHashCache | None,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -3251,19 +3277,31 @@ def _get_replication_dir_config_sync_file_infos(
                 ):
                     infos[valid_site_path] = sync_file_info
                 else:
-                    infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                    infos[valid_site_path] = _get_config_sync_file_info(
+                        config_sync_path, file_hash_cache
+                    )
             except FileNotFoundError:  # e.g. broken symlinks
-                infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                infos[valid_site_path] = _get_config_sync_file_info(
+                    config_sync_path, file_hash_cache
+                )
 
 
-def _get_config_sync_file_info(file_path: str) -> ConfigSyncFileInfo:
+def _get_config_sync_file_info(
+    file_path: str, file_hash_cache: _FileHashCache | None = None
+) -> ConfigSyncFileInfo:
     stat = os.lstat(file_path)
     is_symlink = os.path.islink(file_path)
+    if is_symlink:
+        file_hash = None
+    elif file_hash_cache is None:
+        file_hash = _create_config_sync_file_hash(file_path)
+    else:
+        file_hash = file_hash_cache.file_hash(file_path, stat)
     return ConfigSyncFileInfo(
         stat.st_mode,
         stat.st_size,
         os.readlink(str(file_path)) if is_symlink else None,
-        _create_config_sync_file_hash(file_path) if not is_symlink else None,
+        file_hash,
     )
 
 
@@ -3278,6 +3316,63 @@ def _create_config_sync_file_hash(file_path: str) -> str:
     return sha256.hexdigest()
 
 
+_FILE_HASH_CACHE_PATH = cmk.utils.paths.tmp_dir / "wato/config_sync_file_hashes.pkl"
+
+# (inode, size, mtime, ctime) -> (hash, seconds needed to compute it)
+_FileHashCacheEntries = dict[tuple[int, int, int, int], tuple[str, float]]
+
+
+class _FileHashCache:
+    """The hashes of the replicated files of the last config sync
+
+    A hash is reused as long as inode, size, mtime and ctime of the file are unchanged. Only the
+    hashes used during the current sync are saved again.
+    """
+
+    # Files changed within this time may change again without changing their timestamps
+    _MIN_AGE_NS = 2_000_000_000
+
+    def __init__(self, path: Path) -> None:
+        self._store = store.ObjectStore(
+            path, serializer=store.PickleSerializer[_FileHashCacheEntries]()
+        )
+        try:
+            self._cached = self._store.read_obj(default={})
+        except (MKGeneralException, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            self._cached = {}
+        self._used: _FileHashCacheEntries = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def file_hash(self, file_path: str, stat: os.stat_result) -> str:
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+        if (entry := self._cached.get(key)) is not None:
+            self.hits += 1
+            self.saved_seconds += entry[1]
+            self._used[key] = entry
+            return entry[0]
+
+        self.misses += 1
+        start_time = time.perf_counter()
+        file_hash = _create_config_sync_file_hash(file_path)
+        if time.time_ns() - max(stat.st_mtime_ns, stat.st_ctime_ns) > self._MIN_AGE_NS:
+            self._used[key] = (file_hash, time.perf_counter() - start_time)
+        return file_hash
+
+    def save(self) -> None:
+        store.makedirs(self._store.path.parent)
+        self._store.write_obj(self._used)
+
+    def log_stats(self) -> None:
+        logger.debug(
+            "File hash cache: %d hits, %d misses, %.3fs saved",
+            self.hits,
+            self.misses,
+            self.saved_seconds,
+        )
+
+
 def update_config_generation() -> None:
     """Increase the config generation ID
 
@@ -6,12 +6,14 @@
 from . import config
 from ._storage import (
     cleanup_piggyback_files,
+    get_piggyback_meta_data,
     get_piggyback_raw_data,
     get_piggybacked_host_with_sources,
     load_last_distribution_time,
     move_for_host_rename,
     PiggybackMessage,
     PiggybackMetaData,
+    PiggybackRawDataWriter,
     remove_source_status_file,
     store_last_distribution_time,
     store_piggyback_raw_data,
@@ -21,9 +23,11 @@ __all__ = [
     "config",
     "cleanup_piggyback_files",
     "get_piggybacked_host_with_sources",
+    "get_piggyback_meta_data",
     "get_piggyback_raw_data",
     "PiggybackMetaData",
     "PiggybackMessage",
+    "PiggybackRawDataWriter",
     "remove_source_status_file",
     "store_piggyback_raw_data",
     "move_for_host_rename",
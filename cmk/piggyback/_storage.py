@@ -10,10 +10,11 @@ import logging
 import os
 import shutil
 import tempfile
-from collections.abc import Iterable, Mapping, Sequence
+import weakref
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Self
+from typing import Final, Self
 
 from cmk.utils.hostaddress import HostAddress, HostName
 
@@ -71,7 +72,7 @@ def get_piggyback_raw_data(
     piggybacked_hostname: HostAddress, omd_root: Path
 ) -> Sequence[PiggybackMessage]:
     """Returns piggyback messages for the given host"""
-    piggyback_meta_data = _get_payload_meta_data(piggybacked_hostname, omd_root)
+    piggyback_meta_data = get_piggyback_meta_data(piggybacked_hostname, omd_root)
     logger.debug("%s piggyback files for '%s'.", len(piggyback_meta_data), piggybacked_hostname)
 
     piggyback_data = []
@@ -98,7 +99,7 @@ def get_piggybacked_host_with_sources(
 ) -> Mapping[HostAddress, Sequence[PiggybackMetaData]]:
     """Generates all piggyback pig/piggybacked host pairs"""
     return {
-        piggybacked_host: _get_payload_meta_data(piggybacked_host, omd_root)
+        piggybacked_host: get_piggyback_meta_data(piggybacked_host, omd_root)
         for piggybacked_host_folder in _get_piggybacked_host_folders(omd_root)
         if (piggybacked_host := HostAddress(piggybacked_host_folder.name))
     }
@@ -119,6 +120,89 @@ def remove_source_status_file(source_hostname: HostName, omd_root: Path) -> bool
     return _remove_piggyback_file(source_status_path)
 
 
+class PiggybackRawDataWriter(Mapping[HostName, Sequence[bytes]]):
+    """Collect the piggyback data of a source host in files while its output is parsed
+
+    The lines of every piggybacked host are appended to a hidden file next to its final
+    location, so they do not have to be kept in memory. `store_piggyback_raw_data` moves
+    the files into place. Files that are never stored are removed with the writer, or by
+    `cleanup_piggyback_files` if the process did not get to do so.
+    """
+
+    def __init__(self, source_hostname: HostName, omd_root: Path) -> None:
+        self.source_hostname: Final = source_hostname
+        self.omd_root: Final = omd_root
+        self._files: dict[HostName, Path] = {}
+        self._sizes: dict[HostName, int] = {}
+        self._finalizer = weakref.finalize(self, _remove_files, self._files.values())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.source_hostname!r}, {sorted(self._files)!r})"
+
+    def __getitem__(self, piggybacked_hostname: HostName) -> Sequence[bytes]:
+        lines = self._files[piggybacked_hostname].read_bytes().split(b"\n")[:-1]
+        return [] if lines == [b""] else lines
+
+    def __iter__(self) -> Iterator[HostName]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def append(self, piggybacked_hostname: HostName, lines: Iterable[bytes]) -> None:
+        content = b"".join(b"%s\n" % line for line in lines)
+        if (file_path := self._files.get(piggybacked_hostname)) is not None:
+            with file_path.open("ab") as f:
+                f.write(content)
+            self._sizes[piggybacked_hostname] += len(content)
+            return
+
+        final_path = _get_piggybacked_file_path(
+            self.source_hostname, piggybacked_hostname, self.omd_root
+        )
+        final_path.parent.mkdir(mode=0o770, exist_ok=True, parents=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=str(final_path.parent), prefix=f".{final_path.name}.new", delete=False
+        ) as tmp:
+            self._files[piggybacked_hostname] = Path(tmp.name)
+            tmp.write(content)
+        self._sizes[piggybacked_hostname] = len(content)
+
+    def savepoint(self) -> Mapping[HostName, int]:
+        return dict(self._sizes)
+
+    def rollback(self, savepoint: Mapping[HostName, int]) -> None:
+        """Discard everything appended since the savepoint was taken"""
+        for piggybacked_hostname in list(self._files):
+            if (size := savepoint.get(piggybacked_hostname)) is None:
+                self._files.pop(piggybacked_hostname).unlink(missing_ok=True)
+                del self._sizes[piggybacked_hostname]
+            elif size != self._sizes[piggybacked_hostname]:
+                os.truncate(self._files[piggybacked_hostname], size)
+                self._sizes[piggybacked_hostname] = size
+
+    def _commit(self, timestamp: float) -> None:
+        for piggybacked_hostname, file_path in self._files.items():
+            final_path = _get_piggybacked_file_path(
+                self.source_hostname, piggybacked_hostname, self.omd_root
+            )
+            if file_path == final_path:
+                continue
+            logger.debug("Storing piggyback data for: %r", piggybacked_hostname)
+            if not (file_stats := file_path.stat()).st_size:
+                # Same content as for an empty list of lines below
+                file_path.write_bytes(b"\n")
+            os.utime(file_path, (file_stats.st_atime, timestamp))
+            os.rename(file_path, final_path)
+            self._files[piggybacked_hostname] = final_path
+        self._finalizer.detach()
+
+
+def _remove_files(file_paths: Iterable[Path]) -> None:
+    for file_path in file_paths:
+        file_path.unlink(missing_ok=True)
+
+
 def store_piggyback_raw_data(
     source_hostname: HostName,
     piggybacked_raw_data: Mapping[HostName, Sequence[bytes]],
@@ -132,19 +216,20 @@ def store_piggyback_raw_data(
         remove_source_status_file(source_hostname, omd_root)
         return
 
-    piggyback_file_paths = []
-    for piggybacked_hostname, lines in piggybacked_raw_data.items():
-        piggyback_file_path = _get_piggybacked_file_path(
-            source_hostname, piggybacked_hostname, omd_root
-        )
-        logger.debug("Storing piggyback data for: %r", piggybacked_hostname)
-        # Raw data is always stored as bytes. Later the content is
-        # converted to unicode in abstact.py:_parse_info which respects
-        # 'encoding' in section options.
-        _write_file_with_mtime(
-            file_path=piggyback_file_path, content=b"%s\n" % b"\n".join(lines), mtime=timestamp
-        )
-        piggyback_file_paths.append(piggyback_file_path)
+    if (
+        isinstance(piggybacked_raw_data, PiggybackRawDataWriter)
+        and piggybacked_raw_data.source_hostname == source_hostname
+        and piggybacked_raw_data.omd_root == omd_root
+    ):
+        writer = piggybacked_raw_data
+    else:
+        writer = PiggybackRawDataWriter(source_hostname, omd_root)
+        for piggybacked_hostname, lines in piggybacked_raw_data.items():
+            # Raw data is always stored as bytes. Later the content is
+            # converted to unicode in abstact.py:_parse_info which respects
+            # 'encoding' in section options.
+            writer.append(piggybacked_hostname, lines)
+    writer._commit(timestamp)
 
     # Store the last contact with this piggyback source to be able to filter outdated data later
     # We use the mtime of this file later for comparison.
@@ -202,11 +287,13 @@ def load_last_distribution_time(
 #   '----------------------------------------------------------------------'
 
 
-def _get_payload_meta_data(
+def get_piggyback_meta_data(
     piggybacked_hostname: HostName, omd_root: Path
 ) -> Sequence[PiggybackMetaData]:
     """Gather a list of piggyback files to read for further processing.
 
+    Only the folder of the piggybacked host is looked at, not the whole piggyback tree.
+
     Please note that there may be multiple parallel calls executing
     store_piggyback_raw_data() or cleanup_piggyback_files() functions.
     All these functions need to deal with suddenly vanishing or updated files/directories.
@@ -299,6 +386,9 @@ def cleanup_piggyback_files(cut_off_timestamp: float, omd_root: Path) -> None:
     ]
 
     _cleanup_old_source_status_files(_get_source_state_files(omd_root), cut_off_timestamp)
+    _cleanup_old_temporary_files(
+        (folder for folder, _source_hosts in piggybacked_hosts_settings), cut_off_timestamp
+    )
     _cleanup_old_piggybacked_files(piggybacked_hosts_settings, cut_off_timestamp)
 
 
@@ -320,6 +410,24 @@ def _cleanup_old_source_status_files(
             _remove_piggyback_file(source_state_file)
 
 
+def _cleanup_old_temporary_files(
+    piggybacked_host_folders: Iterable[Path], cut_off_timestamp: float
+) -> None:
+    """Remove temporary files left behind by processes that ended before storing them."""
+    for piggybacked_host_folder in piggybacked_host_folders:
+        for temporary_file in piggybacked_host_folder.glob(".*.new*"):
+            if (mtime := _get_mtime(temporary_file)) is None:
+                continue
+
+            if mtime < cut_off_timestamp:
+                logger.debug(
+                    "Temporary piggyback file '%s' too old (%s). Remove it.",
+                    temporary_file,
+                    _render_datetime(mtime),
+                )
+                _remove_piggyback_file(temporary_file)
+
+
 def _cleanup_old_piggybacked_files(
     piggybacked_hosts_settings: Iterable[tuple[Path, Iterable[Path]]], cut_off_timestamp: float
 ) -> None:
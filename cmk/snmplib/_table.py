@@ -6,7 +6,8 @@
 
 import contextlib
 import hashlib
-from collections.abc import Callable, MutableMapping, Sequence
+from collections.abc import Callable, Iterable, MutableMapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from typing import assert_never
 
@@ -128,6 +129,50 @@ def get_snmp_table(
     return new_info
 
 
+def prefetch_snmpwalks(
+    trees: Iterable[tuple[SectionName | None, BackendSNMPTree]],
+    *,
+    walk_cache: MutableMapping[tuple[str, str, bool], SNMPRowInfo],
+    backend: SNMPBackend,
+    max_workers: int,
+    log: Callable[[str], None],
+) -> None:
+    """Walk the columns of several trees concurrently
+
+    At most `max_workers` walks are sent to the device at the same time.  The
+    results are put into the walk cache, where `get_snmp_table` takes them from.
+    """
+    walks: dict[tuple[OID, tuple[SNMPContext, ...], bool], tuple[SectionName | None, str]] = {}
+    for section_name, tree in trees:
+        contexts = tuple(backend.config.snmpv3_contexts_of(section_name).contexts)
+        for oid in tree.oids:
+            if not isinstance(oid.column, SpecialColumn):
+                walks.setdefault(
+                    (f"{tree.base}.{oid.column}", contexts, oid.save_to_cache),
+                    (section_name, tree.base),
+                )
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snmpwalk")
+    try:
+        for future in [
+            executor.submit(
+                get_snmpwalk,
+                section_name,
+                base_oid,
+                fetchoid,
+                walk_cache=walk_cache,
+                save_walk_cache=save_walk_cache,
+                backend=backend,
+                log=log,
+            )
+            for (fetchoid, _contexts, save_walk_cache), (section_name, base_oid) in walks.items()
+        ]:
+            future.result()
+    finally:
+        # Do not wait for the remaining walks if one of them failed.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def _make_index_rows(
     max_column: SNMPRowInfo,
     index_format: SpecialColumn,
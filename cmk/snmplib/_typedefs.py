@@ -135,6 +135,8 @@ class SNMPHostConfig:
     snmpv3_contexts: Sequence[SNMPContextConfig]
     character_encoding: str | None
     snmp_backend: SNMPBackendEnum
+    # Number of walks sent to the device at the same time
+    max_concurrent_walks: int = 1
 
     @property
     def use_bulkwalk(self) -> bool:
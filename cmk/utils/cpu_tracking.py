@@ -7,9 +7,20 @@ from __future__ import annotations
 
 import os
 import posix
+import resource
+import threading
 from collections.abc import Callable
 from dataclasses import dataclass
 
+# CPU times of the reaped child processes per thread, see `add_child_usage`
+_children_times = threading.local()
+
+
+def add_child_usage(usage: resource.struct_rusage) -> None:
+    """Account the resource usage of a reaped child process to the calling thread"""
+    user, system = getattr(_children_times, "times", (0.0, 0.0))
+    _children_times.times = (user + usage.ru_utime, system + usage.ru_stime)
+
 
 @dataclass(frozen=True)
 class Snapshot:
@@ -27,6 +38,26 @@ class Snapshot:
     def take(cls) -> Snapshot:
         return cls(os.times())
 
+    @classmethod
+    def take_thread(cls) -> Snapshot:
+        """Take a snapshot of the CPU times of the calling thread only.
+
+        The children times are those reported with `add_child_usage` by this thread.
+        """
+        usage = resource.getrusage(resource.RUSAGE_THREAD)
+        children_user, children_system = getattr(_children_times, "times", (0.0, 0.0))
+        return cls(
+            posix.times_result(
+                (
+                    usage.ru_utime,
+                    usage.ru_stime,
+                    children_user,
+                    children_system,
+                    os.times().elapsed,
+                )
+            )
+        )
+
     @classmethod
     def deserialize(cls, serialized: object) -> Snapshot:
         try:
@@ -53,9 +84,10 @@ class Snapshot:
 
 
 class CPUTracker:
-    def __init__(self, log: Callable[[str], None]) -> None:
+    def __init__(self, log: Callable[[str], None], *, per_thread: bool = False) -> None:
         super().__init__()
         self._log = log
+        self._take = Snapshot.take_thread if per_thread else Snapshot.take
         self._start: Snapshot = Snapshot.null()
         self._end: Snapshot = Snapshot.null()
 
@@ -63,12 +95,12 @@ class CPUTracker:
         return "%s()" % type(self).__name__
 
     def __enter__(self) -> CPUTracker:
-        self._start = Snapshot.take()
+        self._start = self._take()
         self._log(f"[cpu_tracking] Start [{id(self):x}]")
         return self
 
     def __exit__(self, *exc_info: object) -> None:
-        self._end = Snapshot.take()
+        self._end = self._take()
         self._log(f"[cpu_tracking] Stop [{id(self):x} - {self.duration}]")
 
     @property
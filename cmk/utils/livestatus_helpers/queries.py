@@ -3,11 +3,11 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from contextlib import contextmanager
 from typing import Any, NoReturn
 
-from livestatus import LivestatusResponse, MultiSiteConnection, OnlySites, SiteId
+from livestatus import LivestatusResponse, LivestatusRow, MultiSiteConnection, OnlySites, SiteId
 
 from cmk.utils.livestatus_helpers import tables
 from cmk.utils.livestatus_helpers.expressions import (
@@ -245,7 +245,7 @@ description = CPU\\nFilter: host_name ~ morgen\\nNegate: 1\\nAnd: 3'
             Optionally a ResultRow
 
         """
-        return next(self.iterate(sites), None)
+        return next(self._result_rows(sites, self.fetch_values(sites)), None)
 
     def first_value(self, sites: MultiSiteConnection) -> Any | None:
         """Fetch one cell from the result.
@@ -453,7 +453,15 @@ description = CPU\\nFilter: host_name ~ morgen\\nNegate: 1\\nAnd: 3'
             [{'site': 'NO_SITE', 'name': 'heute', 'parents': ['example.com']}, \
 {'site': 'NO_SITE', 'name': 'example.com', 'parents': []}]
 
+        The rows are yielded while the response is being received, so large results are not
+        held in memory as a whole.
+
         """
+        return self._result_rows(sites, sites.query_stream(self.compile()))
+
+    def _result_rows(
+        self, sites: MultiSiteConnection, entries: Iterable[LivestatusRow]
+    ) -> Generator[ResultRow, None, None]:
         if sites.prepend_site:
             if "site" in self.column_names:
                 raise ValueError("Conflict: site both as column in a table and via prepend_site")
@@ -461,7 +469,7 @@ description = CPU\\nFilter: host_name ~ morgen\\nNegate: 1\\nAnd: 3'
         else:
             names = self.column_names
 
-        for entry in self.fetch_values(sites):
+        for entry in entries:
             # This is dict[str, Any], just with Attribute based access. Can't do much about this.
             yield ResultRow(list(zip(names, entry)))
 
@@ -33,7 +33,7 @@ def make_updated_predictions(
     store.remove_outdated_predictions(now)
     return {
         hash(meta): _make_reference_and_prediction(
-            meta, valid_prediction or _update_prediction(store, meta, get_recorded_data), now
+            meta, valid_prediction or _update_prediction(store, meta, get_recorded_data, now), now
         )
         for meta, valid_prediction in store.iter_all_valid_predictions(now)
     }
@@ -60,6 +60,7 @@ def _update_prediction(
     store: PredictionStore,
     meta: PredictionInfo,
     get_recorded_data: Callable[[str, int, int], MetricRecord | None],
+    now: float,
 ) -> PredictionData | None:
     logger.log(
         VERBOSE,
@@ -68,8 +69,12 @@ def _update_prediction(
         meta.params.period,
         meta.valid_interval[0],
     )
-    if (prediction := compute_prediction(meta, get_recorded_data)) is None:
+    if (
+        computed := compute_prediction(meta, get_recorded_data, now, store.load_slice_cache(meta))
+    ) is None:
         return None
+    prediction, slice_cache = computed
+    store.save_slice_cache(meta, slice_cache)
     store.save_prediction(meta, prediction)
     return prediction
 
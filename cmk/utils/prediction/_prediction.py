@@ -3,11 +3,13 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+from __future__ import annotations
+
 import logging
-import math
-from collections.abc import Callable, Iterable, Iterator, Sequence
+import zipfile
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
-from typing import Final, Literal, NamedTuple, Protocol, Self
+from typing import Final, Literal, NamedTuple, Protocol, TYPE_CHECKING
 
 from pydantic import BaseModel
 
@@ -15,6 +17,24 @@ from cmk.agent_based.prediction_backend import PredictionInfo
 
 from ._grouping import time_slices
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+
+    class _LazyNumpy:
+        """numpy, imported on first use
+
+        numpy takes about 50 ms to import. It is only needed to compute a prediction.
+        """
+
+        def __getattr__(self, name: str) -> object:
+            import numpy
+
+            return getattr(numpy, name)
+
+    np = _LazyNumpy()
+
 logger = logging.getLogger("cmk.prediction")
 
 
@@ -38,16 +58,16 @@ class DataStat(NamedTuple):
     max_: float
     stdev: float | None
 
-    @classmethod
-    def from_values(cls, values: Sequence[float]) -> Self:
-        """Statistically summarize all the measured values"""
-        average = sum(values) / float(len(values))
-        return cls(
-            average=average,
-            min_=min(values),
-            max_=max(values),
-            stdev=_std_dev(values, average),
-        )
+
+class SliceCache(NamedTuple):
+    """Resampled values of complete time slices, keyed by the start of the slice
+
+    The grid is the offset of the first point to the start of the slice,
+    the step and the number of points. Rows are only reusable on the same grid.
+    """
+
+    grid: tuple[int, int, int]
+    rows: Mapping[int, npt.NDArray[np.float64]]
 
 
 class PredictionData(BaseModel, frozen=True):
@@ -66,6 +86,7 @@ class PredictionData(BaseModel, frozen=True):
 class PredictionStore:
     DATA_FILE_SUFFIX = ""
     INFO_FILE_SUFFIX = ".info"
+    SLICE_CACHE_FILE_SUFFIX = ".slices"
     NAME_TEMPLATE = "{meta.metric}/{meta.params.period}-{meta.valid_interval[0]}-{meta.direction}"
     RETENTION = {
         "wday": 7 * _DAY,
@@ -108,6 +129,38 @@ class PredictionStore:
         data_file.parent.mkdir(exist_ok=True, parents=True)
         data_file.write_text(prediction.model_dump_json())
 
+    def _slice_cache_file(self, meta: PredictionInfo) -> Path:
+        # One file for all timegroups: the rows are keyed by the start of their slice.
+        return (
+            self.path
+            / meta.metric
+            / f"{meta.params.period}-{meta.direction}{self.SLICE_CACHE_FILE_SUFFIX}"
+        )
+
+    def load_slice_cache(self, meta: PredictionInfo) -> SliceCache | None:
+        try:
+            with np.load(self._slice_cache_file(meta), allow_pickle=False) as data:
+                offset, step, points = data["grid"].tolist()
+                return SliceCache(
+                    grid=(offset, step, points),
+                    rows=dict(zip(data["starts"].tolist(), data["rows"])),
+                )
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+
+    def save_slice_cache(self, meta: PredictionInfo, cache: SliceCache) -> None:
+        cache_file = self._slice_cache_file(meta)
+        cache_file.parent.mkdir(exist_ok=True, parents=True)
+        with cache_file.open("wb") as f:
+            np.savez(
+                f,
+                grid=np.array(cache.grid, dtype=np.int64),
+                starts=np.fromiter(cache.rows, dtype=np.int64, count=len(cache.rows)),
+                rows=np.array(list(cache.rows.values()), dtype=np.float64).reshape(
+                    len(cache.rows), cache.grid[2]
+                ),
+            )
+
     def iter_all_metadata_files(self) -> Iterable[Path]:
         if not self.path.exists():
             return ()
@@ -121,6 +174,17 @@ class PredictionStore:
                 info_path.unlink(missing_ok=True)
                 info_path.with_suffix(self.DATA_FILE_SUFFIX).unlink(missing_ok=True)
 
+        if not self.path.exists():
+            return
+        # The slice caches are rewritten with every computed prediction.
+        for cache_path in self.path.rglob(f"*{self.SLICE_CACHE_FILE_SUFFIX}"):
+            period = cache_path.name.split("-")[0]
+            try:
+                if (now - cache_path.stat().st_mtime) > self.RETENTION[period]:
+                    cache_path.unlink(missing_ok=True)
+            except (FileNotFoundError, KeyError):
+                continue
+
     def iter_all_valid_predictions(
         self, now: float
     ) -> Iterator[tuple[PredictionInfo, PredictionData | None]]:
@@ -146,42 +210,65 @@ class PredictionStore:
 def compute_prediction(
     info: PredictionInfo,
     get_recorded_data: Callable[[str, int, int], MetricRecord | None],
-) -> PredictionData | None:
+    now: float,
+    cache: SliceCache | None = None,
+) -> tuple[PredictionData, SliceCache] | None:
+    """Compute the prediction, fetching only the slices missing in the cache
+
+    The returned cache holds all slices that were complete at the time of computation.
+    Cached rows keep the resolution they were fetched with, while a computation without
+    cache gets older slices from the coarser RRAs. The results may differ accordingly.
+    """
     time_windows = time_slices(
         info.valid_interval[0], info.params.horizon * 86400, info.params.period
     )
 
     from_time = time_windows[0][0]
-    raw_slices = [
-        (
+    youngest_range: range | None = None
+    rows: dict[int, npt.NDArray[np.float64]] = {}
+    for start, end in time_windows:
+        if youngest_range is not None and cache is not None and start in cache.rows:
+            rows[start] = cache.rows[start]
+            continue
+
+        if not (response := get_recorded_data(f"{info.metric}.max", start, end)):
+            continue
+
+        if youngest_range is None:
+            # We assume that the youngest slice has the finest resolution.
+            youngest_range = response.window
+            grid = (youngest_range.start - from_time, youngest_range.step, len(youngest_range))
+            if cache is not None and cache.grid != grid:
+                cache = None
+
+        shift = from_time - start
+        rows[start] = _forward_fill_resample(
             response.window,
             response.values,
-            from_time - start,
+            range(youngest_range.start - shift, youngest_range.stop - shift, youngest_range.step),
         )
-        for start, end in time_windows
-        if (response := get_recorded_data(f"{info.metric}.max", start, end))
-    ]
 
-    return _calculate_data_for_prediction(raw_slices[0][0], raw_slices) if raw_slices else None
+    if youngest_range is None:
+        return None
 
+    # Keep the rows of other timegroups, as long as they are within the horizon.
+    kept_rows = (
+        {}
+        if cache is None
+        else {start: row for start, row in cache.rows.items() if start >= time_windows[-1][0]}
+    )
+    complete_rows = {
+        start: rows[start] for start, end in time_windows if end <= now and start in rows
+    }
+    return (
+        _make_prediction_data(youngest_range, np.array(list(rows.values()))),
+        SliceCache(grid=grid, rows=kept_rows | complete_rows),
+    )
 
-def _calculate_data_for_prediction(
-    youngest_range: range,
-    raw_slices: Sequence[tuple[range, Sequence[float | None], int]],
-) -> PredictionData:
-    # Upsample all time slices to same resolution
-    # We assume that the youngest slice has the finest resolution.
-    slices = [
-        _forward_fill_resample(
-            current_range,
-            values,
-            range(youngest_range.start - shift, youngest_range.stop - shift, youngest_range.step),
-        )
-        for current_range, values, shift in raw_slices
-    ]
 
+def _make_prediction_data(youngest_range: range, matrix: npt.NDArray[np.float64]) -> PredictionData:
     return PredictionData(
-        points=_data_stats(slices),
+        points=_matrix_stats(matrix),
         start=youngest_range.start,
         step=youngest_range.step,
     )
@@ -189,32 +276,40 @@ def _calculate_data_for_prediction(
 
 def _forward_fill_resample(
     current_range: range, values: Sequence[float | None], new_range: range
-) -> Sequence[float | None]:
-    if current_range == new_range:
-        return values
+) -> npt.NDArray[np.float64]:
+    # None becomes NaN
+    data = np.array(values, dtype=np.float64)
+    if current_range == new_range and len(data) == len(new_range):
+        return data
 
-    idx_max = len(values) - 1
-    return [
-        values[max(0, min(int((t - current_range.start) / current_range.step), idx_max))]
-        for t in new_range
-    ]
+    indices = (
+        np.arange(new_range.start, new_range.stop, new_range.step) - current_range.start
+    ) // current_range.step
+    return data[np.clip(indices, 0, len(data) - 1)]
 
 
 def _data_stats(slices: Iterable[Iterable[float | None]]) -> list[DataStat | None]:
     "Statistically summarize all the upsampled RRD data"
-    return [  # can't inline this b/c it is unit tested :-/
-        (
-            DataStat.from_values(point_line)
-            if (point_line := [x for x in time_column if x is not None])
-            else None
-        )
-        for time_column in zip(*slices)
-    ]
+    return _matrix_stats(np.array([list(s) for s in slices], dtype=np.float64))
 
 
-def _std_dev(point_line: Sequence[float], average: float) -> float | None:
-    samples = len(point_line)
-    # In the case of a single data-point an unbiased standard deviation is undefined.
-    if samples == 1:
-        return None
-    return math.sqrt(abs(sum(p**2 for p in point_line) - average**2 * samples) / float(samples - 1))
+def _matrix_stats(matrix: npt.NDArray[np.float64]) -> list[DataStat | None]:
+    """Statistically summarize the columns of a (slices x points) matrix
+
+    Missing values are NaN. Columns without any value result in None.
+    """
+    samples = np.count_nonzero(~np.isnan(matrix), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average = np.nansum(matrix, axis=0) / samples
+        # In the case of a single data-point an unbiased standard deviation is undefined.
+        stdev = np.sqrt(np.abs(np.nansum(matrix**2, axis=0) - average**2 * samples) / (samples - 1))
+    return [
+        (DataStat(avg, min_, max_, None if count == 1 else dev) if count else None)
+        for count, avg, min_, max_, dev in zip(
+            samples.tolist(),
+            average.tolist(),
+            np.fmin.reduce(matrix, axis=0).tolist(),
+            np.fmax.reduce(matrix, axis=0).tolist(),
+            stdev.tolist(),
+        )
+    ]
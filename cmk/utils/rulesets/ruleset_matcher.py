@@ -11,6 +11,7 @@ from re import Pattern
 from typing import (
     Any,
     cast,
+    Final,
     Generic,
     NamedTuple,
     NotRequired,
@@ -20,6 +21,8 @@ from typing import (
     TypeVar,
 )
 
+from cmk.ccc.exceptions import MKGeneralException
+
 from cmk.utils.global_ident_type import GlobalIdent
 from cmk.utils.hostaddress import HostAddress, HostName
 from cmk.utils.labels import (
@@ -34,6 +37,7 @@ from cmk.utils.labels import (
 from cmk.utils.parameters import merge_parameters
 from cmk.utils.regex import combine_patterns, regex
 from cmk.utils.rulesets.ruleset_matching_stats import (
+    CacheStats,
     HostRulesetMatchingStats,
     persist_matching_stats,
     ServiceRulesetMatchingStats,
@@ -169,6 +173,47 @@ def merge_cluster_labels(all_node_labels: Iterable[Iterable[HostLabel]]) -> Sequ
     return list({l.name: l for node_labels in all_node_labels for l in node_labels}.values())
 
 
+ServiceMatchCacheID: TypeAlias = tuple[
+    tuple[ServiceName | Item | None, int], PreprocessedPattern, LabelGroupsCacheId
+]
+_MatchedServiceRule: TypeAlias = tuple[RuleID, Any, ServiceMatchCacheID]
+_ServiceValuesCacheID: TypeAlias = tuple[
+    int, bool, int, ServiceName | Item, frozenset[tuple[str, str]] | None
+]
+
+
+class _ServiceValuesCache:
+    """Size bounded LRU cache of the matched rules per service"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: Final = maxsize
+        self.stats: Final = CacheStats()
+        self._entries: dict[_ServiceValuesCacheID, Sequence[_MatchedServiceRule]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _ServiceValuesCacheID) -> Sequence[_MatchedServiceRule] | None:
+        try:
+            # Re-insert to mark the entry as most recently used.
+            entry = self._entries[key] = self._entries.pop(key)
+        except KeyError:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return entry
+
+    def put(self, key: _ServiceValuesCacheID, entry: Sequence[_MatchedServiceRule]) -> None:
+        if len(self._entries) >= self.maxsize:
+            # dicts keep the insertion order: the first entry is the least recently used one.
+            del self._entries[next(iter(self._entries))]
+            self.stats.evictions += 1
+        self._entries[key] = entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class RulesetMatcher:
     """Performing matching on host / service rulesets
 
@@ -187,6 +232,7 @@ class RulesetMatcher:
         nodes_of: Mapping[HostName, Sequence[HostName]],
         builtin_host_labels_store: BuiltinHostLabelsStore,
         debug_matching_stats: bool = False,
+        service_values_cache_size: int = 100_000,
     ) -> None:
         super().__init__()
 
@@ -205,14 +251,13 @@ class RulesetMatcher:
         self.labels_of_service = self.ruleset_optimizer.labels_of_service
         self.label_sources_of_host = self.ruleset_optimizer.label_sources_of_host
         self.label_sources_of_service = self.ruleset_optimizer.label_sources_of_service
-        self.clear_caches = self.ruleset_optimizer.clear_caches
 
-        self._service_match_cache: dict[
-            tuple[
-                tuple[ServiceName | None, int], PreprocessedPattern, tuple[tuple[str, object], ...]
-            ],
-            object,
-        ] = {}
+        self._service_match_cache: dict[ServiceMatchCacheID, object] = {}
+        # Shared between all hosts on which the same rules of a ruleset apply.
+        self._service_values_cache = _ServiceValuesCache(service_values_cache_size)
+        # The rules of a ruleset that apply to a host, and an ID for that combination of rules
+        self._host_rules_cache: dict[tuple[int, bool, HostName], tuple[int, tuple[int, ...]]] = {}
+        self._host_rules_ids: dict[tuple[int, ...], int] = {}
         # Expensive and mostly useless caching.
         self.__service_match_obj: dict[
             tuple[HostName, ServiceName, Item | None], RulesetMatchObject
@@ -220,6 +265,15 @@ class RulesetMatcher:
 
         self._debug_matching_stats = debug_matching_stats
 
+    def clear_caches(self) -> None:
+        self.ruleset_optimizer.clear_caches()
+        self._service_values_cache.clear()
+        self._host_rules_cache.clear()
+        self._host_rules_ids.clear()
+
+    def service_values_cache_stats(self) -> CacheStats:
+        return self._service_values_cache.stats
+
     def persist_matching_stats(
         self,
         base_dir: str,
@@ -396,20 +450,82 @@ class RulesetMatcher:
                 match_object.host_name
             )
 
+        matched: Sequence[_MatchedServiceRule] = ()
+        if match_object.service_description is not None:
+            # Hosts on which the same rules apply (same tags, labels, folder, ...)
+            # get the same answer for the same service.
+            host_rules_id, host_rules = self._host_rules(
+                ruleset_id, with_foreign_hosts, match_object.host_name, optimized_ruleset
+            )
+            cache_id = (
+                ruleset_id,
+                with_foreign_hosts,
+                host_rules_id,
+                match_object.service_description,
+                (
+                    None
+                    if match_object.service_labels is None
+                    else frozenset(match_object.service_labels.items())
+                ),
+            )
+            if (cached := self._service_values_cache.get(cache_id)) is None:
+                matched = tuple(
+                    self._match_service_rules(match_object, optimized_ruleset, host_rules)
+                )
+                self._service_values_cache.put(cache_id, matched)
+            else:
+                matched = cached
+            if self._debug_matching_stats:
+                self._track_service_values_cache(ruleset_id, hit=cached is not None)
+
         never_matched = True
-        for (
-            _rule_id,
-            value,
-            hosts,
-            service_label_groups,
-            service_label_groups_cache_id,
-            service_description_condition,
-        ) in optimized_ruleset:
-            if match_object.service_description is None:
-                continue
+        for rule_id, value, service_cache_id in matched:
+            if self._debug_matching_stats:
+                self._track_service_ruleset_match(
+                    match_object, never_matched, rule_id, ruleset_id, service_cache_id
+                )
+                never_matched = False
+            yield value
 
-            if match_object.host_name not in hosts:
-                continue
+        if self._debug_matching_stats and never_matched:
+            self._track_service_ruleset_miss(match_object, never_matched, ruleset_id)
+
+    def _host_rules(
+        self,
+        ruleset_id: int,
+        with_foreign_hosts: bool,
+        host_name: HostName,
+        optimized_ruleset: PreprocessedServiceRuleset[TRuleValue],
+    ) -> tuple[int, tuple[int, ...]]:
+        key = (ruleset_id, with_foreign_hosts, host_name)
+        if (cached := self._host_rules_cache.get(key)) is not None:
+            return cached
+        host_rules = tuple(
+            index
+            for index, (_rule_id, _value, hosts, *_service_conditions) in enumerate(
+                optimized_ruleset
+            )
+            if host_name in hosts
+        )
+        host_rules_id = self._host_rules_ids.setdefault(host_rules, len(self._host_rules_ids))
+        entry = self._host_rules_cache[key] = (host_rules_id, host_rules)
+        return entry
+
+    def _match_service_rules(
+        self,
+        match_object: RulesetMatchObject,
+        optimized_ruleset: PreprocessedServiceRuleset[TRuleValue],
+        host_rules: Iterable[int],
+    ) -> Iterator[_MatchedServiceRule]:
+        for index in host_rules:
+            (
+                rule_id,
+                value,
+                _hosts,
+                service_label_groups,
+                service_label_groups_cache_id,
+                service_description_condition,
+            ) = optimized_ruleset[index]
 
             service_cache_id = (
                 (
@@ -433,15 +549,15 @@ class RulesetMatcher:
                 self._service_match_cache[service_cache_id] = match
 
             if match:
-                if self._debug_matching_stats:
-                    self._track_service_ruleset_match(
-                        match_object, never_matched, _rule_id, ruleset_id, service_cache_id
-                    )
-                    never_matched = False
-                yield value
+                yield rule_id, value, service_cache_id
 
-        if self._debug_matching_stats and never_matched:
-            self._track_service_ruleset_miss(match_object, never_matched, ruleset_id)
+    def _track_service_values_cache(self, ruleset_id: int, *, hit: bool) -> None:
+        if not isinstance(
+            matching_stats := self.ruleset_optimizer.matching_stats[ruleset_id],
+            ServiceRulesetMatchingStats,
+        ):
+            return
+        matching_stats.track_service_values_cache(hit)
 
     def _track_service_ruleset_match(
         self,
@@ -449,9 +565,7 @@ class RulesetMatcher:
         track_call: bool,
         rule_id: str,
         ruleset_id: int,
-        service_cache_id: tuple[
-            tuple[ServiceName | None, int], PreprocessedPattern, tuple[tuple[str, object], ...]
-        ],
+        service_cache_id: ServiceMatchCacheID,
     ) -> None:
         if not isinstance(
             matching_stats := self.ruleset_optimizer.matching_stats[ruleset_id],
@@ -493,6 +607,174 @@ ConditionCacheID: TypeAlias = tuple[
 ]
 
 
+_BITS_OF_BYTE: Sequence[tuple[int, ...]] = tuple(
+    tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256)
+)
+
+
+class _HostIndex:
+    """Inverted index from host properties to bitsets of hosts
+
+    The bitsets are plain integers where bit `n` stands for the `n`-th host.
+    Matching a rule condition against many hosts is then reduced to a few
+    integer operations instead of one predicate call per host.
+
+    The labels of the hosts are expensive to compute (they depend on other
+    rulesets and on the discovered labels), so they are only indexed on demand
+    for the hosts that are actually checked against a label condition.
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[HostName],
+        host_tags: Mapping[HostName, Iterable[tuple[TagGroupID, TagID]]],
+        host_paths: Mapping[HostName, str],
+        labels_of_host: Callable[[HostName], Labels],
+    ) -> None:
+        self._hosts: Final = hosts
+        self._bit_of_host: Final[dict[str, int]] = {
+            hostname: 1 << n for n, hostname in enumerate(hosts)
+        }
+        self._num_bytes: Final = (len(hosts) + 7) // 8
+        self.all: Final = (1 << len(hosts)) - 1
+        self._labels_of_host: Final = labels_of_host
+
+        tags: dict[tuple[TagGroupID, TagID | None], list[int]] = {}
+        paths: dict[str, list[int]] = {}
+        for n, hostname in enumerate(hosts):
+            for tag in host_tags.get(hostname, ()):
+                tags.setdefault(tag, []).append(n)
+            paths.setdefault(host_paths.get(hostname, "/"), []).append(n)
+
+        self._tag_bits: Final = {tag: self._make_bits(ids) for tag, ids in tags.items()}
+        self._path_bits: Final = {path: self._make_bits(ids) for path, ids in paths.items()}
+        self._label_bits: dict[tuple[str, str], int] = {}
+        self._labels_indexed = 0
+
+    def _make_bits(self, host_ids: Iterable[int]) -> int:
+        buffer = bytearray(self._num_bytes)
+        for n in host_ids:
+            buffer[n >> 3] |= 1 << (n & 7)
+        return int.from_bytes(buffer, "little")
+
+    def bits(self, hostnames: Iterable[HostName]) -> int:
+        bit_of_host = self._bit_of_host
+        bits = 0
+        for hostname in hostnames:
+            bits |= bit_of_host.get(hostname, 0)
+        return bits
+
+    def hosts(self, bits: int) -> set[HostName]:
+        hosts = self._hosts
+        return {
+            hosts[offset + bit]
+            for offset, byte in zip(
+                range(0, 8 * self._num_bytes, 8), bits.to_bytes(self._num_bytes, "little")
+            )
+            if byte
+            for bit in _BITS_OF_BYTE[byte]
+        }
+
+    def match_folder(self, folder_path: str) -> int:
+        bits = 0
+        for host_path, path_bits in self._path_bits.items():
+            if host_path.startswith(folder_path):
+                bits |= path_bits
+        return bits
+
+    def match_tags(self, tag_conditions: Mapping[TagGroupID, TagCondition], candidates: int) -> int:
+        """Same as `matches_host_tags` applied to each of the candidates"""
+        tag_bits = self._tag_bits
+        for taggroup_id, tag_condition in tag_conditions.items():
+            if not candidates:
+                break
+            if not isinstance(tag_condition, dict):
+                candidates &= tag_bits.get((taggroup_id, tag_condition), 0)
+            elif "$ne" in tag_condition:
+                candidates &= ~tag_bits.get(
+                    (taggroup_id, cast(TagConditionNE, tag_condition)["$ne"]), 0
+                )
+            elif "$or" in tag_condition:
+                candidates &= self._any_tag(taggroup_id, cast(TagConditionOR, tag_condition)["$or"])
+            elif "$nor" in tag_condition:
+                candidates &= ~self._any_tag(
+                    taggroup_id, cast(TagConditionNOR, tag_condition)["$nor"]
+                )
+            else:
+                raise NotImplementedError()
+        return candidates
+
+    def _any_tag(self, taggroup_id: TagGroupID, tag_ids: Iterable[TagID | None]) -> int:
+        bits = 0
+        for tag_id in tag_ids:
+            bits |= self._tag_bits.get((taggroup_id, tag_id), 0)
+        return bits
+
+    def match_host_names(self, host_entries: HostOrServiceConditions, candidates: int) -> int:
+        """Same as `matches_host_name` applied to each of the candidates"""
+        negate, entries = parse_negated_condition_list(host_entries)
+        matching = 0
+        regexes = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                regexes.append(regex(entry["$regex"]))
+            else:
+                matching |= self._bit_of_host.get(entry, 0)
+        matching &= candidates
+        if regexes:
+            for hostname in self.hosts(candidates & ~matching):
+                if any(r.match(hostname) is not None for r in regexes):
+                    matching |= self._bit_of_host[hostname]
+
+        # The generic agent host "" only matches negated conditions.
+        generic = self._bit_of_host.get(HostName(""), 0) & candidates
+        if negate:
+            return (candidates & ~matching) | generic
+        return matching & ~generic
+
+    def match_labels(self, label_groups: LabelGroups, candidates: int) -> int:
+        """Same as `matches_labels` applied to each of the candidates"""
+        self._index_labels(candidates)
+        overall = candidates
+        for group_operator, label_group in label_groups:
+            group = candidates
+            for label_operator, label in label_group:
+                if not label:
+                    continue
+                try:
+                    key, value = label.split(":")
+                except ValueError:
+                    raise MKGeneralException(f"Invalid label condition: {label}")
+                group = _and_or_not_bits(
+                    group, self._label_bits.get((key, value), 0) & candidates, label_operator
+                )
+            overall = _and_or_not_bits(overall, group, group_operator)
+        return overall & candidates
+
+    def _index_labels(self, candidates: int) -> None:
+        if not (missing := candidates & ~self._labels_indexed):
+            return
+        labels: dict[tuple[str, str], list[int]] = {}
+        bit_of_host = self._bit_of_host
+        for hostname in self.hosts(missing):
+            n = bit_of_host[hostname].bit_length() - 1
+            for label in self._labels_of_host(hostname).items():
+                labels.setdefault(label, []).append(n)
+        for label, host_ids in labels.items():
+            self._label_bits[label] = self._label_bits.get(label, 0) | self._make_bits(host_ids)
+        self._labels_indexed |= missing
+
+
+def _and_or_not_bits(given_bits: int, new_bits: int, operator: AndOrNotLiteral) -> int:
+    match operator:
+        case "and":
+            return given_bits & new_bits
+        case "or":
+            return given_bits | new_bits
+        case "not":
+            return given_bits & ~new_bits
+
+
 class RulesetOptimizer:
     """Performs some precalculations on the configured rulesets to improve the
     processing performance"""
@@ -526,10 +808,11 @@ class RulesetOptimizer:
         # is enabled.
         self._all_processed_hosts = self._all_configured_hosts
 
-        # A factor which indicates how much hosts share the same host tag configuration (excluding folders).
-        # len(all_processed_hosts) / len(different tag combinations)
-        # It is used to determine the best rule evualation method
-        self._all_processed_hosts_similarity = 1.0
+        # Host tags, folders and labels of all configured hosts as bitsets
+        self._host_index = _HostIndex(
+            self._all_configured_hosts, self._host_tags, self._host_paths, self.labels_of_host
+        )
+        self._all_processed_hosts_bits = self._host_index.all
 
         self.__service_ruleset_cache: dict[tuple[int, bool], PreprocessedServiceRuleset] = {}
         self.__host_ruleset_cache: dict[tuple[int, bool], Mapping[HostAddress, Sequence[Any]]] = {}
@@ -538,15 +821,7 @@ class RulesetOptimizer:
         ] = {}
 
         # Reference dirname -> hosts in this dir including subfolders
-        self._folder_host_lookup: dict[tuple[bool, str], set[HostName]] = {}
-
-        # Provides a list of hosts with the same hosttags, excluding the folder
-        self._hosts_grouped_by_tags: dict[tuple[tuple[TagGroupID, TagID], ...], set[HostName]] = {}
-        # Reference hostname -> tag group reference
-        self._host_grouped_ref: dict[HostName, tuple[tuple[TagGroupID, TagID], ...]] = {}
-
-        # TODO: Clean this one up?
-        self._initialize_host_lookup()
+        self._folder_host_lookup: dict[tuple[bool, str], int] = {}
 
         self._debug_matching_stats = debug_matching_stats
         self.matching_stats: dict[int, HostRulesetMatchingStats | ServiceRulesetMatchingStats] = {}
@@ -584,25 +859,13 @@ class RulesetOptimizer:
         # Only add references to configured hosts
         nodes_and_clusters.intersection_update(self._all_configured_hosts)
         self._all_processed_hosts = list(nodes_and_clusters)
+        self._all_processed_hosts_bits = self._host_index.bits(self._all_processed_hosts)
 
-        # The folder host lookup includes a list of all -processed- hosts within a given
+        # The folder host lookup includes the bits of all -processed- hosts within a given
         # folder. Any update with set_all_processed hosts invalidates this cache, because
-        # the scope of relevant hosts has changed. This is -good-, since the values in this
-        # lookup are iterated one by one later on in all_matching_hosts
+        # the scope of relevant hosts has changed.
         self._folder_host_lookup = {}
 
-        used_groups = {
-            self._host_grouped_ref.get(hostname, ()) for hostname in self._all_processed_hosts
-        }
-
-        if not used_groups:
-            self._all_processed_hosts_similarity = 1.0
-            return
-
-        self._all_processed_hosts_similarity = (
-            1.0 * len(self._all_processed_hosts) / len(used_groups)
-        )
-
     def _compute_all_matching_hosts_stats(
         self, ruleset_id: int, condition_id: tuple[ConditionCacheID, bool]
     ) -> None:
@@ -774,57 +1037,18 @@ class RulesetOptimizer:
         # we only need the intersection of the folders hosts and the previously determined valid_hosts
         valid_hosts = self._get_hosts_within_folder(rule_path, with_foreign_hosts)
 
-        if tag_conditions and hostlist is None and not label_groups:
-            # TODO: Labels could also be optimized like the tags
-            matched_by_tags = self._match_hosts_by_tags(cache_id, valid_hosts, tag_conditions)
-            if matched_by_tags is not None:
-                return matched_by_tags
-
-        matching: set[HostName] = set()
-        only_specific_hosts = (
-            hostlist is not None
-            and not isinstance(hostlist, dict)
-            and all(not isinstance(x, dict) for x in hostlist)
-        )
-
         if hostlist == []:
-            pass  # Empty host list -> Nothing matches
-
-        elif not tag_conditions and not label_groups and not hostlist:
-            # If no tags are specified and the hostlist only include @all (all hosts)
-            matching = valid_hosts
-
-        elif (
-            not tag_conditions and not label_groups and only_specific_hosts and hostlist is not None
-        ):
-            # If no tags are specified and there are only specific hosts we already have the matches
-            matching = valid_hosts.intersection(hostlist)
-
+            matching: set[HostName] = set()  # Empty host list -> Nothing matches
         else:
-            # If the rule has only exact host restrictions, we can thin out the list of hosts to check
-            if only_specific_hosts and hostlist is not None:
-                hosts_to_check = valid_hosts.intersection(hostlist)
-            else:
-                hosts_to_check = valid_hosts
-
-            for hostname in hosts_to_check:
-                # When no tag matching is requested, do not filter by tags. Accept all hosts
-                # and filter only by hostlist
-                if tag_conditions and not matches_host_tags(
-                    self._host_tags[hostname],
-                    tag_conditions,
-                ):
-                    continue
-
-                if label_groups:
-                    host_labels = self.labels_of_host(hostname)
-                    if not matches_labels(host_labels, label_groups):
-                        continue
-
-                if not matches_host_name(hostlist, hostname):
-                    continue
-
-                matching.add(hostname)
+            # Narrow down with the cheap bit operations first, the host names may
+            # need regex matching and the labels need to be computed.
+            if tag_conditions:
+                valid_hosts = self._host_index.match_tags(tag_conditions, valid_hosts)
+            if hostlist and valid_hosts:
+                valid_hosts = self._host_index.match_host_names(hostlist, valid_hosts)
+            if label_groups and valid_hosts:
+                valid_hosts = self._host_index.match_labels(label_groups, valid_hosts)
+            matching = self._host_index.hosts(valid_hosts)
 
         self._all_matching_hosts_match_cache[cache_id] = matching
         return matching
@@ -863,98 +1087,17 @@ class RulesetOptimizer:
             rule_path,
         )
 
-    # TODO: Generalize this optimization: Build some kind of key out of the tag conditions
-    # (positive, negative, ...). Make it work with the new tag group based "$or" handling.
-    def _match_hosts_by_tags(
-        self,
-        cache_id: tuple[ConditionCacheID, bool],
-        valid_hosts: set[HostName],
-        tag_conditions: Mapping[TagGroupID, TagCondition],
-    ) -> set[HostName] | None:
-        matching = set()
-        negative_match_tags = set()
-        positive_match_tags = set()
-        for taggroup_id, tag_condition in tag_conditions.items():
-            if isinstance(tag_condition, dict):
-                if "$ne" in tag_condition:
-                    negative_match_tags.add(
-                        (
-                            taggroup_id,
-                            cast(TagConditionNE, tag_condition)["$ne"],
-                        )
-                    )
-                    continue
-
-                if "$or" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
-
-                if "$nor" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
-
-                raise NotImplementedError()
-
-            positive_match_tags.add((taggroup_id, tag_condition))
-
-        # TODO:
-        # if has_specific_folder_tag or self._all_processed_hosts_similarity < 3.0:
-        if self._all_processed_hosts_similarity < 3.0:
-            # Without shared folders
-            for hostname in valid_hosts:
-                if positive_match_tags <= self._host_tags[
-                    hostname
-                ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                    matching.add(hostname)
-
-            self._all_matching_hosts_match_cache[cache_id] = matching
-            return matching
-
-        # With shared folders
-        checked_hosts: set[str] = set()
-        for hostname in valid_hosts:
-            if hostname in checked_hosts:
-                continue
-
-            hosts_with_same_tag = self._filter_hosts_with_same_tags_as_host(hostname, valid_hosts)
-            checked_hosts.update(hosts_with_same_tag)
-
-            if positive_match_tags <= self._host_tags[
-                hostname
-            ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                matching.update(hosts_with_same_tag)
-
-        self._all_matching_hosts_match_cache[cache_id] = matching
-        return matching
-
-    def _filter_hosts_with_same_tags_as_host(
-        self,
-        hostname: HostName,
-        hosts: set[HostName],
-    ) -> set[HostName]:
-        return self._hosts_grouped_by_tags[self._host_grouped_ref[hostname]].intersection(hosts)
-
-    def _get_hosts_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> set[HostName]:
+    def _get_hosts_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> int:
         cache_id = with_foreign_hosts, folder_path
-        if cache_id not in self._folder_host_lookup:
-            hosts_in_folder = set()
-            relevant_hosts = (
-                self._all_configured_hosts if with_foreign_hosts else self._all_processed_hosts
-            )
-
-            for hostname in relevant_hosts:
-                host_path = self._host_paths.get(hostname, "/")
-                if host_path.startswith(folder_path):
-                    hosts_in_folder.add(hostname)
-
-            self._folder_host_lookup[cache_id] = hosts_in_folder
-            return hosts_in_folder
-
-        return self._folder_host_lookup[cache_id]
+        with contextlib.suppress(KeyError):
+            return self._folder_host_lookup[cache_id]
 
-    def _initialize_host_lookup(self) -> None:
-        for hostname in self._all_configured_hosts:
-            group_ref = tuple(sorted(self._host_tags[hostname]))
-            self._hosts_grouped_by_tags.setdefault(group_ref, set()).add(hostname)
-            self._host_grouped_ref[hostname] = group_ref
+        relevant_hosts = (
+            self._host_index.all if with_foreign_hosts else self._all_processed_hosts_bits
+        )
+        return self._folder_host_lookup.setdefault(
+            cache_id, self._host_index.match_folder(folder_path) & relevant_hosts
+        )
 
     def labels_of_host(self, hostname: HostName) -> Labels:
         """Returns the effective set of host labels from all available sources
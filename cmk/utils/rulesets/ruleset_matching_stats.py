@@ -23,6 +23,13 @@ class AllHostsMatchingStats:
     condition_miss: dict[str, int] = dataclasses.field(default_factory=dict)
 
 
+@dataclasses.dataclass(kw_only=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
 @dataclasses.dataclass(kw_only=True)
 class FunctionCallStats:
     with_results: int = 0
@@ -92,6 +99,13 @@ class ServiceRulesetMatchingStats(MatchingStats):
             services_descr_without_results=set(),
         )
     )
+    service_values_cache: CacheStats = dataclasses.field(default_factory=CacheStats)
+
+    def track_service_values_cache(self, hit: bool) -> None:
+        if hit:
+            self.service_values_cache.hits += 1
+        else:
+            self.service_values_cache.misses += 1
 
     def track_service_ruleset_call(
         self,
@@ -125,6 +139,7 @@ class ServiceRulesetMatchingStats(MatchingStats):
                         self.service_matching_attempts.services_descr_without_results
                     ),
                 },
+                "service_values_cache": dataclasses.asdict(self.service_values_cache),
             }
         )
         return base_serialized
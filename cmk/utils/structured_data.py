@@ -9,16 +9,22 @@ structured monitoring data of Check_MK.
 
 from __future__ import annotations
 
+import ast
 import gzip
 import io
+import marshal
+import mmap
+import os
 import pprint
+import struct
 from collections import Counter
-from collections.abc import Callable, Iterable, Mapping, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Generic, Literal, NamedTuple, NewType, Self, TypedDict, TypeVar
 
 from cmk.ccc import store
+from cmk.ccc.exceptions import MKGeneralException
 
 from cmk.utils.hostaddress import HostName
 
@@ -37,10 +43,10 @@ from cmk.utils.hostaddress import HostName
 #   - MISSING (see mk/base/agent_based/inventory.py::_get_intervals_from_config) -> _use_nothing
 #   - 'all' -> _use_all
 # TODO Centralize different stores and loaders of tree files:
-#   - inventory/HOSTNAME, inventory/HOSTNAME.gz, inventory/.last
+#   - inventory/HOSTNAME, inventory/HOSTNAME.gz, inventory/HOSTNAME.idx, inventory/.last
 #   - inventory_archive/HOSTNAME/TIMESTAMP,
-#   - inventory_delta_cache/HOSTNAME/TIMESTAMP_{TIMESTAMP,None}
-#   - status_data/HOSTNAME, status_data/HOSTNAME.gz
+#   - inventory_delta_cache/HOSTNAME/TIMESTAMP_{TIMESTAMP,None}, inventory_delta_cache/HOSTNAME/.history
+#   - status_data/HOSTNAME, status_data/HOSTNAME.gz, status_data/HOSTNAME.idx
 
 SDNodeName = NewType("SDNodeName", str)
 SDPath = tuple[SDNodeName, ...]
@@ -1637,7 +1643,91 @@ class ImmutableDeltaTree:
 #   '----------------------------------------------------------------------'
 
 
-def load_tree(filepath: Path) -> ImmutableTree:
+# The index file holds the same tree as the tree file, in a binary format:
+# A header (magic, mtime in ns and size of the tree file, size of the index),
+# the index and the marshalled nodes.
+# The index is a sequence of (path, offset, size) of all nodes. Thus we only
+# have to deserialize the requested subtrees.
+_INDEX_MAGIC = b"SDINDEX2"
+_INDEX_HEADER = struct.Struct("<8sqQQ")
+
+
+def _index_file(filepath: Path) -> Path:
+    return filepath.with_name(f"{filepath.name}.idx")
+
+
+def _iter_raw_nodes(path: SDPath, raw_tree: SDRawTree) -> Iterator[tuple[SDPath, SDRawTree]]:
+    yield path, raw_tree
+    for name, raw_node in raw_tree["Nodes"].items():
+        yield from _iter_raw_nodes(path + (name,), raw_node)
+
+
+def _serialize_indexed_tree(raw_tree: SDRawTree, tree_file_stat: os.stat_result) -> bytes:
+    index: list[tuple[SDPath, int, int]] = []
+    raw_nodes: list[bytes] = []
+    offset = 0
+    for path, raw_node in _iter_raw_nodes((), raw_tree):
+        raw_nodes.append(marshal.dumps((raw_node["Attributes"], raw_node["Table"])))
+        index.append((path, offset, len(raw_nodes[-1])))
+        offset += len(raw_nodes[-1])
+    raw_index = marshal.dumps(tuple(index))
+    header = _INDEX_HEADER.pack(
+        _INDEX_MAGIC, tree_file_stat.st_mtime_ns, tree_file_stat.st_size, len(raw_index)
+    )
+    return b"".join([header, raw_index, *raw_nodes])
+
+
+def _is_in_subtrees(node_path: SDPath, paths: Sequence[SDPath]) -> bool:
+    return any(node_path[: len(path)] == path for path in paths)
+
+
+def _setdefault_raw_node(raw_tree: SDRawTree, path: SDPath) -> SDRawTree:
+    for name in path:
+        raw_tree = raw_tree["Nodes"].setdefault(name, {"Attributes": {}, "Table": {}, "Nodes": {}})
+    return raw_tree
+
+
+def _load_indexed_tree(
+    index_file: Path, tree_file_stat: os.stat_result, paths: Sequence[SDPath]
+) -> ImmutableTree:
+    raw_tree: SDRawTree = {"Attributes": {}, "Table": {}, "Nodes": {}}
+    with index_file.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, mtime_ns, size, index_size = _INDEX_HEADER.unpack_from(mm)
+        if magic != _INDEX_MAGIC:
+            raise ValueError(magic)
+        if (mtime_ns, size) != (tree_file_stat.st_mtime_ns, tree_file_stat.st_size):
+            raise ValueError("The index does not belong to the tree file")
+        nodes_start = _INDEX_HEADER.size + index_size
+        for node_path, offset, size in marshal.loads(mm[_INDEX_HEADER.size : nodes_start]):
+            if _is_in_subtrees(node_path, paths):
+                raw_node = _setdefault_raw_node(raw_tree, node_path)
+                raw_node["Attributes"], raw_node["Table"] = marshal.loads(
+                    mm[nodes_start + offset : nodes_start + offset + size]
+                )
+    return ImmutableTree.deserialize(raw_tree)
+
+
+def _load_subtrees(filepath: Path, paths: Sequence[SDPath]) -> ImmutableTree:
+    raw_tree: SDRawTree = {"Attributes": {}, "Table": {}, "Nodes": {}}
+    for node_path, raw_node in _iter_raw_nodes((), load_tree(filepath).serialize()):
+        if _is_in_subtrees(node_path, paths):
+            raw_subtree = _setdefault_raw_node(raw_tree, node_path)
+            raw_subtree["Attributes"] = raw_node["Attributes"]
+            raw_subtree["Table"] = raw_node["Table"]
+    return ImmutableTree.deserialize(raw_tree)
+
+
+def load_tree(filepath: Path, *, paths: Sequence[SDPath] | None = None) -> ImmutableTree:
+    """Load the tree or, if paths are given, only the subtrees below these paths"""
+    if paths is not None:
+        paths = [tuple(path) for path in paths]
+        try:
+            # The tree file may have been written without the index
+            return _load_indexed_tree(_index_file(filepath), filepath.stat(), paths)
+        except (OSError, ValueError, EOFError, TypeError, struct.error):
+            pass
+        return _load_subtrees(filepath, paths)
+
     if raw_tree := store.load_object_from_file(filepath, default=None):
         return ImmutableTree.deserialize(raw_tree)
     return ImmutableTree()
@@ -1648,8 +1738,8 @@ class TreeStore:
         self._tree_dir = Path(tree_dir)
         self._last_filepath = Path(tree_dir) / ".last"
 
-    def load(self, *, host_name: HostName) -> ImmutableTree:
-        return load_tree(self._tree_file(host_name))
+    def load(self, *, host_name: HostName, paths: Sequence[SDPath] | None = None) -> ImmutableTree:
+        return load_tree(self._tree_file(host_name), paths=paths)
 
     def save(self, *, host_name: HostName, tree: MutableTree, pretty: bool = False) -> None:
         self._tree_dir.mkdir(parents=True, exist_ok=True)
@@ -1664,12 +1754,21 @@ class TreeStore:
             f.write((repr(output) + "\n").encode("utf-8"))
         store.save_bytes_to_file(self._gz_file(host_name), buf.getvalue())
 
+        try:
+            store.save_bytes_to_file(
+                self._index_file(host_name), _serialize_indexed_tree(output, tree_file.stat())
+            )
+        except ValueError:
+            # Not marshallable, loading subtrees falls back to the tree file
+            self._index_file(host_name).unlink(missing_ok=True)
+
         # Inform Livestatus about the latest inventory update
         self._last_filepath.touch()
 
     def remove(self, *, host_name: HostName) -> None:
         self._tree_file(host_name).unlink(missing_ok=True)
         self._gz_file(host_name).unlink(missing_ok=True)
+        self._index_file(host_name).unlink(missing_ok=True)
 
     def _tree_file(self, host_name: HostName) -> Path:
         return self._tree_dir / str(host_name)
@@ -1677,21 +1776,89 @@ class TreeStore:
     def _gz_file(self, host_name: HostName) -> Path:
         return self._tree_dir / f"{host_name}.gz"
 
+    def _index_file(self, host_name: HostName) -> Path:
+        return _index_file(self._tree_file(host_name))
+
+
+@dataclass(frozen=True)
+class IndexedDelta:
+    new: int
+    changed: int
+    removed: int
+    raw_delta_tree: str
+
+    @property
+    def delta_tree(self) -> ImmutableDeltaTree:
+        return ImmutableDeltaTree.deserialize(ast.literal_eval(self.raw_delta_tree))
+
+
+class DeltaHistoryStore:
+    """Append-only index of the deltas between consecutive archived trees of a host
+
+    Every line holds the timestamps of both trees, the delta stats and the delta tree.
+    Delta trees are only deserialized on access.
+    """
+
+    INDEX_FILE_NAME = ".history"
+
+    def __init__(self, delta_cache_dir: Path | str) -> None:
+        self._delta_cache_dir = Path(delta_cache_dir)
+
+    def _index_file(self, host_name: HostName) -> Path:
+        return self._delta_cache_dir / str(host_name) / self.INDEX_FILE_NAME
+
+    def append(
+        self,
+        *,
+        host_name: HostName,
+        previous_timestamp: int | None,
+        current_timestamp: int,
+        delta_tree: ImmutableDeltaTree,
+    ) -> None:
+        stats = delta_tree.get_stats()
+        header = (
+            previous_timestamp,
+            current_timestamp,
+            stats["new"],
+            stats["changed"],
+            stats["removed"],
+        )
+        index_file = self._index_file(host_name)
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        with index_file.open("a", encoding="utf-8") as f:
+            f.write(f"{header!r}\t{delta_tree.serialize()!r}\n")
+
+    def load(self, *, host_name: HostName) -> Mapping[tuple[int | None, int], IndexedDelta]:
+        indexed_deltas: dict[tuple[int | None, int], IndexedDelta] = {}
+        try:
+            with self._index_file(host_name).open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        continue  # partially written
+                    try:
+                        raw_header, raw_delta_tree = line.rstrip("\n").split("\t", 1)
+                        previous, current, new, changed, removed = ast.literal_eval(raw_header)
+                    except (ValueError, SyntaxError):
+                        continue
+                    indexed_deltas[(previous, current)] = IndexedDelta(
+                        new, changed, removed, raw_delta_tree
+                    )
+        except FileNotFoundError:
+            pass
+        return indexed_deltas
+
 
 class TreeOrArchiveStore(TreeStore):
-    def __init__(self, tree_dir: Path | str, archive: Path | str) -> None:
+    def __init__(self, tree_dir: Path | str, archive: Path | str, delta_cache: Path | str) -> None:
         super().__init__(tree_dir)
         self._archive_dir = Path(archive)
+        self._delta_history_store = DeltaHistoryStore(delta_cache)
 
     def load_previous(self, *, host_name: HostName) -> ImmutableTree:
         if (tree_file := self._tree_file(host_name=host_name)).exists():
             return load_tree(tree_file)
 
-        try:
-            latest_archive_tree_file = max(
-                self._archive_host_dir(host_name).iterdir(), key=lambda tp: int(tp.name)
-            )
-        except (FileNotFoundError, ValueError):
+        if (latest_archive_tree_file := self._latest_archive_tree_file(host_name)) is None:
             return ImmutableTree()
 
         return load_tree(latest_archive_tree_file)
@@ -1699,10 +1866,32 @@ class TreeOrArchiveStore(TreeStore):
     def _archive_host_dir(self, host_name: HostName) -> Path:
         return self._archive_dir / str(host_name)
 
+    def _latest_archive_tree_file(self, host_name: HostName) -> Path | None:
+        try:
+            return max(self._archive_host_dir(host_name).iterdir(), key=lambda tp: int(tp.name))
+        except (FileNotFoundError, ValueError):
+            return None
+
     def archive(self, *, host_name: HostName) -> None:
         if not (tree_file := self._tree_file(host_name)).exists():
             return
+        previous_tree_file = self._latest_archive_tree_file(host_name)
         target_dir = self._archive_host_dir(host_name)
         target_dir.mkdir(parents=True, exist_ok=True)
-        tree_file.rename(target_dir / str(int(tree_file.stat().st_mtime)))
+        target_file = target_dir / str(int(tree_file.stat().st_mtime))
+        tree_file.rename(target_file)
         self._gz_file(host_name).unlink(missing_ok=True)
+        self._index_file(host_name).unlink(missing_ok=True)
+
+        try:
+            delta_tree = load_tree(target_file).difference(
+                ImmutableTree() if previous_tree_file is None else load_tree(previous_tree_file)
+            )
+        except MKGeneralException:
+            return  # The history computes the delta of corrupted files on demand.
+        self._delta_history_store.append(
+            host_name=host_name,
+            previous_timestamp=None if previous_tree_file is None else int(previous_tree_file.name),
+            current_timestamp=int(target_file.name),
+            delta_tree=delta_tree,
+        )
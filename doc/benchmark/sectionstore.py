@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Compare the section store against the former pickle store
+
+Usage: sectionstore.py [NUMBER_OF_SECTIONS [LINES_PER_SECTION]]
+
+Every measurement runs in its own process, so that the peak RSS is not
+distorted by the previous runs.  The load time is the best of a few rounds.
+"""
+
+import logging
+import multiprocessing
+import pickle
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import cmk.ccc.store as _store
+
+from cmk.utils.sectionname import SectionName
+
+from cmk.checkengine.parser import SectionStore
+
+_ROUNDS = 20
+
+
+def _sections(count: int, lines: int) -> dict[SectionName, tuple[int, int, list[list[str]]]]:
+    return {
+        SectionName(f"section_{n}"): (
+            1000,
+            2000,
+            [[f"item{n}_{i}", "42", "some", "more", "words"] for i in range(lines)],
+        )
+        for n in range(count)
+    }
+
+
+def _load_pickle(path: Path) -> Callable[[], object]:
+    # This is what the former SectionStore.load() did.
+    return lambda: {
+        SectionName(k): v for k, v in _store.load_object_from_pickle_file(path, default={}).items()
+    }
+
+
+def _load_binary(path: Path) -> Callable[[], object]:
+    return SectionStore[list[list[str]]](path, logger=logging.getLogger("bench")).load
+
+
+def _measure(
+    factory: Callable[[Path], Callable[[], object]],
+    path: Path,
+    queue: multiprocessing.Queue,  # type: ignore[type-arg]
+) -> None:
+    load = factory(path)
+    durations = []
+    for _ in range(_ROUNDS):
+        start = time.perf_counter()
+        load()
+        durations.append(time.perf_counter() - start)
+    queue.put((min(durations), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def main(count: int = 500, lines: int = 20) -> None:
+    sections = _sections(count, lines)
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = Path(tmp, "pickle")
+        pickle_path.write_bytes(pickle.dumps({str(k): v for k, v in sections.items()}))
+        binary_path = Path(tmp, "binary")
+        SectionStore[list[list[str]]](binary_path, logger=logging.getLogger("bench")).store(
+            sections
+        )
+
+        print(f"{count} sections with {lines} lines each")
+        print(f"{'':8} {'size [kB]':>10} {'load [ms]':>10} {'RSS [MB]':>10}")
+        queue: multiprocessing.Queue = multiprocessing.Queue()  # type: ignore[type-arg]
+        for title, factory, path in (
+            ("pickle", _load_pickle, pickle_path),
+            ("binary", _load_binary, binary_path),
+        ):
+            process = multiprocessing.Process(target=_measure, args=(factory, path, queue))
+            process.start()
+            duration, maxrss = queue.get()
+            process.join()
+            print(
+                f"{title:8} {path.stat().st_size / 1024:10.1f}"
+                f" {duration * 1000:10.2f} {maxrss / 1024:10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Compare the NumPy based time series against the former point by point loops
+
+Usage: time_series.py [NUMBER_OF_DAYS [NUMBER_OF_OPERANDS]]
+
+The series has one value per minute, every tenth value is missing.  The operators
+work on series of 5 minute values.  Every time is the best of a few rounds.
+"""
+
+import statistics
+import sys
+import time
+from collections.abc import Callable, Sequence
+
+from cmk.gui.graphing._metric_operation import apply_time_series_operator, time_series_operators
+from cmk.gui.time_series import rrd_timestamps, TimeSeries, TimeSeriesValue, TimeWindow
+
+_ROUNDS = 5
+
+
+def _former_aggregate(values: Sequence[TimeSeriesValue], cf: str) -> TimeSeriesValue:
+    if not (cleaned := [v for v in values if v is not None]):
+        return None
+    return {"average": statistics.fmean, "max": max, "min": min}[cf](cleaned)
+
+
+def _former_downsample(
+    values: Sequence[TimeSeriesValue], own_twindow: TimeWindow, twindow: TimeWindow, cf: str
+) -> list[TimeSeriesValue]:
+    # This is what the former TimeSeries.downsample() did, it kept the values in a list.
+    dwsa: list[TimeSeriesValue] = []
+    co: list[TimeSeriesValue] = []
+    desired_times = rrd_timestamps(twindow)
+    i = 0
+    for t, val in zip(rrd_timestamps(own_twindow), values):
+        if t > desired_times[i]:
+            dwsa.append(_former_aggregate(co, cf))
+            co = []
+            i += 1
+        co.append(val)
+    if (diff_len := len(desired_times) - len(dwsa)) > 0:
+        dwsa.append(_former_aggregate(co, cf))
+        dwsa += [None] * (diff_len - 1)
+    return dwsa
+
+
+def _former_forward_fill_resample(
+    values: Sequence[TimeSeriesValue], own_twindow: TimeWindow, twindow: TimeWindow
+) -> list[TimeSeriesValue]:
+    # This is what the former TimeSeries.forward_fill_resample() did.
+    start, _end, step = own_twindow
+    idx_max = len(values) - 1
+    return [values[max(0, min(int((t - start) / step), idx_max))] for t in range(*twindow)]
+
+
+def _former_maximum(operands: Sequence[Sequence[TimeSeriesValue]]) -> list[TimeSeriesValue]:
+    # This is what the former MAX operator did for every point.
+    return [
+        max(cleaned) if (cleaned := [v for v in point if v is not None]) else None
+        for point in zip(*operands)
+    ]
+
+
+def _best_of(function: Callable[[], object]) -> float:
+    durations = []
+    for _ in range(_ROUNDS):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main(days: int = 365, num_operands: int = 50) -> None:
+    end = days * 24 * 3600
+    ts = TimeSeries(
+        [None if i % 10 == 0 else float(i % 1440) for i in range(end // 60)],
+        time_window=(0, end, 60),
+    )
+    operands = [
+        TimeSeries(
+            [None if i % 10 == n % 10 else float((i + n) % 288) for i in range(end // 300)],
+            time_window=(0, end, 300),
+        )
+        for n in range(num_operands)
+    ]
+    values = ts.values
+    operand_values = [operand.values for operand in operands]
+    operators = time_series_operators()
+
+    print(f"{days} days of minute values, {num_operands} operands of 5 minute values")
+    print(f"{'':28} {'former [ms]':>12} {'NumPy [ms]':>12}")
+    for title, former, current in (
+        (
+            "downsample to hours, max",
+            lambda: _former_downsample(values, ts.twindow, (0, end, 3600), "max"),
+            lambda: ts.downsample((0, end, 3600), "max"),
+        ),
+        (
+            "downsample to hours, avg",
+            lambda: _former_downsample(values, ts.twindow, (0, end, 3600), "average"),
+            lambda: ts.downsample((0, end, 3600), "average"),
+        ),
+        (
+            "forward fill to 30 s",
+            lambda: _former_forward_fill_resample(values, ts.twindow, (0, end, 30)),
+            lambda: ts.forward_fill_resample((0, end, 30)),
+        ),
+        (
+            "operator MAX",
+            lambda: _former_maximum(operand_values),
+            lambda: apply_time_series_operator(operators["MAX"][1], operands),
+        ),
+    ):
+        print(f"{title:28} {_best_of(former) * 1000:12.1f} {_best_of(current) * 1000:12.1f}")
+
+    for operator_id in ("+", "*", "AVERAGE", "MIN", "MERGE"):
+        op_func = operators[operator_id][1]
+        duration = _best_of(lambda: apply_time_series_operator(op_func, operands))
+        print(f"{'operator ' + operator_id:28} {'':12} {duration * 1000:12.1f}")
+    for operator_id in ("-", "/"):
+        op_func = operators[operator_id][1]
+        duration = _best_of(lambda: apply_time_series_operator(op_func, operands[:2]))
+        print(f"{'operator ' + operator_id + ' (2 operands)':28} {'':12} {duration * 1000:12.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -17,6 +17,7 @@ import json
 import os
 import re
 import select
+import selectors
 import socket
 import ssl
 import threading
@@ -177,6 +178,12 @@ remove_cache_regex = re.compile("\nCache:[^\n]*")
 # Pattern for allowed UserId values
 validate_user_id_regex = re.compile(r"^[\w$][-@.+\w$]*$", re.UNICODE)
 
+# Size of the chunks streamed responses are read in
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Livestatus renders one row per line: "[row1,\nrow2,\n...]\n"
+_ROW_SEPARATOR = b",\n"
+
 
 class MKLivestatusException(Exception):
     pass
@@ -349,6 +356,10 @@ class Helpers:
         normalized_query = Query(query) if not isinstance(query, Query) else query
         return {line[0] for line in self.query(normalized_query, "ColumnHeaders: off\n")}
 
+    def query_stream(self, query: QueryTypes, add_headers: str = "") -> Iterator[LivestatusRow]:
+        """Issues a query and yields the rows of the response one by one"""
+        yield from self.query(query, add_headers)
+
     def query_table(self, query: QueryTypes) -> LivestatusResponse:
         """Issues a query that may return multiple lines and columns and returns
         a list of lists"""
@@ -356,6 +367,13 @@ class Helpers:
 
         return self.query(normalized_query, "ColumnHeaders: off\n")
 
+    def iter_table(self, query: QueryTypes) -> Iterator[LivestatusRow]:
+        """Like query_table, but yields the rows while the response is being received.
+        Use this for large responses which should not be held in memory as a whole."""
+        normalized_query = Query(query) if not isinstance(query, Query) else query
+
+        return self.query_stream(normalized_query, "ColumnHeaders: off\n")
+
     def query_table_assoc(self, query: QueryTypes) -> list[dict[str, Any]]:
         """Issues a query that may return multiple lines and columns and returns
         a dictionary from column names to values for each line. This can be
@@ -799,17 +817,7 @@ class SingleSiteConnection(Helpers):
             if code == "200":
                 return data
 
-            error_info = data.decode("utf-8")
-            if code == "404":
-                raise MKLivestatusTableNotFoundError(f"Not Found ({code}): {error_info!r}")
-
-            if code == "413":
-                raise MKLivestatusPayloadTooLargeError(error_info)
-
-            if code == "502":
-                raise MKLivestatusBadGatewayError(error_info)
-
-            raise MKLivestatusQueryError(f"{code}: {error_info}")
+            raise _response_error(code, data)
 
         except (MKLivestatusSocketClosed, OSError) as e:
             # In case of an IO error or the other side having
@@ -849,6 +857,102 @@ class SingleSiteConnection(Helpers):
             # FIXME: ? self.disconnect()
             raise MKLivestatusSocketError("Unhandled exception: %s" % e)
 
+    def receive_rows(self, query: str, query_obj: Query) -> Iterator[LivestatusRow]:
+        """Receives the response to a sent query and yields its rows while reading it
+
+        Only the rows which are not completely received yet are buffered. A response which is
+        not consumed completely is still read to the end, so the connection can be reused.
+        """
+        try:
+            resp = self.receive_data(16)
+        except (MKLivestatusSocketClosed, OSError):
+            # The keepalive connection may have been closed in the meantime, try once again
+            self.disconnect()
+            self.send_query(query)
+            try:
+                resp = self.receive_data(16)
+            except (MKLivestatusSocketClosed, OSError) as e:
+                self.disconnect()
+                raise MKLivestatusSocketError(str(e))
+
+        code = resp[0:3].decode("ascii")
+        try:
+            length = int(resp[4:15].lstrip())
+        except ValueError:
+            self.disconnect()
+            raise MKLivestatusSocketError(f"Malformed response header {resp!r}")
+
+        if code != "200":
+            raise _response_error(code, self.receive_data(length, 30))
+
+        parse = _parse_json_rows if query_obj.supports_json_format() else _parse_python_rows
+        chunk = memoryview(bytearray(min(length, STREAM_CHUNK_SIZE) or 1))
+        buffer = bytearray()
+        remaining = length
+        start = 0
+        try:
+            while remaining:
+                received = self._receive_into(chunk[: min(remaining, len(chunk))], 30)
+                if remaining == length:
+                    if chunk[0] != ord("["):
+                        raise MKLivestatusQueryError("Malformed raw response output")
+                    start = 1
+                remaining -= received
+                buffer += chunk[:received]
+
+                search = start
+                while (end := buffer.find(_ROW_SEPARATOR, search)) != -1:
+                    search = end + len(_ROW_SEPARATOR)
+                    try:
+                        rows = parse(b"[%s]" % buffer[start:end])
+                    except (ValueError, SyntaxError):
+                        continue  # separator within a value, the row is not complete yet
+                    start = search
+                    yield from rows
+                del buffer[:start]
+                start = 0
+
+            last = bytes(buffer[start:]).rstrip()
+            if not last.endswith(b"]"):
+                raise MKLivestatusQueryError("Malformed raw response output")
+            try:
+                yield from parse(b"[%s]" % last[:-1])
+            except (ValueError, SyntaxError):
+                raise MKLivestatusQueryError("Malformed raw response output")
+        except (MKLivestatusSocketClosed, OSError) as e:
+            remaining = 0
+            self.disconnect()
+            raise MKLivestatusSocketError(str(e))
+        except MKLivestatusQueryError:
+            remaining = 0
+            self.disconnect()
+            raise
+        finally:
+            if remaining:
+                self._discard_data(remaining)
+
+    def _receive_into(self, view: memoryview, timeout: float) -> int:
+        if self.socket is None:
+            raise MKLivestatusSocketError("Socket to '%s' is not connected" % self.socketurl)
+
+        receive_start = time.time()
+        while not is_socket_readable(self.socket, 0.1):
+            if time.time() - receive_start > timeout:
+                raise MKLivestatusSocketError(f"{timeout}s while reading data from socket")
+        if not (received := self.socket.recv_into(view)):
+            raise MKLivestatusSocketClosed(
+                "Read zero data from socket, remote peer closed connection."
+            )
+        return received
+
+    def _discard_data(self, size: int) -> None:
+        chunk = memoryview(bytearray(min(size, STREAM_CHUNK_SIZE)))
+        try:
+            while size > 0:
+                size -= self._receive_into(chunk[: min(size, len(chunk))], 30)
+        except (MKLivestatusException, OSError):
+            self.disconnect()
+
     def parse_raw_response(self, raw_response: bytes, query: Query) -> LivestatusResponse:
         data = raw_response.decode("utf-8")
         try:
@@ -892,6 +996,25 @@ class SingleSiteConnection(Helpers):
                 row.insert(0, b"")
         return response
 
+    @override
+    def query_stream(self, query: QueryTypes, add_headers: str = "") -> Iterator[LivestatusRow]:
+        normalized_query = Query(query) if not isinstance(query, Query) else query
+
+        if self.limit is not None:
+            normalized_query = Query(
+                "%sLimit: %d\n" % (normalized_query, self.limit),
+                normalized_query.suppress_exceptions,
+            )
+
+        with _livestatus_output_format_switcher(normalized_query, self):
+            str_query = self.build_query(normalized_query, add_headers)
+            self.send_query(str_query)
+            with contextlib.closing(self.receive_rows(str_query, normalized_query)) as rows:
+                for row in rows:
+                    if self.prepend_site:
+                        row.insert(0, b"")
+                    yield row
+
     def command(
         self,
         command: str,
@@ -1261,15 +1384,67 @@ class MultiSiteConnection(Helpers):
                 limit_header="Limit: %d\n" % self.limit if self.limit is not None else "",
             )
 
-            # Then retrieve all raw responses. We will be as slow as the slowest of all connections.
-            site_responses = self._retrieve_responses(query, retrieve_responses, stillalive)
-
-            # Convert responses to python format
-            result = self._parse_responses(query, site_responses, stillalive)
+            # Then retrieve and parse the responses in the order the sites answer
+            result = self._retrieve_responses(query, retrieve_responses, stillalive)
 
         self.connections = stillalive
         return LivestatusResponse(result)
 
+    @override
+    def query_stream(self, query: QueryTypes, add_headers: str = "") -> Iterator[LivestatusRow]:
+        """Yields the rows of all sites while the responses are being received
+
+        All queries are sent up front like in query_parallel, the responses are then read site by
+        site. A site failing in the middle of its response is considered dead, but the rows
+        already yielded are not taken back.
+        """
+        normalized_query = Query(query) if not isinstance(query, Query) else query
+
+        stillalive = []
+        if self.only_sites is not None:
+            connect_to_sites = [c for c in self.connections if c[0] in self.only_sites]
+            stillalive.extend([c for c in self.connections if c[0] not in self.only_sites])
+        else:
+            connect_to_sites = self.connections
+
+        with _livestatus_output_format_switcher(normalized_query, self):
+            retrieve_responses = self._send_queries(
+                normalized_query,
+                add_headers,
+                connect_to_sites,
+                limit_header="Limit: %d\n" % self.limit if self.limit is not None else "",
+            )
+            unread = [entry[2] for entry in retrieve_responses]
+            try:
+                for str_query, _span, connected_site in retrieve_responses:
+                    unread.remove(connected_site)
+                    try:
+                        with contextlib.closing(
+                            connected_site.connection.receive_rows(str_query, normalized_query)
+                        ) as rows:
+                            for row in rows:
+                                if self.prepend_site:
+                                    row.insert(0, connected_site.id)
+                                yield row
+                    except normalized_query.suppress_exceptions:
+                        pass
+                    except LivestatusTestingError:
+                        raise
+                    except Exception as e:
+                        connected_site.connection.disconnect()
+                        self.deadsites[connected_site.id] = {
+                            "exception": e,
+                            "site": connected_site.config,
+                        }
+                        continue
+                    stillalive.append(connected_site)
+            finally:
+                # The responses of the sites not read yet would be in the way of the next query
+                for connected_site in unread:
+                    connected_site.connection.disconnect()
+
+        self.connections = stillalive
+
     def _send_queries(
         self, query: Query, add_headers: str, connect_to_sites: ConnectedSites, limit_header: str
     ) -> list[tuple[str, trace.Span, ConnectedSite]]:
@@ -1303,59 +1478,94 @@ class MultiSiteConnection(Helpers):
         query: Query,
         retrieve_responses: list[tuple[str, trace.Span, ConnectedSite]],
         stillalive: ConnectedSites,
-    ) -> list[tuple[ConnectedSite, bytes]]:
-        site_responses: list[tuple[ConnectedSite, bytes]] = []
-        for str_query, request_span, connected_site in retrieve_responses:
-            with tracer.start_as_current_span(
-                f"receive_from_site[{connected_site.id}]",
-                kind=trace.SpanKind.CONSUMER,
-                links=[trace.Link(request_span.get_span_context())],
-                attributes={
-                    "cmk.livestatus.query": str_query,
-                    "cmk.livestatus.target_site_id": str(connected_site.id),
-                },
-            ):
+    ) -> list[LivestatusRow]:
+        """Receive and parse the responses as soon as the sockets become readable
+
+        Each site has to answer within its timeout, counted from now on. Sites which do not
+        answer in time are considered dead. The rows are returned in the order of the sites.
+        """
+        site_rows: dict[SiteId, list[LivestatusRow]] = {}
+        start = time.monotonic()
+        deadlines: dict[SiteId, float] = {}
+        with selectors.DefaultSelector() as selector:
+            for entry in retrieve_responses:
+                connected_site = entry[2]
+                site_socket = connected_site.connection.socket
+                if connected_site.connection.timeout:
+                    deadlines[connected_site.id] = start + connected_site.connection.timeout
+                if site_socket is None or (
+                    # Data buffered by TLS is not signalled by the selector
+                    isinstance(site_socket, ssl.SSLSocket) and site_socket.pending()
+                ):
+                    self._receive_response(query, *entry, site_rows)
+                    continue
                 try:
-                    site_responses.append(
-                        (
-                            connected_site,
-                            connected_site.connection.receive_raw_response(
-                                str_query, query.suppress_exceptions
+                    selector.register(site_socket, selectors.EVENT_READ, entry)
+                except (ValueError, KeyError):  # closed or shared with another site
+                    self._receive_response(query, *entry, site_rows)
+
+            while selector.get_map():
+                now = time.monotonic()
+                for key in list(selector.get_map().values()):
+                    connected_site = key.data[2]
+                    if (
+                        deadline := deadlines.get(connected_site.id)
+                    ) is not None and deadline <= now:
+                        selector.unregister(key.fileobj)
+                        connected_site.connection.disconnect()
+                        self.deadsites[connected_site.id] = {
+                            "exception": MKLivestatusSocketError(
+                                "No response from site within %ss"
+                                % connected_site.connection.timeout
                             ),
-                        )
-                    )
-                except query.suppress_exceptions:
-                    # Mostly handles exception types MKLivestatusTableNotFoundError
-                    stillalive.append(connected_site)
-                    continue
-                except LivestatusTestingError:
-                    raise
-                except Exception as e:
-                    connected_site.connection.disconnect()
-                    self.deadsites[connected_site.id] = {
-                        "exception": e,
-                        "site": connected_site.config,
-                    }
-        return site_responses
+                            "site": connected_site.config,
+                        }
+                if not (pending := list(selector.get_map().values())):
+                    break
+                pending_deadlines = [
+                    deadlines[key.data[2].id] for key in pending if key.data[2].id in deadlines
+                ]
+                for key, _mask in selector.select(
+                    max(0.0, min(pending_deadlines) - now) if pending_deadlines else None
+                ):
+                    selector.unregister(key.fileobj)
+                    self._receive_response(query, *key.data, site_rows)
 
-    def _parse_responses(
-        self,
-        query: Query,
-        site_responses: list[tuple[ConnectedSite, bytes]],
-        stillalive: ConnectedSites,
-    ) -> list[LivestatusRow]:
         result: list[LivestatusRow] = []
-        for connected_site, raw_response in site_responses:
-            try:
-                rows = connected_site.connection.parse_raw_response(raw_response, query)
+        for _str_query, _span, connected_site in retrieve_responses:
+            if (rows := site_rows.get(connected_site.id)) is not None:
                 stillalive.append(connected_site)
-                if self.prepend_site:
-                    for row in rows:
-                        row.insert(0, connected_site.id)
                 result.extend(rows)
+        return result
+
+    def _receive_response(
+        self,
+        query: Query,
+        str_query: str,
+        request_span: trace.Span,
+        connected_site: ConnectedSite,
+        site_rows: dict[SiteId, list[LivestatusRow]],
+    ) -> None:
+        with tracer.start_as_current_span(
+            f"receive_from_site[{connected_site.id}]",
+            kind=trace.SpanKind.CONSUMER,
+            links=[trace.Link(request_span.get_span_context())],
+            attributes={
+                "cmk.livestatus.query": str_query,
+                "cmk.livestatus.target_site_id": str(connected_site.id),
+            },
+        ):
+            try:
+                rows = connected_site.connection.parse_raw_response(
+                    connected_site.connection.receive_raw_response(
+                        str_query, query.suppress_exceptions
+                    ),
+                    query,
+                )
             except query.suppress_exceptions:
-                stillalive.append(connected_site)
-                continue
+                # Mostly handles exception types MKLivestatusTableNotFoundError
+                site_rows[connected_site.id] = []
+                return
             except LivestatusTestingError:
                 raise
             except Exception as e:
@@ -1364,7 +1574,11 @@ class MultiSiteConnection(Helpers):
                     "exception": e,
                     "site": connected_site.config,
                 }
-        return result
+                return
+            if self.prepend_site:
+                for row in rows:
+                    row.insert(0, connected_site.id)
+            site_rows[connected_site.id] = rows
 
     def command(self, command: str, sitename: SiteId | None = SiteId("local")) -> None:
         if sitename in self.deadsites:
@@ -1493,6 +1707,30 @@ def _combine_query(query: str, headers: str | list[str]) -> str:
     return query + "\n" + headers
 
 
+def _response_error(code: str, data: bytes) -> MKLivestatusException:
+    error_info = data.decode("utf-8")
+    if code == "404":
+        return MKLivestatusTableNotFoundError(f"Not Found ({code}): {error_info!r}")
+
+    if code == "413":
+        return MKLivestatusPayloadTooLargeError(error_info)
+
+    if code == "502":
+        return MKLivestatusBadGatewayError(error_info)
+
+    return MKLivestatusQueryError(f"{code}: {error_info}")
+
+
+def _parse_json_rows(data: bytes) -> list[LivestatusRow]:
+    rows: list[LivestatusRow] = json.loads(data)
+    return rows
+
+
+def _parse_python_rows(data: bytes) -> list[LivestatusRow]:
+    rows: list[LivestatusRow] = ast.literal_eval(data.decode("utf-8"))
+    return rows
+
+
 def is_socket_readable(sock: socket.socket, select_timeout: float = 1.0) -> bool:
     # SSL sockets may not return any fileno in the select, since the data lingers around in pending
     # https://stackoverflow.com/questions/3187565/select-and-ssl-in-python
@@ -5,8 +5,9 @@
 
 # pylint: disable=protected-access
 
+import threading
 import time
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Literal
 
 import pytest
@@ -14,14 +15,21 @@ from pytest import MonkeyPatch
 
 from tests.testlib.base import Scenario
 
+from cmk.ccc.exceptions import MKFetcherError
+
+from cmk.utils.agentdatatype import AgentRawData
 from cmk.utils.hostaddress import HostName
 
+from cmk.fetchers import Fetcher, Mode
+from cmk.fetchers.filecache import FileCache, FileCacheOptions, NoCache
+
 from cmk.checkengine.checkresults import ServiceCheckResult, SubmittableServiceCheckResult
-from cmk.checkengine.fetcher import HostKey, SourceType
+from cmk.checkengine.fetcher import FetcherType, HostKey, SourceInfo, SourceType
 from cmk.checkengine.parameters import TimespecificParameters, TimespecificParameterSet
 
 from cmk.base import checkers, config
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult
+from cmk.base.sources import Source
 
 from cmk.agent_based.prediction_backend import (
     InjectedParameters,
@@ -278,3 +286,93 @@ def test_prediction_injection() -> None:
             ("my_reference_metric", *prediction),
         )
     }
+
+
+class _SleepingFetcher(Fetcher[AgentRawData]):
+    def __init__(self, delay: float, barrier: threading.Barrier | None = None) -> None:
+        self.delay = delay
+        self.barrier = barrier
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def _fetch_from_io(self, mode: Mode) -> AgentRawData:
+        if self.barrier is not None:
+            # Only passes if all sources are fetched at the same time.
+            self.barrier.wait(timeout=5)
+        time.sleep(self.delay)
+        return AgentRawData(f"<<<delay>>>\n{self.delay}".encode())
+
+
+class _SleepingSource(Source[AgentRawData]):
+    def __init__(self, ident: str, fetcher: _SleepingFetcher) -> None:
+        self.ident = ident
+        self._fetcher = fetcher
+
+    def source_info(self) -> SourceInfo:
+        return SourceInfo(
+            HostName("testhost"), None, self.ident, FetcherType.PROGRAM, SourceType.HOST
+        )
+
+    def fetcher(self) -> _SleepingFetcher:
+        return self._fetcher
+
+    def file_cache(
+        self, *, simulation: bool, file_cache_options: FileCacheOptions
+    ) -> FileCache[AgentRawData]:
+        return NoCache()
+
+
+def _fetch_all(sources: Sequence[Source], **kwargs: object) -> Sequence[tuple]:
+    return checkers._fetch_all(
+        sources,
+        simulation=False,
+        file_cache_options=FileCacheOptions(),
+        mode=Mode.CHECKING,
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_fetch_all_concurrently_keeps_order() -> None:
+    barrier = threading.Barrier(3)
+    sources = [
+        _SleepingSource("slow", _SleepingFetcher(0.2, barrier)),
+        _SleepingSource("medium", _SleepingFetcher(0.1, barrier)),
+        _SleepingSource("fast", _SleepingFetcher(0.0, barrier)),
+    ]
+
+    fetched = _fetch_all(sources, max_workers=3)
+
+    assert [source_info.ident for source_info, _raw_data, _snapshot in fetched] == [
+        "slow",
+        "medium",
+        "fast",
+    ]
+    assert [raw_data.ok for _source_info, raw_data, _snapshot in fetched] == [
+        b"<<<delay>>>\n0.2",
+        b"<<<delay>>>\n0.1",
+        b"<<<delay>>>\n0.0",
+    ]
+    assert all(snapshot.process.elapsed >= 0.0 for _si, _rd, snapshot in fetched)
+
+
+def test_fetch_all_concurrently_source_wait_limit() -> None:
+    sources = [
+        _SleepingSource("slow", _SleepingFetcher(1.0)),
+        _SleepingSource("fast", _SleepingFetcher(0.0)),
+    ]
+
+    fetched = _fetch_all(sources, max_workers=2, source_wait_limit=0.1)
+
+    (_, slow, _), (_, fast, _) = fetched
+    assert slow.is_error()
+    assert isinstance(slow.error, MKFetcherError)
+    assert fast.ok == b"<<<delay>>>\n0.0"
+
+
+def test_fetch_all_serial_is_default() -> None:
+    fetched = _fetch_all([_SleepingSource(str(n), _SleepingFetcher(0.0)) for n in range(3)])
+    assert [source_info.ident for source_info, _raw_data, _snapshot in fetched] == ["0", "1", "2"]
@@ -2716,6 +2716,27 @@ def test_get_config_file_paths_with_confd(folder_path_test_config: None) -> None
     ]
 
 
+def test_compiled_config_cache(tmp_path: Path) -> None:
+    config_file = tmp_path / "rules.mk"
+    config_file.write_text("x = 1\n")
+    cache = config._CompiledConfigCache(tmp_path / "cache")
+
+    first = cache.compile(config_file)
+    assert cache.compile(config_file) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    config_file.write_text("x = 23\n")
+    namespace: dict[str, object] = {}
+    exec(cache.compile(config_file), namespace)  # nosec B102 # BNS:aee528
+    assert namespace["x"] == 23
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # The cache persists across instances
+    other_cache = config._CompiledConfigCache(tmp_path / "cache")
+    other_cache.compile(config_file)
+    assert (other_cache.hits, other_cache.misses) == (1, 0)
+
+
 def test_load_config_folder_paths(folder_path_test_config: None) -> None:
     # reset makes our testing environment explicit and stable, but the test runs good with almost
     # any config_cache.
@@ -12,6 +12,7 @@ import os
 import socket
 from collections import Counter
 from collections.abc import Mapping, Sequence
+from dataclasses import replace
 from pathlib import Path
 from typing import Any, Literal
 
@@ -22,15 +23,18 @@ from tests.testlib.base import Scenario
 
 import cmk.ccc.debug
 import cmk.ccc.version as cmk_version
+from cmk.ccc.exceptions import MKIPAddressLookupError
 
-from cmk.utils import paths
+from cmk.utils import ip_lookup, paths
 from cmk.utils.config_path import VersionedConfigPath
 from cmk.utils.hostaddress import HostAddress, HostName
+from cmk.utils.licensing.cre_handler import CRELicensingHandler
 
 from cmk.checkengine.checking import CheckPluginName
 from cmk.checkengine.discovery import AutocheckEntry
 
 from cmk.base import config, core_nagios, server_side_calls
+from cmk.base.core_nagios import _parallel
 
 from cmk.discover_plugins import PluginLocation
 from cmk.server_side_calls.v1 import ActiveCheckCommand, ActiveCheckConfig
@@ -393,6 +397,39 @@ def test_dump_precompiled_hostcheck(
     assert host_check.startswith("#!/usr/bin/env python3")
 
 
+def test_precompile_hostchecks_shares_modules(
+    monkeypatch: MonkeyPatch, config_path: VersionedConfigPath
+) -> None:
+    hostnames = [HostName("host1"), HostName("host2")]
+    ts = Scenario()
+    for hostname in hostnames:
+        ts.add_host(hostname)
+        ts.set_autochecks(
+            hostname,
+            [AutocheckEntry(CheckPluginName("uptime"), None, {}, {})],
+        )
+    ts.set_option("ipaddresses", {hostname: "127.0.0.1" for hostname in hostnames})
+    config_cache = ts.apply(monkeypatch)
+
+    core_nagios.precompile_hostchecks(
+        config_path,
+        config_cache,
+        legacy_check_plugin_names={},
+        legacy_check_plugin_files={},
+        precompile_mode=core_nagios.PrecompileMode.INSTANT,
+    )
+
+    (shared_module,) = core_nagios.HostCheckStore.shared_module_dir(config_path).glob("*.py")
+    assert "hostname=''" in shared_module.read_text()
+    for hostname in hostnames:
+        stub = core_nagios.HostCheckStore.host_check_source_file_path(
+            config_path, hostname
+        ).read_text()
+        assert f"import_module({shared_module.stem!r})" in stub
+        assert f"hostname={hostname!r}" in stub
+        assert core_nagios.HostCheckStore.host_check_file_path(config_path, hostname).exists()
+
+
 def test_dump_precompiled_hostcheck_without_check_mk_service(
     monkeypatch: MonkeyPatch, config_path: VersionedConfigPath
 ) -> None:
@@ -868,3 +905,131 @@ def test_create_nagios_config_commands(
 
     assert license_counter["services"] == 1
     assert outfile.getvalue() == expected_result
+
+
+def test_create_config_reuses_host_configs(
+    monkeypatch: MonkeyPatch, config_path: VersionedConfigPath
+) -> None:
+    ts = Scenario()
+    # Hosts with failed IP lookups are never reused
+    ts.add_host(HostName("host1"), ipaddress=HostAddress("127.0.0.1"))
+    ts.add_host(HostName("host2"), ipaddress=HostAddress("127.0.0.2"))
+    config_cache = ts.apply(monkeypatch)
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+    ip_address_of = config.ConfiguredIPLookup(
+        config_cache, error_handler=config.handle_ip_lookup_failure
+    )
+    hostnames = [HostName("host1"), HostName("host2")]
+
+    def create_config(
+        hosts_to_update: set[HostName] | None,
+        previous_host_configs: Mapping[HostName, core_nagios.HostConfig] | None,
+    ) -> tuple[str, Mapping[HostName, core_nagios.HostConfig]]:
+        outfile = io.StringIO()
+        host_configs = core_nagios.create_config(
+            outfile,
+            config_path,
+            config_cache,
+            hostnames,
+            CRELicensingHandler(),
+            {},
+            ip_address_of,
+            hosts_to_update=hosts_to_update,
+            previous_host_configs=previous_host_configs,
+        )
+        return outfile.getvalue(), host_configs
+
+    objects, host_configs = create_config(None, None)
+    assert list(host_configs) == hostnames
+
+    stale_host_configs = {
+        hostname: replace(host_config, objects=f"# stale {hostname}\n")
+        for hostname, host_config in host_configs.items()
+    }
+    stale_objects, updated_host_configs = create_config({HostName("host2")}, stale_host_configs)
+    assert "# stale host1\n" in stale_objects
+    assert "# stale host2\n" not in stale_objects
+    assert updated_host_configs[HostName("host2")] == host_configs[HostName("host2")]
+
+    assert create_config(None, stale_host_configs)[0] == objects
+
+
+def test_create_config_in_worker_processes(
+    monkeypatch: MonkeyPatch, config_path: VersionedConfigPath
+) -> None:
+    ts = Scenario()
+    hostnames = [HostName(f"host{i}") for i in range(5)]
+    for hostname in hostnames:
+        ts.add_host(hostname)
+    config_cache = ts.apply(monkeypatch)
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+    ip_address_of = config.ConfiguredIPLookup(
+        config_cache, error_handler=config.handle_ip_lookup_failure
+    )
+
+    def create_config(processes: int) -> str:
+        outfile = io.StringIO()
+        core_nagios.create_config(
+            outfile,
+            config_path,
+            config_cache,
+            hostnames,
+            CRELicensingHandler(),
+            {},
+            ip_address_of,
+            processes=processes,
+        )
+        return outfile.getvalue()
+
+    assert create_config(3) == create_config(1)
+
+
+def test_create_config_reports_ip_lookup_failures_of_worker_processes(
+    monkeypatch: MonkeyPatch, config_path: VersionedConfigPath
+) -> None:
+    ts = Scenario()
+    ts.add_host(HostName("node1"))
+    ts.add_host(HostName("node2"))
+    ts.add_host(HostName("host"))
+    ts.add_cluster(HostName("cluster"), nodes=[HostName("node1"), HostName("node2")])
+    config_cache = ts.apply(monkeypatch)
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+
+    def lookup_ip_address(
+        _config_cache: config.ConfigCache, host_name: HostName, *, family: socket.AddressFamily
+    ) -> HostAddress:
+        if host_name == HostName("node2"):
+            raise MKIPAddressLookupError("no address")
+        return HostAddress("127.0.0.1")
+
+    monkeypatch.setattr(config, "lookup_ip_address", lookup_ip_address)
+    ip_address_of = config.ConfiguredIPLookup(
+        config_cache, error_handler=ip_lookup.CollectFailedHosts()
+    )
+
+    # The nodes are only looked up while creating the objects of the cluster
+    core_nagios.create_config(
+        io.StringIO(),
+        config_path,
+        config_cache,
+        [HostName("cluster"), HostName("host")],
+        CRELicensingHandler(),
+        {},
+        ip_address_of,
+        processes=2,
+    )
+
+    assert ip_address_of.error_handler.format_errors() == [
+        "Cannot lookup IP address of 'node2' (no address). The host will not be monitored correctly."
+    ]
+
+
+def test_map_forked_stops_at_first_error_without_workers() -> None:
+    def invert(x: int) -> float:
+        return 1 / x
+
+    results = _parallel.map_forked(invert, [1, 0, 2], processes=1)
+
+    assert results[0] == 1
+    assert isinstance(results[1], ZeroDivisionError)
+    assert len(results) == 2
@@ -3,6 +3,10 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import io
+import json
+import sys
+
 import pytest
 
 from tests.testlib.base import Scenario
@@ -12,6 +16,8 @@ from cmk.utils.hostaddress import HostName
 
 from cmk.fetchers import PiggybackFetcher
 
+from cmk.checkengine.checkresults import ActiveCheckResult
+
 from cmk.base.modes import check_mk
 
 
@@ -53,3 +59,46 @@ class TestModeDumpAgent:
     ) -> None:
         check_mk.mode_dump_agent({}, hostname)
         assert capsys.readouterr().out == raw_data.decode()
+
+
+class TestModeCheckBatch:
+    @pytest.fixture
+    def scenario(self, monkeypatch: pytest.MonkeyPatch) -> Scenario:
+        ts = Scenario()
+        ts.add_host(HostName("host-ok"))
+        ts.add_host(HostName("host-crit"))
+        ts.apply(monkeypatch)
+        return ts
+
+    @pytest.fixture
+    def checked(self, monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str | None]]:
+        checked: list[tuple[str, str | None]] = []
+
+        def _check_host(
+            _get_submitter, _options, _config_cache, _hosts_config, hostname, ipaddress, **_kw
+        ):
+            checked.append((hostname, ipaddress))
+            if hostname == "host-error":
+                raise ValueError("boom")
+            return ActiveCheckResult(2 if hostname == "host-crit" else 0, f"checked {hostname}")
+
+        monkeypatch.setattr(check_mk, "_check_host", _check_host)
+        return checked
+
+    @pytest.mark.usefixtures("scenario", "disable_debug")
+    def test_one_result_per_host(
+        self,
+        checked: list[tuple[str, str | None]],
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.setattr(sys, "stdin", io.StringIO("host-ok\n\nhost-crit 1.2.3.4\nhost-error\n"))
+
+        check_mk.mode_check_batch(check_mk.get_submitter, {})
+
+        assert checked == [("host-ok", None), ("host-crit", "1.2.3.4"), ("host-error", None)]
+        assert [json.loads(line) for line in capsys.readouterr().out.splitlines()] == [
+            {"host": "host-ok", "state": 0, "output": "checked host-ok"},
+            {"host": "host-crit", "state": 2, "output": "checked host-crit"},
+            {"host": "host-error", "state": 3, "output": "boom"},
+        ]
@@ -7,17 +7,22 @@
 
 import datetime
 import math
+import os
 import time
 from collections.abc import Callable, Sequence
 from pathlib import Path
 from pprint import pprint
+from typing import NamedTuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pytest
 import time_machine
 
 from cmk.utils.prediction import _grouping, _prediction, DataStat, PredictionStore
 
+from cmk.agent_based.prediction_backend import PredictionInfo, PredictionParameters
+
 Timestamp = int
 
 
@@ -213,6 +218,50 @@ def test_data_stats(
     assert _prediction._data_stats(slices) == result
 
 
+class _Record(NamedTuple):
+    window: range
+    values: Sequence[float | None]
+
+
+def _make_prediction_info(now: float) -> PredictionInfo:
+    return PredictionInfo.make(
+        "load1",
+        "upper",
+        PredictionParameters(period="hour", horizon=4, levels=("absolute", (1.0, 2.0))),
+        now,
+    )
+
+
+def test_compute_prediction_fetches_only_new_slices() -> None:
+    fetched: list[int] = []
+
+    def get_recorded_data(_metric: str, start: int, end: int) -> _Record:
+        fetched.append(start)
+        return _Record(range(start, end, 3600), [float(start % 17 + i) for i in range(24)])
+
+    yesterday = _make_prediction_info(1700000000)
+    computed = _prediction.compute_prediction(
+        yesterday, get_recorded_data, yesterday.valid_interval[0] + 60
+    )
+    assert computed is not None
+    assert len(fetched) == 4
+    # the slice of the current day is incomplete
+    assert sorted(computed[1].rows) == sorted(fetched[1:])
+
+    fetched.clear()
+    today = _make_prediction_info(yesterday.valid_interval[1])
+    incremental = _prediction.compute_prediction(
+        today, get_recorded_data, today.valid_interval[0] + 60, computed[1]
+    )
+    assert incremental is not None
+    assert fetched == [today.valid_interval[0], yesterday.valid_interval[0]]
+
+    full = _prediction.compute_prediction(today, get_recorded_data, today.valid_interval[0] + 60)
+    assert full is not None
+    assert incremental[0] == full[0]
+    assert sorted(incremental[1].rows) == sorted(full[1].rows)
+
+
 class TestPredictionStore:
     def test_remove_outdated_predictions(self, tmp_path: Path) -> None:
         now = int(time.time())
@@ -228,6 +277,10 @@ class TestPredictionStore:
         (stillok_hour := _make_f("hour", 2)).touch()
         (too_old_minute := _make_f("minute", 4)).touch()
         (stillok_minute := _make_f("minute", 2)).touch()
+        (too_old_slices := tmp_path / "hour-upper.slices").touch()
+        os.utime(too_old_slices, (now - 4 * 86400, now - 4 * 86400))
+        (stillok_slices := tmp_path / "day-upper.slices").touch()
+        os.utime(stillok_slices, (now - 4 * 86400, now - 4 * 86400))
 
         PredictionStore(tmp_path).remove_outdated_predictions(now)
 
@@ -239,3 +292,23 @@ class TestPredictionStore:
         assert stillok_hour.exists()
         assert not too_old_minute.exists()
         assert stillok_minute.exists()
+        assert not too_old_slices.exists()
+        assert stillok_slices.exists()
+
+    def test_slice_cache_roundtrip(self, tmp_path: Path) -> None:
+        store = PredictionStore(tmp_path)
+        meta = _make_prediction_info(1700000000)
+        assert store.load_slice_cache(meta) is None
+
+        cache = _prediction.SliceCache(
+            grid=(0, 3600, 3),
+            rows={1: np.array([1.0, math.nan, 3.0]), 2: np.array([4.0, 5.0, 6.0])},
+        )
+        store.save_slice_cache(meta, cache)
+
+        loaded = store.load_slice_cache(meta)
+        assert loaded is not None
+        assert loaded.grid == cache.grid
+        assert loaded.rows.keys() == cache.rows.keys()
+        for start, row in cache.rows.items():
+            assert np.array_equal(loaded.rows[start], row, equal_nan=True)
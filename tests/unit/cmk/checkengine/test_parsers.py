@@ -8,6 +8,7 @@
 import copy
 import itertools
 import logging
+import pickle
 import time
 from collections import defaultdict
 from collections.abc import Sequence
@@ -29,8 +30,11 @@ from cmk.checkengine.parser import (
     SectionStore,
     SNMPParser,
 )
-from cmk.checkengine.parser._agent import ParserState
+from cmk.checkengine.parser._agent import _iter_lines, ParserState
 from cmk.checkengine.parser._markers import PiggybackMarker, SectionMarker
+from cmk.checkengine.parser._sectionstore import _PersistedSection
+
+from cmk.piggyback import PiggybackRawDataWriter
 
 StringTable = list[list[str]]
 
@@ -541,13 +545,13 @@ class TestAgentParser:
         monkeypatch.setattr(time, "time", lambda c=itertools.count(1000, 50): next(c))
         monkeypatch.setattr(
             SectionStore,
-            "load",
+            "_load",
             lambda self: {
-                SectionName("persisted"): (42, 69, [["content"]]),
+                SectionName("persisted"): _PersistedSection(42, 69, pickle.dumps([["content"]])),
             },
         )
         # Patch IO:
-        monkeypatch.setattr(SectionStore, "store", lambda self, sections: None)
+        monkeypatch.setattr(SectionStore, "_store", lambda self, sections: None)
 
         raw_data = AgentRawData(
             b"\n".join(
@@ -668,6 +672,104 @@ class TestAgentParser:
         }
         assert not store.load()
 
+    def test_deselected_lines_are_not_kept(self, parser: AgentParser) -> None:
+        raw_data = AgentRawData(
+            b"\n".join(
+                (
+                    b"<<<deselected>>>",
+                    b"1st line",
+                    b"<<<selected>>>",
+                    b"2nd line",
+                    b"<<<<piggyback_header>>>>",
+                    b"<<<deselected>>>",
+                    b"3rd line",
+                    b"<<<selected>>>",
+                    b"4th line",
+                    b"<<<<>>>>",
+                )
+            )
+        )
+
+        sections, piggyback_sections = parser._parse_host_section(
+            raw_data, frozenset({SectionName("selected")})
+        )
+
+        assert [(h.name, c) for h, c in sections] == [
+            (SectionName("deselected"), []),
+            (SectionName("selected"), [b"2nd line"]),
+        ]
+        assert [(h.name, c) for h, c in next(iter(piggyback_sections.values()))] == [
+            (SectionName("deselected"), []),
+            (SectionName("selected"), [b"4th line"]),
+        ]
+
+    @pytest.mark.parametrize("selection", [NO_SELECTION, frozenset({SectionName("selected")})])
+    def test_piggyback_sections_are_written_while_parsing(
+        self,
+        hostname: HostName,
+        store: SectionStore[Sequence[AgentRawDataSectionElem]],
+        logger: logging.Logger,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        selection: frozenset[SectionName],
+    ) -> None:
+        raw_data = AgentRawData(
+            b"\n".join(
+                (
+                    b"<<<<piggy1>>>>",
+                    b"<<<selected>>>",
+                    b"1st line",
+                    b"<<<selected>>>",
+                    b"2nd line",
+                    b"<<<deselected:cached(1000,3600)>>>",
+                    b"3rd line",
+                    b"<<<<piggy2>>>>",
+                    b"<<<selected>>>",
+                    b"4th line",
+                    b"<<<<>>>>",
+                    b"<<<<piggy1>>>>",
+                    b"<<<selected>>>",
+                    b"5th line",
+                    b"<<<<>>>>",
+                    b"<<<<piggy3>>>>",
+                    b"<<<<>>>>",
+                    b"<<<selected>>>",
+                    b"host line",
+                )
+            )
+        )
+        writer = PiggybackRawDataWriter(hostname, tmp_path)
+
+        def make_parser(
+            piggyback_writer: PiggybackRawDataWriter | None,
+        ) -> AgentParser:
+            return AgentParser(
+                hostname,
+                store,
+                host_check_interval=0,
+                keep_outdated=True,
+                translation=TranslationOptions(),
+                encoding_fallback="ascii",
+                logger=logger,
+                piggyback_writer=piggyback_writer,
+            )
+
+        monkeypatch.setattr(time, "time", lambda: 1000)
+        expected = make_parser(None).parse(raw_data, selection=selection)
+        ahs = make_parser(writer).parse(raw_data, selection=selection)
+
+        assert ahs.piggybacked_raw_data is writer
+        assert dict(ahs.piggybacked_raw_data) == expected.piggybacked_raw_data
+        assert ahs.sections == expected.sections
+
+    @pytest.mark.parametrize(
+        "raw_data",
+        [b"", b"\n", b"a", b"a\n", b"a\nbb\n\nccc", b"a\r\nbb\r\n", b"\n\n\n"],
+    )
+    @pytest.mark.parametrize("chunk_size", [0, 1, 2, 3, 1 << 20])
+    def test_iter_lines(self, raw_data: bytes, chunk_size: int) -> None:
+        assert list(_iter_lines(raw_data, chunk_size)) == raw_data.split(b"\n")
+
     def test_section_lines_are_correctly_ordered_with_different_separators(
         self, parser: AgentParser, store: SectionStore[Sequence[AgentRawDataSectionElem]]
     ) -> None:
@@ -919,13 +1021,13 @@ class TestSNMPParser:
         monkeypatch.setattr(parser, "check_intervals", defaultdict(lambda: 33))
         monkeypatch.setattr(
             SectionStore,
-            "load",
+            "_load",
             lambda self: {
-                SectionName("persisted"): (42, 69, [["content"]]),
+                SectionName("persisted"): _PersistedSection(42, 69, pickle.dumps([["content"]])),
             },
         )
         # Patch IO:
-        monkeypatch.setattr(SectionStore, "store", lambda self, sections: None)
+        monkeypatch.setattr(SectionStore, "_store", lambda self, sections: None)
 
         raw_data = sections
 
@@ -940,12 +1042,13 @@ class TestSNMPParser:
 class MockStore(SectionStore):
     def __init__(self, path: str | Path, sections: object, *, logger: logging.Logger) -> None:
         super().__init__(path, logger=logger)
-        self._sections = sections
+        self._sections = {}
+        self.store(sections)
 
-    def store(self, sections):
+    def _store(self, sections):
         self._sections = copy.copy(sections)
 
-    def load(self):
+    def _load(self):
         return copy.copy(self._sections)
 
 
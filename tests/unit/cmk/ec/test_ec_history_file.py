@@ -109,3 +109,39 @@ def test_history_parse(tmp_path: Path) -> None:
 
     assert len(new_entries) == 4
     assert new_entries[0][1] == 1666942292.3000507
+
+
+def test_file_get_uses_index(history: FileHistory, settings: ec.Settings) -> None:
+    for number in range(1, 6):
+        history.add(
+            event=ec.Event(
+                id=number, host=HostName(f"host{number % 2}"), text=f"text {number}", core_host=None
+            ),
+            what="NEW",
+        )
+
+    logger = logging.getLogger("cmk.mkeventd")
+    table = StatusTableHistory(logger, history)
+
+    def query(*filters: str) -> list[tuple[int, str]]:
+        result = history.get(
+            QueryGET(
+                lambda name: table, ["GET history", *(f"Filter: {f}" for f in filters)], logger
+            )
+        )
+        return [
+            (row[table.column_names.index("event_id")], row[table.column_names.index("event_host")])
+            for row in result
+        ]
+
+    assert query("event_host = host1") == [(5, "host1"), (3, "host1"), (1, "host1")]
+    assert query("event_host in HOST0 other", "event_id = 2") == [(2, "host0")]
+    assert query("event_host =~ HOST0", "history_time > 0") == [(4, "host0"), (2, "host0")]
+    assert query("history_time < 0") == []
+
+    (index_path,) = settings.paths.history_dir.value.glob("*.idx")
+    history.add(event=ec.Event(id=6, host=HostName("host1"), text="text 6"), what="NEW")
+    assert query("event_host = host1")[0] == (6, "host1")
+
+    history.flush()
+    assert not index_path.exists()
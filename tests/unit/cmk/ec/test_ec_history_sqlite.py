@@ -7,14 +7,17 @@
 import logging
 import sqlite3
 from collections.abc import Iterator
+from pathlib import Path
+from typing import Literal
 
 import pytest
 
 from cmk.utils.hostaddress import HostName
 
 import cmk.ec.export as ec
-from cmk.ec.history_sqlite import filters_to_sqlite_query, SQLiteHistory
-from cmk.ec.main import StatusTableHistory
+from cmk.ec.config import Config
+from cmk.ec.history_sqlite import filters_to_sqlite_query, SQLiteHistory, SQLiteSettings
+from cmk.ec.main import StatusTableEvents, StatusTableHistory
 from cmk.ec.query import QueryFilter, QueryGET, StatusTable
 
 
@@ -218,3 +221,53 @@ def test_housekeeping(history_sqlite: SQLiteHistory) -> None:
         history_sqlite.housekeeping()
         cur.execute("SELECT count(*) FROM history;")
         assert cur.fetchone()["count(*)"] == 1
+
+
+def _write_behind_history(
+    settings: ec.Settings, config: Config, database: Literal[":memory:"] | Path
+) -> SQLiteHistory:
+    return SQLiteHistory(
+        SQLiteSettings.from_settings(settings, database=database),
+        config | {"archive_mode": "sqlite", "sqlite_write_behind": True},
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+
+
+def _count_rows(connection: sqlite3.Connection) -> int:
+    return connection.execute("SELECT count(*) FROM history;").fetchone()[0]
+
+
+def test_write_behind_add_get(settings: ec.Settings, config: Config) -> None:
+    history = _write_behind_history(settings, config, ":memory:")
+    event = ec.Event(host=HostName("ABC1"), text="Event1 text", core_host=HostName("ABC"))
+    history.add(event=event, what="NEW")
+    event["text"] = "changed after adding"
+    history.add(event=event, what="DELETE")
+
+    logger = logging.getLogger("cmk.mkeventd")
+    query = QueryGET(
+        lambda name: StatusTableHistory(logger, history),
+        ["GET history", "Columns: history_what event_text"],
+        logger,
+    )
+    assert [(row["what"], row["text"]) for row in history.get(query)] == [  # type: ignore[call-overload]
+        ("NEW", "Event1 text"),
+        ("DELETE", "changed after adding"),
+    ]
+    assert history.write_behind_status()[0] == 0
+    history.close()
+
+
+def test_write_behind_close_writes_pending_entries(
+    settings: ec.Settings, config: Config, tmp_path: Path
+) -> None:
+    history = _write_behind_history(settings, config, tmp_path / "history.sqlite")
+    for _ in range(3):
+        history.add(event=ec.Event(host=HostName("ABC1"), text="text"), what="NEW")
+
+    history.close()
+
+    with sqlite3.connect(tmp_path / "history.sqlite") as connection:
+        assert _count_rows(connection) == 3
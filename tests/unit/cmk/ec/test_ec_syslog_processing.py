@@ -3,6 +3,9 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import select
+import socket
+
 import pytest
 
 from cmk.ec.helpers import (
@@ -10,6 +13,7 @@ from cmk.ec.helpers import (
     parse_bytes_into_syslog_messages,
     parse_syslog_message,
     ParseResult,
+    receive_datagrams,
 )
 
 
@@ -122,3 +126,19 @@ def test_process_spool_file() -> None:
     file_to_process = b""""May 26 13:45:01 Klapprechner CRON[8046]:  message\n55 May 26 13:45:01 Klapprechner CRON[8046]: octet message\n"""
     for data in file_to_process.splitlines(keepends=True):
         assert parse_bytes_into_syslog_messages(data)[1] == b""
+
+
+def test_receive_datagrams() -> None:
+    with (
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver,
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender,
+    ):
+        receiver.bind(("127.0.0.1", 0))
+        assert not receive_datagrams(receiver, 4096, 10)
+
+        for message in (b"one", b"two", b"three"):
+            sender.sendto(message, receiver.getsockname())
+        select.select([receiver], [], [], 1)
+
+        assert [m for m, _address in receive_datagrams(receiver, 4096, 2)] == [b"one", b"two"]
+        assert [m for m, _address in receive_datagrams(receiver, 4096, 10)] == [b"three"]
@@ -13,7 +13,14 @@ from livestatus import SiteId
 
 import cmk.ec.export as ec
 from cmk.ec.config import MatchGroups, TextMatchResult
-from cmk.ec.rule_matcher import compile_matching_value, MatchPriority
+from cmk.ec.rule_matcher import (
+    compile_matching_value,
+    compile_rule,
+    MatchPriority,
+    required_literal,
+    required_message_literals,
+    RulePrefilter,
+)
 
 
 @pytest.mark.parametrize(
@@ -465,3 +472,70 @@ def test_compile_matching_value_different_key(key: str) -> None:
     assert isinstance(compiled_pattern, re.Pattern)
     # Expect the original pattern since the key is not in {"match", "match_ok"}
     assert compiled_pattern.pattern == original_value
+
+
+@pytest.mark.parametrize(
+    "value, expected_literal",
+    [
+        ("plain text", "plain text"),
+        ("^Disk (sda|sdb) FAILED$", " failed"),
+        ("error [0-9]+ on (?:host)+", "error "),
+        ("(connection|session)", None),
+        ("é+", None),
+    ],
+)
+def test_required_literal(value: str, expected_literal: str | None) -> None:
+    pattern = compile_matching_value("match", value)
+    assert pattern is not None
+    assert required_literal(pattern) == expected_literal
+    if expected_literal is not None:
+        assert expected_literal in value.lower()
+
+
+def test_required_literal_without_regex_parser(monkeypatch: pytest.MonkeyPatch) -> None:
+    from re import _parser  # pylint: disable=no-name-in-module
+
+    pattern = compile_matching_value("match", "^Disk (sda|sdb) FAILED$")
+    assert pattern is not None
+    rule = _prefilter_rule("disk", match="disk .* failed")
+    # Compiling regexes needs the parser as well
+    monkeypatch.delattr(_parser, "parse")
+
+    assert required_literal(pattern) is None
+    assert required_literal("plain text") == "plain text"
+    assert required_message_literals(rule) is None
+    prefilter = RulePrefilter([(rule, required_message_literals(rule))])
+    assert list(prefilter.candidates("anything")) == [rule]
+
+
+def _prefilter_rule(rule_id: str, **patterns: str) -> ec.Rule:
+    rule = ec.Rule(id=rule_id, **patterns)  # type: ignore[typeddict-item]
+    compile_rule(rule)
+    return rule
+
+
+def test_rule_prefilter_keeps_order() -> None:
+    rules = [
+        _prefilter_rule("catch all"),
+        _prefilter_rule("disk", match="disk .* failed"),
+        _prefilter_rule("no literal", match="(a|b)"),
+        _prefilter_rule("cancelled", match="link down", match_ok="link up"),
+        _prefilter_rule("inverted", match="never", invert_matching=True),  # type: ignore[arg-type]
+        _prefilter_rule("short", match="ok"),
+    ]
+    prefilter = RulePrefilter([(rule, required_message_literals(rule)) for rule in rules])
+
+    def candidates(text: str) -> list[str | None]:
+        return [rule["id"] for rule in prefilter.candidates(text)]
+
+    assert candidates("Disk sda FAILED") == ["catch all", "disk", "no literal", "inverted"]
+    assert candidates("eth0: LINK UP, ok") == [
+        "catch all",
+        "no literal",
+        "cancelled",
+        "inverted",
+        "short",
+    ]
+    assert candidates("nothing") == ["catch all", "no literal", "inverted"]
+    # Non ASCII texts are not prefiltered
+    assert candidates("Disk sda ſailed") == [rule["id"] for rule in rules]
@@ -5,6 +5,12 @@
 
 import json
 import logging
+import pickle
+from pathlib import Path
+
+import cmk.ccc.store as _store
+
+from cmk.utils.sectionname import SectionName
 
 from cmk.fetchers import Mode
 from cmk.fetchers.filecache import MaxAge
@@ -24,6 +30,63 @@ class TestSectionStore:
             str,
         )
 
+    def test_store_and_load(self, tmp_path: Path) -> None:
+        sections = {
+            SectionName("one"): (1, 2, [["a", "b"], ["c"]]),
+            SectionName("two"): (3, 4, []),
+        }
+        section_store = SectionStore[list[list[str]]](
+            tmp_path / "store", logger=logging.getLogger("test")
+        )
+        section_store.store(sections)
+
+        assert (tmp_path / "store").read_bytes().startswith(b"CMKSECST")
+        assert section_store.load() == sections
+
+    def test_store_nothing_removes_file(self, tmp_path: Path) -> None:
+        section_store = SectionStore[list[list[str]]](
+            tmp_path / "store", logger=logging.getLogger("test")
+        )
+        section_store.store({SectionName("one"): (1, 2, [])})
+        section_store.store({})
+
+        assert not (tmp_path / "store").exists()
+        assert section_store.load() == {}
+
+    def test_load_pickle_format(self, tmp_path: Path) -> None:
+        _store.save_object_to_pickle_file(
+            tmp_path / "store",
+            {"one": (1, 2, [["a"]]), "old": (1, [["b"]])},
+        )
+        section_store = SectionStore[list[list[str]]](
+            tmp_path / "store", logger=logging.getLogger("test")
+        )
+
+        assert section_store.load() == {SectionName("one"): (1, 2, [["a"]])}
+
+    def test_update_does_not_unpickle_unused_sections(self, tmp_path: Path) -> None:
+        section_store = SectionStore[object](tmp_path / "store", logger=logging.getLogger("test"))
+        section_store.store({SectionName("live"): (0, 100, _Unpicklable())})
+
+        assert section_store.update(
+            {SectionName("live"): [["fresh"]]},
+            {},
+            lambda section_name: (10, 100),
+            lambda valid_until, now: valid_until < now,
+            now=10,
+            keep_outdated=True,
+        ) == {SectionName("live"): [["fresh"]]}
+        assert section_store.load() == {SectionName("live"): (10, 100, [["fresh"]])}
+
+
+class _Unpicklable:
+    def __reduce__(self) -> tuple[object, tuple[()]]:
+        return (_fail, ())
+
+
+def _fail() -> None:
+    raise pickle.UnpicklingError("must not be unpickled")
+
 
 class TestMaxAge:
     def test_repr(self) -> None:
@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import os
 import socket
+import sys
+import threading
 from collections.abc import Sequence, Sized
 from pathlib import Path
 from typing import Generic, NamedTuple, NoReturn, TypeAlias, TypeVar
@@ -20,6 +22,7 @@ from cmk.ccc.exceptions import MKFetcherError, MKTimeout, OnError
 
 import cmk.utils.resulttype as result
 from cmk.utils.agentdatatype import AgentRawData
+from cmk.utils.cpu_tracking import Snapshot
 from cmk.utils.hostaddress import HostAddress, HostName
 from cmk.utils.sectionname import SectionMap, SectionName
 
@@ -294,6 +297,27 @@ class TestProgramFetcher:
     def test_repr(self, fetcher: ProgramFetcher) -> None:
         assert isinstance(repr(fetcher), str)
 
+    def test_children_times_are_accounted_to_the_thread(self) -> None:
+        fetcher = ProgramFetcher(
+            cmdline=f"{sys.executable} -c 'sum(range(10**7))'",
+            stdin=None,
+            is_cmc=False,
+        )
+        snapshots = []
+
+        def fetch() -> None:
+            before = Snapshot.take_thread()
+            with fetcher:
+                fetcher.fetch(Mode.CHECKING)
+            snapshots.append(Snapshot.take_thread() - before)
+
+        thread = threading.Thread(target=fetch)
+        thread.start()
+        thread.join()
+
+        (duration,) = snapshots
+        assert duration.process.children_user + duration.process.children_system > 0.0
+
 
 class TestSNMPPluginStore:
     @pytest.fixture
@@ -444,6 +468,7 @@ class TestSNMPFetcherFetch:
         path: Path,
         sections: SectionMap[SNMPSectionMeta] | None = None,
         do_status_data_inventory: bool = False,
+        max_concurrent_walks: int = 1,
     ) -> SNMPFetcher:
         return SNMPFetcher(
             sections={} if sections is None else sections,
@@ -470,9 +495,49 @@ class TestSNMPFetcherFetch:
                 snmpv3_contexts=[],
                 character_encoding=None,
                 snmp_backend=SNMPBackendEnum.CLASSIC,
+                max_concurrent_walks=max_concurrent_walks,
             ),
         )
 
+    def test_fetch_from_io_prefetches_walks(self, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+        prefetched = []
+        monkeypatch.setattr(
+            snmp,
+            "prefetch_snmpwalks",
+            lambda trees, *, max_workers, **__: prefetched.append((list(trees), max_workers)),
+        )
+        monkeypatch.setattr(snmp, "get_snmp_table", lambda *_, **__: [["1"]])
+        section_name = SectionName("pum")
+        fetcher = self.create_fetcher(
+            path=tmp_path,
+            sections={
+                section_name: SNMPSectionMeta(
+                    checking=True,
+                    disabled=False,
+                    redetect=False,
+                    fetch_interval=None,
+                ),
+            },
+            max_concurrent_walks=3,
+        )
+        file_cache = SNMPFileCache(
+            path_template=os.devnull,
+            max_age=MaxAge.unlimited(),
+            simulation=False,
+            use_only_cache=False,
+            file_cache_mode=FileCacheMode.DISABLED,
+        )
+
+        assert get_raw_data(file_cache, fetcher, Mode.CHECKING) == result.OK(
+            {section_name: [[["1"]], [["1"]]]}
+        )
+        assert prefetched == [
+            (
+                [(section_name, tree) for tree in fetcher.plugin_store[section_name].trees],
+                3,
+            )
+        ]
+
     def test_fetch_from_io_non_empty(self, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
         table = [["1"]]
         monkeypatch.setattr(snmp, "get_snmp_table", lambda *_, **__: table)
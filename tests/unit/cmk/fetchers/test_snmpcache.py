@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# pylint: disable=protected-access
+
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from cmk.utils.hostaddress import HostAddress, HostName
+
+import cmk.fetchers._snmpcache as snmp_cache
+
+_HOST = HostName("switch")
+_ADDRESS = HostAddress("1.2.3.4")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    snmp_cache.cleanup_host_caches()
+    yield
+    snmp_cache.cleanup_host_caches()
+
+
+def _scan(tmp_path: Path, max_age: int, oids: dict[str, str | None]) -> None:
+    snmp_cache.initialize_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path, max_age=max_age)
+    snmp_cache.single_oid_cache().update(oids)
+    snmp_cache.write_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path)
+    snmp_cache.cleanup_host_caches()
+
+
+def test_not_loaded_without_max_age(tmp_path: Path) -> None:
+    _scan(tmp_path, 0, {".1": "one"})
+
+    snmp_cache.initialize_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path)
+    assert snmp_cache.single_oid_cache() == {}
+
+
+def test_loaded_within_max_age(tmp_path: Path) -> None:
+    _scan(tmp_path, 0, {".1": "one", ".2": None})
+
+    snmp_cache.initialize_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path, max_age=60)
+    assert snmp_cache.single_oid_cache() == {".1": "one", ".2": None}
+
+
+def test_expired(tmp_path: Path) -> None:
+    _scan(tmp_path, 0, {".1": "one"})
+    outdated = time.time() - 120
+    os.utime(tmp_path / f"{_HOST}.{_ADDRESS}", (outdated, outdated))
+
+    snmp_cache.initialize_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path, max_age=60)
+    assert snmp_cache.single_oid_cache() == {}
+
+
+def test_changed_address(tmp_path: Path) -> None:
+    _scan(tmp_path, 0, {".1": "one"})
+
+    snmp_cache.initialize_single_oid_cache(
+        _HOST, HostAddress("1.2.3.5"), cache_dir=tmp_path, max_age=60
+    )
+    assert snmp_cache.single_oid_cache() == {}
+
+
+def test_added_oids_keep_creation_time(tmp_path: Path) -> None:
+    _scan(tmp_path, 0, {".1": "one"})
+    created_at = time.time() - 30
+    cache_file = tmp_path / f"{_HOST}.{_ADDRESS}"
+    os.utime(cache_file, (created_at, created_at))
+
+    _scan(tmp_path, 60, {".2": "two"})
+
+    assert cache_file.stat().st_mtime == pytest.approx(created_at)
+    snmp_cache.initialize_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path, max_age=60)
+    assert snmp_cache.single_oid_cache() == {".1": "one", ".2": "two"}
+
+
+def test_invalidate(tmp_path: Path) -> None:
+    _scan(tmp_path, 0, {".1": "one"})
+
+    snmp_cache.invalidate_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path)
+
+    assert not (tmp_path / f"{_HOST}.{_ADDRESS}").exists()
+    snmp_cache.initialize_single_oid_cache(_HOST, _ADDRESS, cache_dir=tmp_path, max_age=60)
+    assert snmp_cache.single_oid_cache() == {}
@@ -28,3 +28,26 @@ def test__time_series_math_exc_symbol(args: tuple[Literal["%"], list[TimeSeries]
 def test__time_series_math_stable_singles(operator: Operators) -> None:
     test_ts = TimeSeries([0, 180, 60, 6, 5, 10, None, -2, -3.14])
     assert _time_series_math(operator, [test_ts]) == test_ts
+
+
+@pytest.mark.parametrize(
+    "operator, result",
+    [
+        ("+", [3, 2, 4, None]),
+        ("*", [2, None, 0, None]),
+        ("-", [-1, None, 4, None]),
+        ("/", [0.5, None, None, None]),
+        ("MAX", [2, 2, 4, None]),
+        ("MIN", [1, 2, 0, None]),
+        ("AVERAGE", [1.5, 2, 2, None]),
+        ("MERGE", [1, 2, 4, None]),
+    ],
+)
+def test__time_series_math_missing_values(operator: Operators, result: list[float | None]) -> None:
+    assert _time_series_math(
+        operator,
+        [
+            TimeSeries([1, None, 4, None], time_window=(0, 240, 60)),
+            TimeSeries([2, 2, 0, None], time_window=(0, 240, 60)),
+        ],
+    ) == TimeSeries(result, time_window=(0, 240, 60))
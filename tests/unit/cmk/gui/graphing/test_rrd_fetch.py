@@ -46,10 +46,9 @@ def _setup_livestatus(mock_livestatus: MockLiveStatusConnection) -> Iterator[Non
         )
         mock_live.expect_query(
             """GET services
-Columns: rrddata:temp:temp.max:1681985455:1681999855:20
+Columns: host_name service_description rrddata:temp:temp.max:1681985455:1681999855:20
 Filter: host_name = my-host
 Filter: service_description = Temperature Zone 6
-ColumnHeaders: off
 
             """,
             sites=["NO_SITE"],
@@ -136,6 +135,85 @@ def test_fetch_rrd_data_for_graph_with_conversion(
         }
 
 
+def test_fetch_rrd_data_for_graph_batches_services(
+    mock_livestatus: MockLiveStatusConnection,
+    request_context: None,
+) -> None:
+    column = "rrddata:temp:temp.max:1681985455:1681999855:20"
+    graph_recipe = _GRAPH_RECIPE.model_copy(
+        update={
+            "metrics": [
+                GraphMetric(
+                    title="Temperature",
+                    line_type="area",
+                    operation=MetricOpRRDSource(
+                        site_id=SiteId("NO_SITE"),
+                        host_name=HostName(host_name),
+                        service_name=service_name,
+                        metric_name="temp",
+                        consolidation_func_name="max",
+                        scale=1,
+                    ),
+                    color="#ffa000",
+                    unit="c",
+                )
+                for host_name, service_name in [
+                    ("my-host", "Temperature Zone 6"),
+                    ("other-host", "Temperature Zone 7"),
+                ]
+            ]
+        }
+    )
+    with mock_livestatus(expect_status_query=True) as mock_live:
+        mock_live.add_table(
+            "services",
+            [
+                {
+                    "host_name": "my-host",
+                    "service_description": "Temperature Zone 6",
+                    column: [1, 2, 3, 4, 5, None],
+                },
+                {
+                    "host_name": "other-host",
+                    "service_description": "Temperature Zone 7",
+                    column: [1, 2, 3, 6, 7, None],
+                },
+            ],
+        )
+        mock_live.expect_query(
+            f"""GET services
+Columns: host_name service_description {column}
+Filter: host_name = my-host
+Filter: service_description = Temperature Zone 6
+And: 2
+Filter: host_name = other-host
+Filter: service_description = Temperature Zone 7
+And: 2
+Or: 2
+
+            """,
+            sites=["NO_SITE"],
+        )
+        assert fetch_rrd_data_for_graph(graph_recipe, _GRAPH_DATA_RANGE) == {
+            RRDDataKey(
+                SiteId("NO_SITE"),
+                HostName("my-host"),
+                "Temperature Zone 6",
+                "temp",
+                "max",
+                1,
+            ): TimeSeries([4, 5, None], time_window=(1, 2, 3)),
+            RRDDataKey(
+                SiteId("NO_SITE"),
+                HostName("other-host"),
+                "Temperature Zone 7",
+                "temp",
+                "max",
+                1,
+            ): TimeSeries([6, 7, None], time_window=(1, 2, 3)),
+        }
+
+
 def test_translate_and_merge_rrd_columns() -> None:
     assert translate_and_merge_rrd_columns(
         MetricName("my_metric"),
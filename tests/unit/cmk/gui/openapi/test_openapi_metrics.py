@@ -44,7 +44,7 @@ def test_openapi_get_graph_graph(
         "GET services\nColumns: perf_data metrics check_command\nFilter: host_name = heute\nFilter: service_description = CPU load\nColumnHeaders: off"
     )
     mock_livestatus.expect_query(
-        "GET services\nColumns: rrddata:load1:load1.average:0:30:60\nFilter: host_name = heute\nFilter: service_description = CPU load\nColumnHeaders: off"
+        "GET services\nColumns: host_name service_description rrddata:load1:load1.average:0:30:60\nFilter: host_name = heute\nFilter: service_description = CPU load"
     )
     with mock_livestatus():
         resp = aut_user_auth_wsgi_app.post(
@@ -103,7 +103,7 @@ def test_openapi_get_graph_metric(
         "GET services\nColumns: perf_data metrics check_command\nFilter: host_name = heute\nFilter: service_description = CPU load\nColumnHeaders: off"
     )
     mock_livestatus.expect_query(
-        "GET services\nColumns: rrddata:load1:load1.average:1:2:60\nFilter: host_name = heute\nFilter: service_description = CPU load\nColumnHeaders: off"
+        "GET services\nColumns: host_name service_description rrddata:load1:load1.average:1:2:60\nFilter: host_name = heute\nFilter: service_description = CPU load"
     )
     with mock_livestatus():
         resp = aut_user_auth_wsgi_app.post(
@@ -162,7 +162,7 @@ def test_openapi_get_graph_metric_without_site(
         "GET services\nColumns: perf_data metrics check_command\nFilter: host_name = heute\nFilter: service_description = CPU load\nColumnHeaders: off"
     )
     mock_livestatus.expect_query(
-        "GET services\nColumns: rrddata:load1:load1.average:1:2:60\nFilter: host_name = heute\nFilter: service_description = CPU load\nColumnHeaders: off"
+        "GET services\nColumns: host_name service_description rrddata:load1:load1.average:1:2:60\nFilter: host_name = heute\nFilter: service_description = CPU load"
     )
     with mock_livestatus():
         resp = api_client.get_graph(
@@ -3,6 +3,7 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import os
 from pathlib import Path
 
 import pytest
@@ -11,7 +12,7 @@ from cmk.ccc.exceptions import MKGeneralException
 
 import cmk.utils
 from cmk.utils.hostaddress import HostName
-from cmk.utils.structured_data import ImmutableTree
+from cmk.utils.structured_data import ImmutableTree, MutableTree, TreeOrArchiveStore
 
 from cmk.gui.inventory._history import get_history, load_delta_tree, load_latest_delta_tree
 
@@ -210,3 +211,36 @@ def test_load_latest_delta_tree_one_archive_and_no_inv_tree(request_context: Non
     delta_tree = load_latest_delta_tree(hostname)
 
     assert delta_tree is not None
+
+
+def _make_mutable_tree(tree: ImmutableTree) -> MutableTree:
+    mutable_tree = MutableTree()
+    mutable_tree.add(path=(), pairs=[tree.attributes.pairs])
+    return mutable_tree
+
+
+def test_get_history_from_delta_history(request_context: None) -> None:
+    hostname = HostName("inv-host")
+    tree_or_archive_store = TreeOrArchiveStore(
+        cmk.utils.paths.inventory_output_dir,
+        cmk.utils.paths.inventory_archive_dir,
+        cmk.utils.paths.inventory_delta_cache_dir,
+    )
+    for timestamp, raw_tree in [(1, {"inv": "attr-1"}), (2, {"inv": "attr-2"})]:
+        tree_or_archive_store.save(
+            host_name=hostname, tree=_make_mutable_tree(ImmutableTree.deserialize(raw_tree))
+        )
+        os.utime(Path(cmk.utils.paths.inventory_output_dir, hostname), (timestamp, timestamp))
+        tree_or_archive_store.archive(host_name=hostname)
+
+    # The archived trees are not loaded anymore
+    for timestamp in ("1", "2"):
+        Path(cmk.utils.paths.inventory_archive_dir, hostname, timestamp).write_text("corrupted")
+
+    history, corrupted_history_files = get_history(hostname)
+
+    assert [(e.timestamp, e.new, e.changed, e.removed) for e in history] == [
+        (1, 1, 0, 0),
+        (2, 0, 1, 0),
+    ]
+    assert not corrupted_history_files
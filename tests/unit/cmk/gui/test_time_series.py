@@ -79,6 +79,18 @@ def test_time_series_downsampling(
     assert ts.downsample(twindow, cf) == downsampled
 
 
+def test_time_series_downsampling_long_range() -> None:
+    # A year of minute values, every tenth one missing
+    ts = TimeSeries(
+        [None if i % 10 == 0 else float(i) for i in range(365 * 24 * 60)],
+        time_window=(0, 365 * 24 * 3600, 60),
+    )
+    downsampled = ts.downsample((0, 365 * 24 * 3600, 3600), "average")
+    assert len(downsampled) == 365 * 24
+    assert downsampled[0] == sum(i for i in range(60) if i % 10) / 54
+    assert ts.downsample((0, 365 * 24 * 3600, 86400), "max")[-1] == 365 * 24 * 60 - 1
+
+
 class TestTimeseries:
     def test_conversion(self) -> None:
         assert TimeSeries(
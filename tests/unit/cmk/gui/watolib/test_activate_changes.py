@@ -388,6 +388,45 @@ def test_get_config_sync_file_infos() -> None:
     }
 
 
+def test_get_config_sync_file_infos_with_file_hash_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(activate_changes._FileHashCache, "_MIN_AGE_NS", -1)
+    base_dir = cmk.utils.paths.omd_root / "replication"
+    _create_get_config_sync_file_infos_test_config(base_dir)
+    replication_paths = [
+        ReplicationPath("dir", "d3-single-file", "etc/d3", []),
+        ReplicationPath("dir", "d4-multiple-files", "etc/d4", []),
+    ]
+    cache_path = tmp_path / "file_hashes.pkl"
+
+    cache = activate_changes._FileHashCache(cache_path)
+    sync_infos = activate_changes._get_config_sync_file_infos(
+        replication_paths, base_dir, file_hash_cache=cache
+    )
+    cache.save()
+    assert (cache.hits, cache.misses) == (0, len(sync_infos))
+    assert sync_infos == activate_changes._get_config_sync_file_infos(replication_paths, base_dir)
+
+    cache = activate_changes._FileHashCache(cache_path)
+    assert (
+        activate_changes._get_config_sync_file_infos(
+            replication_paths, base_dir, file_hash_cache=cache
+        )
+        == sync_infos
+    )
+    cache.save()
+    assert (cache.hits, cache.misses) == (len(sync_infos), 0)
+
+    base_dir.joinpath("etc/d3/xyz").write_text("Dang", encoding="utf-8")
+    cache = activate_changes._FileHashCache(cache_path)
+    sync_infos = activate_changes._get_config_sync_file_infos(
+        replication_paths, base_dir, file_hash_cache=cache
+    )
+    assert (cache.hits, cache.misses) == (len(sync_infos) - 1, 1)
+    assert sync_infos == activate_changes._get_config_sync_file_infos(replication_paths, base_dir)
+
+
 def _create_get_config_sync_file_infos_test_config(base_dir: Path) -> None:
     base_dir.joinpath("etc/d1").mkdir(parents=True, exist_ok=True)
 
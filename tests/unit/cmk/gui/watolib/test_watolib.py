@@ -118,6 +118,7 @@ def test_registered_configvars() -> None:
         "housekeeping_interval",
         "sqlite_housekeeping_interval",
         "sqlite_freelist_size",
+        "sqlite_write_behind",
         "user_security_notification_duration",
         "http_proxies",
         "inventory_check_autotrigger",
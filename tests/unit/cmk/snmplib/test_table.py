@@ -262,3 +262,84 @@ def test_walk_raises_on_timeout_without_snmpv3_context_stop_on_timeout() -> None
         )
 
     assert type(excinfo.value) is SNMPContextTimeout  # pylint: disable=unidiomatic-typecheck
+
+
+class _CountingBackend(SNMPTestBackend):
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)
+        self.walked: list[str] = []
+
+    def walk(self, /, oid, *, context, **kw):
+        self.walked.append(oid)
+        return super().walk(oid, context=context, **kw)
+
+
+def test_prefetch_snmpwalks_table_unchanged() -> None:
+    tree = BackendSNMPTree(
+        base=".1.3.6.1.2.1.2.2.1",
+        oids=[
+            BackendOIDSpec(SpecialColumn.END, "string", False),
+            BackendOIDSpec("2", "string", False),
+            BackendOIDSpec("10", "binary", False),
+        ],
+    )
+    expected = get_snmp_table(
+        section_name=SectionName("unit_test"),
+        tree=tree,
+        walk_cache={},
+        backend=SNMPTestBackend(SNMPConfig, logger),
+        log=logger.debug,
+    )
+
+    backend = _CountingBackend(SNMPConfig, logger)
+    walk_cache: dict = {}
+    _snmp_table.prefetch_snmpwalks(
+        [(SectionName("unit_test"), tree)],
+        walk_cache=walk_cache,
+        backend=backend,
+        max_workers=4,
+        log=logger.debug,
+    )
+    assert sorted(backend.walked) == [".1.3.6.1.2.1.2.2.1.10", ".1.3.6.1.2.1.2.2.1.2"]
+
+    assert (
+        get_snmp_table(
+            section_name=SectionName("unit_test"),
+            tree=tree,
+            walk_cache=walk_cache,
+            backend=backend,
+            log=logger.debug,
+        )
+        == expected
+    )
+    assert len(backend.walked) == 2
+
+
+def test_prefetch_snmpwalks_deduplicates() -> None:
+    tree = BackendSNMPTree(base=".1.2", oids=[BackendOIDSpec("3", "string", False)])
+    backend = _CountingBackend(SNMPConfig, logger)
+
+    _snmp_table.prefetch_snmpwalks(
+        [(SectionName("one"), tree), (SectionName("two"), tree)],
+        walk_cache={},
+        backend=backend,
+        max_workers=2,
+        log=logger.debug,
+    )
+
+    assert backend.walked == [".1.2.3"]
+
+
+def test_prefetch_snmpwalks_raises() -> None:
+    class FailingBackend(SNMPTestBackend):
+        def walk(self, /, oid, *, context, **kw):
+            raise MKSNMPError("timeout")
+
+    with pytest.raises(MKSNMPError):
+        _snmp_table.prefetch_snmpwalks(
+            [(None, BackendSNMPTree(base=".1.2", oids=[BackendOIDSpec("3", "string", False)]))],
+            walk_cache={},
+            backend=FailingBackend(SNMPConfig, logger),
+            max_workers=2,
+            log=logger.debug,
+        )
@@ -5,6 +5,7 @@
 
 # pylint: disable=protected-access
 
+import os
 import pprint
 
 import cmk.utils.log
@@ -48,6 +49,65 @@ def test_store_piggyback_raw_data_simple() -> None:
     assert stored.raw_data == b"line1\nline2\n"
 
 
+def test_store_piggyback_raw_data_from_writer() -> None:
+    writer = piggyback.PiggybackRawDataWriter(HostAddress("source"), cmk.utils.paths.omd_root)
+    writer.append(_TEST_HOST_NAME, [b"line1"])
+    writer.append(HostAddress("other-host"), [])
+    writer.append(_TEST_HOST_NAME, [b"line2"])
+
+    assert not piggyback.get_piggyback_raw_data(_TEST_HOST_NAME, cmk.utils.paths.omd_root)
+    assert dict(writer) == {_TEST_HOST_NAME: [b"line1", b"line2"], HostAddress("other-host"): []}
+
+    piggyback.store_piggyback_raw_data(
+        HostAddress("source"), writer, timestamp=_REF_TIME, omd_root=cmk.utils.paths.omd_root
+    )
+
+    stored = _get_only_raw_data_element(_TEST_HOST_NAME)
+    assert stored.meta.last_update == _REF_TIME
+    assert stored.raw_data == b"line1\nline2\n"
+    assert _get_only_raw_data_element(HostAddress("other-host")).raw_data == b"\n"
+
+
+def test_unstored_writer_removes_its_files() -> None:
+    writer = piggyback.PiggybackRawDataWriter(HostAddress("source"), cmk.utils.paths.omd_root)
+    writer.append(_TEST_HOST_NAME, [b"line1"])
+    host_dir = cmk.utils.paths.omd_root / "tmp/check_mk/piggyback" / _TEST_HOST_NAME
+    assert list(host_dir.iterdir())
+
+    del writer
+
+    assert not list(host_dir.iterdir())
+
+
+def test_writer_rollback() -> None:
+    writer = piggyback.PiggybackRawDataWriter(HostAddress("source"), cmk.utils.paths.omd_root)
+    writer.append(_TEST_HOST_NAME, [b"line1"])
+    savepoint = writer.savepoint()
+    writer.append(_TEST_HOST_NAME, [b"line2"])
+    writer.append(HostAddress("other-host"), [b"line3"])
+
+    writer.rollback(savepoint)
+
+    assert dict(writer) == {_TEST_HOST_NAME: [b"line1"]}
+    host_dir = cmk.utils.paths.omd_root / "tmp/check_mk/piggyback/other-host"
+    assert not list(host_dir.iterdir())
+
+
+def test_cleanup_removes_old_temporary_files() -> None:
+    writer = piggyback.PiggybackRawDataWriter(HostAddress("source"), cmk.utils.paths.omd_root)
+    writer.append(_TEST_HOST_NAME, [b"line1"])
+    writer._finalizer.detach()  # as if the process had been killed
+    host_dir = cmk.utils.paths.omd_root / "tmp/check_mk/piggyback" / _TEST_HOST_NAME
+    (temporary_file,) = host_dir.iterdir()
+
+    piggyback.cleanup_piggyback_files(_REF_TIME, cmk.utils.paths.omd_root)
+    assert temporary_file.exists()
+
+    os.utime(temporary_file, (_REF_TIME - 10, _REF_TIME - 10))
+    piggyback.cleanup_piggyback_files(_REF_TIME, cmk.utils.paths.omd_root)
+    assert not host_dir.exists()
+
+
 def test_get_piggyback_raw_data_not_updated() -> None:
     piggyback.store_piggyback_raw_data(
         HostAddress("source1"), {_TEST_HOST_NAME: _PAYLOAD}, _REF_TIME, cmk.utils.paths.omd_root
@@ -209,3 +269,21 @@ def test_last_distribution_time() -> None:
         )
         == _REF_TIME
     )
+
+
+def test_get_piggyback_meta_data() -> None:
+    piggyback.store_piggyback_raw_data(
+        HostAddress("source1"), {_TEST_HOST_NAME: _PAYLOAD}, _REF_TIME, cmk.utils.paths.omd_root
+    )
+    piggyback.store_piggyback_raw_data(
+        HostAddress("source2"),
+        {HostAddress("some-other-host"): _PAYLOAD},
+        _REF_TIME,
+        cmk.utils.paths.omd_root,
+    )
+
+    assert [
+        m.source
+        for m in piggyback.get_piggyback_meta_data(_TEST_HOST_NAME, cmk.utils.paths.omd_root)
+    ] == [HostAddress("source1")]
+    assert not piggyback.get_piggyback_meta_data(HostAddress("no-host"), cmk.utils.paths.omd_root)
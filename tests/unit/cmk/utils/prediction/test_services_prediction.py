@@ -15,6 +15,8 @@ from livestatus import RRDResponse
 
 from cmk.utils.prediction import _prediction
 
+from cmk.agent_based.prediction_backend import PredictionInfo, PredictionParameters
+
 
 def _load_fake_rrd_response(start: int, end: int) -> RRDResponse:
     raw = json.loads(
@@ -176,24 +178,26 @@ def _load_fake_rrd_response(start: int, end: int) -> RRDResponse:
         ),
     ],
 )
-def test_calculate_data_for_prediction(
+def test_compute_prediction(
+    monkeypatch: pytest.MonkeyPatch,
     timezone: str,
     timegroup: str,
     time_windows: list[tuple[int, int]],
 ) -> None:
+    monkeypatch.setattr(_prediction, "time_slices", lambda *_args: time_windows)
     from_time = time_windows[0][0]
+    info = PredictionInfo(
+        valid_interval=(from_time, from_time + 86400),
+        metric="CPU load",
+        direction="upper",
+        params=PredictionParameters(period="wday", horizon=90, levels=("absolute", (1.0, 2.0))),
+    )
 
-    raw_slices = [
-        (
-            response.window,
-            response.values,
-            from_time - start,
-        )
-        for start, end in time_windows
-        for response in [_load_fake_rrd_response(start, end)]
-    ]
-
-    data_for_pred = _prediction._calculate_data_for_prediction(raw_slices[0][0], raw_slices)
+    computed = _prediction.compute_prediction(
+        info, lambda _metric, start, end: _load_fake_rrd_response(start, end), from_time
+    )
+    assert computed is not None
+    data_for_pred = computed[0]
 
     expected_reference = _prediction.PredictionData.model_validate_json(
         (
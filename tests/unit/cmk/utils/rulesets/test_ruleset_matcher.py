@@ -14,9 +14,14 @@ from pytest import MonkeyPatch
 from tests.testlib.base import Scenario
 
 from cmk.utils.hostaddress import HostName
-from cmk.utils.labels import BuiltinHostLabelsStore
+from cmk.utils.labels import BuiltinHostLabelsStore, LabelGroups
+from cmk.utils.rulesets.conditions import HostOrServiceConditions
 from cmk.utils.rulesets.ruleset_matcher import (
+    _HostIndex,
     LabelManager,
+    matches_host_name,
+    matches_host_tags,
+    matches_labels,
     matches_tag_condition,
     RuleConditionsSpec,
     RulesetMatcher,
@@ -868,3 +873,196 @@ def test_matches_tag_condition(
         )
         is expected_result
     )
+
+
+_INDEXED_HOSTS = {
+    HostName("web1"): (
+        {TagGroupID("os"): TagID("lnx"), TagGroupID("crit"): TagID("prod")},
+        "/dc1/web/",
+        {"env": "prod"},
+    ),
+    HostName("web2"): (
+        {TagGroupID("os"): TagID("lnx"), TagGroupID("crit"): TagID("test")},
+        "/dc1/web/",
+        {"env": "test"},
+    ),
+    HostName("db1"): (
+        {TagGroupID("os"): TagID("win"), TagGroupID("crit"): TagID("prod")},
+        "/dc1/db/",
+        {"env": "prod", "db": "mssql"},
+    ),
+    HostName("sw1"): ({TagGroupID("snmp"): TagID("v2")}, "/dc2/", {}),
+    HostName(""): ({}, "/", {}),
+}
+
+
+@pytest.fixture(name="host_index")
+def fixture_host_index() -> _HostIndex:
+    return _HostIndex(
+        list(_INDEXED_HOSTS),
+        {hn: set(tags.items()) for hn, (tags, _path, _labels) in _INDEXED_HOSTS.items()},
+        {hn: path for hn, (_tags, path, _labels) in _INDEXED_HOSTS.items()},
+        lambda hn: _INDEXED_HOSTS[hn][2],
+    )
+
+
+@pytest.mark.parametrize(
+    "tag_conditions",
+    [
+        {TagGroupID("os"): TagID("lnx")},
+        {TagGroupID("os"): {"$ne": TagID("lnx")}},
+        {TagGroupID("os"): TagID("lnx"), TagGroupID("crit"): TagID("prod")},
+        {TagGroupID("crit"): {"$or": [TagID("prod"), TagID("test")]}},
+        {TagGroupID("crit"): {"$nor": [TagID("prod"), TagID("test")]}},
+        {TagGroupID("unknown"): TagID("tag")},
+    ],
+)
+def test_host_index_match_tags(
+    host_index: _HostIndex, tag_conditions: Mapping[TagGroupID, TagCondition]
+) -> None:
+    assert host_index.hosts(host_index.match_tags(tag_conditions, host_index.all)) == {
+        hn
+        for hn, (tags, _path, _labels) in _INDEXED_HOSTS.items()
+        if matches_host_tags(set(tags.items()), tag_conditions)
+    }
+
+
+@pytest.mark.parametrize(
+    "host_entries",
+    [
+        ["web1", "sw1", "unknown"],
+        [{"$regex": "web"}, "db1"],
+        {"$nor": ["web1", {"$regex": ".*1$"}]},
+        [""],
+        {"$nor": [""]},
+        ["a b", "@all", "web1"],
+    ],
+)
+def test_host_index_match_host_names(
+    host_index: _HostIndex, host_entries: HostOrServiceConditions
+) -> None:
+    assert host_index.hosts(host_index.match_host_names(host_entries, host_index.all)) == {
+        hn for hn in _INDEXED_HOSTS if matches_host_name(host_entries, hn)
+    }
+
+
+@pytest.mark.parametrize(
+    "label_groups",
+    [
+        [("and", [("and", "env:prod")])],
+        [("and", [("and", "env:prod"), ("not", "db:mssql")])],
+        [("and", [("not", "env:prod")]), ("or", [("and", "db:mssql")])],
+        [("and", [("and", "env:test"), ("or", "db:mssql")]), ("not", [("and", "env:prod")])],
+    ],
+)
+def test_host_index_match_labels(host_index: _HostIndex, label_groups: LabelGroups) -> None:
+    assert host_index.hosts(host_index.match_labels(label_groups, host_index.all)) == {
+        hn
+        for hn, (_tags, _path, labels) in _INDEXED_HOSTS.items()
+        if matches_labels(labels, label_groups)
+    }
+
+
+def test_host_index_match_folder(host_index: _HostIndex) -> None:
+    assert host_index.hosts(host_index.match_folder("/dc1/")) == {"web1", "web2", "db1"}
+    assert host_index.hosts(host_index.match_folder("/")) == set(_INDEXED_HOSTS)
+
+
+def test_host_index_labels_are_indexed_on_demand() -> None:
+    computed: list[HostName] = []
+
+    def labels_of_host(hostname: HostName) -> Mapping[str, str]:
+        computed.append(hostname)
+        return _INDEXED_HOSTS[hostname][2]
+
+    host_index = _HostIndex(list(_INDEXED_HOSTS), {}, {}, labels_of_host)
+    candidates = host_index.bits([HostName("web1"), HostName("db1")])
+
+    assert host_index.hosts(
+        host_index.match_labels([("and", [("and", "env:prod")])], candidates)
+    ) == {"web1", "db1"}
+    host_index.match_labels([("and", [("and", "db:mssql")])], candidates)
+    assert sorted(computed) == ["db1", "web1"]
+
+
+def _service_cache_matcher(service_values_cache_size: int = 100) -> RulesetMatcher:
+    hosts = [HostName("host1"), HostName("host2"), HostName("host3")]
+    return RulesetMatcher(
+        host_tags={
+            HostName("host1"): {TagGroupID("crit"): TagID("prod")},
+            HostName("host2"): {TagGroupID("crit"): TagID("prod")},
+            HostName("host3"): {TagGroupID("crit"): TagID("test")},
+        },
+        host_paths={},
+        label_manager=LabelManager(
+            explicit_host_labels={},
+            host_label_rules=(),
+            service_label_rules=(),
+            discovered_labels_of_service=lambda *args, **kw: {},
+        ),
+        all_configured_hosts=hosts,
+        clusters_of={},
+        nodes_of={},
+        builtin_host_labels_store=BuiltinHostLabelsStore(),
+        service_values_cache_size=service_values_cache_size,
+    )
+
+
+_service_ruleset: Sequence[RuleSpec[str]] = [
+    {
+        "id": "prod",
+        "value": "prod-if",
+        "condition": {
+            "host_tags": {TagGroupID("crit"): TagID("prod")},
+            "service_description": [{"$regex": "Interface"}],
+        },
+    },
+    {
+        "id": "all",
+        "value": "all-cpu",
+        "condition": {"service_description": [{"$regex": "CPU"}]},
+    },
+]
+
+
+def _values(matcher: RulesetMatcher, hostname: str, service: str) -> Sequence[str]:
+    return list(
+        matcher.get_service_ruleset_values(
+            RulesetMatchObject(HostName(hostname), ServiceName(service), {}), _service_ruleset
+        )
+    )
+
+
+def test_service_values_cache_shared_between_hosts_with_same_rules() -> None:
+    matcher = _service_cache_matcher()
+
+    assert _values(matcher, "host1", "Interface 1") == ["prod-if"]
+    assert _values(matcher, "host2", "Interface 1") == ["prod-if"]
+    assert _values(matcher, "host3", "Interface 1") == []
+    assert _values(matcher, "host3", "CPU load") == ["all-cpu"]
+
+    stats = matcher.service_values_cache_stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 3, 0)
+
+
+def test_service_values_cache_rules_of_host_are_computed_once() -> None:
+    matcher = _service_cache_matcher()
+
+    for hostname in ("host1", "host2", "host3"):
+        for service in ("Interface 1", "Interface 2", "CPU load"):
+            _values(matcher, hostname, service)
+
+    assert len(matcher._host_rules_cache) == 3
+    # host1 and host2 have the same rules
+    assert len(matcher._host_rules_ids) == 2
+
+
+def test_service_values_cache_lru_eviction() -> None:
+    matcher = _service_cache_matcher(service_values_cache_size=2)
+
+    for service in ("Interface 1", "Interface 2", "Interface 1", "Interface 3", "Interface 1"):
+        _values(matcher, "host1", service)
+
+    stats = matcher.service_values_cache_stats()
+    # "Interface 1" has been used most recently when "Interface 3" was added.
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 3, 1)
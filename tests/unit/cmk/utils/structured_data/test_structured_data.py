@@ -4,6 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import gzip
+import os
 import shutil
 from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
@@ -17,6 +18,7 @@ from cmk.utils.hostaddress import HostName
 from cmk.utils.structured_data import (
     _MutableAttributes,
     _MutableTable,
+    DeltaHistoryStore,
     ImmutableAttributes,
     ImmutableDeltaTree,
     ImmutableTable,
@@ -29,6 +31,7 @@ from cmk.utils.structured_data import (
     SDNodeName,
     SDPath,
     SDRetentionFilterChoices,
+    TreeOrArchiveStore,
     TreeStore,
     UpdateResult,
 )
@@ -1046,6 +1049,81 @@ def test_save_and_load_real_tree(tree_name: HostName, tmp_path: Path) -> None:
         shutil.rmtree(str(tmp_path))
 
 
+@pytest.mark.parametrize(
+    "paths",
+    [
+        pytest.param([(SDNodeName("hardware"), SDNodeName("cpu"))], id="attributes"),
+        pytest.param([(SDNodeName("software"), SDNodeName("packages"))], id="table"),
+        pytest.param(
+            [(SDNodeName("hardware"),), (SDNodeName("networking"), SDNodeName("interfaces"))],
+            id="several",
+        ),
+        pytest.param([(SDNodeName("unknown"),)], id="unknown"),
+    ],
+)
+def test_save_and_load_subtrees(paths: Sequence[SDPath], tmp_path: Path) -> None:
+    orig_tree = _get_tree_store().load(host_name=HostName("tree_new_heute"))
+    tree_store = TreeStore(tmp_path / "inventory")
+    tree_store.save(host_name=HostName("foo"), tree=_make_mutable_tree(orig_tree))
+    assert (tmp_path / "inventory" / "foo.idx").exists()
+
+    loaded_tree = tree_store.load(host_name=HostName("foo"), paths=paths)
+    assert len(loaded_tree) == sum(len(orig_tree.get_tree(path)) for path in paths)
+    for path in paths:
+        assert loaded_tree.get_tree(path) == orig_tree.get_tree(path)
+
+    assert tree_store.load(host_name=HostName("bar"), paths=paths) == ImmutableTree()
+
+    # Fall back to the tree file if the index is missing
+    (tmp_path / "inventory" / "foo.idx").unlink()
+    assert tree_store.load(host_name=HostName("foo"), paths=paths) == loaded_tree
+
+
+def test_load_subtrees_ignores_stale_index(tmp_path: Path) -> None:
+    path = (SDNodeName("node"),)
+    tree_store = TreeStore(tmp_path / "inventory")
+    tree = MutableTree()
+    tree.add(path=path, pairs=[{SDKey("key"): "old"}])
+    tree_store.save(host_name=HostName("foo"), tree=tree)
+    index = (tmp_path / "inventory" / "foo.idx").read_bytes()
+
+    tree = MutableTree()
+    tree.add(path=path, pairs=[{SDKey("key"): "new"}])
+    tree_store.save(host_name=HostName("foo"), tree=tree)
+    # The index of the former tree file is newer than the current tree file
+    (tmp_path / "inventory" / "foo.idx").write_bytes(index)
+    os.utime(tmp_path / "inventory" / "foo", (0, 0))
+
+    loaded_tree = tree_store.load(host_name=HostName("foo"), paths=[path])
+    assert loaded_tree.get_attribute(path, SDKey("key")) == "new"
+
+
+def test_archive_appends_delta_history(tmp_path: Path) -> None:
+    host_name = HostName("heute")
+    tree_or_archive_store = TreeOrArchiveStore(
+        tmp_path / "inventory", tmp_path / "archive", tmp_path / "delta_cache"
+    )
+    for timestamp in (100, 200):
+        tree = MutableTree()
+        tree.add(path=(SDNodeName("node"),), pairs=[{SDKey("key"): timestamp}])
+        tree_or_archive_store.save(host_name=host_name, tree=tree)
+        os.utime(tmp_path / "inventory" / str(host_name), (timestamp, timestamp))
+        tree_or_archive_store.archive(host_name=host_name)
+
+    indexed_deltas = DeltaHistoryStore(tmp_path / "delta_cache").load(host_name=host_name)
+
+    assert list(indexed_deltas) == [(None, 100), (100, 200)]
+    first, second = indexed_deltas.values()
+    assert (first.new, first.changed, first.removed) == (1, 0, 0)
+    assert (second.new, second.changed, second.removed) == (0, 1, 0)
+    archive_store = TreeStore(tmp_path / "archive" / str(host_name))
+    assert second.delta_tree.serialize() == (
+        archive_store.load(host_name=HostName("200"))
+        .difference(archive_store.load(host_name=HostName("100")))
+        .serialize()
+    )
+
+
 @pytest.mark.parametrize(
     "tree_name, result",
     [
@@ -4,10 +4,12 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import json
+import resource
+import threading
 
 import pytest
 
-from cmk.utils.cpu_tracking import Snapshot
+from cmk.utils.cpu_tracking import add_child_usage, Snapshot
 
 
 def json_identity(serializable: object) -> object:
@@ -50,3 +52,25 @@ class TestCpuTracking:
 
     def test_json_serialization_now(self, now: Snapshot) -> None:
         assert Snapshot.deserialize(json_identity(now.serialize())) == now
+
+    def test_take_thread_children_times(self) -> None:
+        snapshots = []
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+
+        def take() -> None:
+            snapshots.append(Snapshot.take_thread())
+            add_child_usage(usage)
+            snapshots.append(Snapshot.take_thread())
+
+        thread = threading.Thread(target=take)
+        thread.start()
+        thread.join()
+
+        before, after = snapshots
+        assert before.process.children_user == 0.0
+        assert before.process.children_system == 0.0
+        assert before.process.elapsed > 0.0
+        assert after.process.children_user == usage.ru_utime
+        assert after.process.children_system == usage.ru_stime
+        # Other threads are not affected
+        assert Snapshot.take_thread().process.children_user == 0.0
@@ -10,6 +10,8 @@
 import errno
 import socket
 import ssl
+import threading
+import time
 from collections.abc import Sequence
 from contextlib import closing
 from pathlib import Path
@@ -341,3 +343,73 @@ def test_livestatus_lql(
     result: str,
 ) -> None:
     assert livestatus.livestatus_lql(*args) == result
+
+
+def _serve_livestatus(path: Path, *responses: bytes | None) -> socket.socket:
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def serve() -> None:
+        connection, _address = server.accept()
+        with connection:
+            for response in responses:
+                request = b""
+                while not request.endswith(b"\n\n"):
+                    request += connection.recv(4096)
+                if response is None:  # never answer
+                    connection.recv(1)
+                    return
+                connection.sendall(b"200 %11d\n" % len(response) + response)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server
+
+
+def test_query_parallel_marks_late_sites_dead(tmp_path: Path) -> None:
+    with (
+        closing(_serve_livestatus(tmp_path / "fast", b"[['fast']]\n")),
+        closing(_serve_livestatus(tmp_path / "slow", None)),
+    ):
+        connection = livestatus.MultiSiteConnection(
+            livestatus.SiteConfigurations(
+                {
+                    livestatus.SiteId("slow"): {
+                        "socket": f"unix:{tmp_path / 'slow'}",
+                        "timeout": 1,
+                    },
+                    livestatus.SiteId("fast"): {
+                        "socket": f"unix:{tmp_path / 'fast'}",
+                        "timeout": 5,
+                    },
+                }
+            )
+        )
+        connection.set_prepend_site(True)
+
+        start = time.monotonic()
+        assert connection.query("GET hosts\nColumns: name") == [["fast", "fast"]]
+        assert time.monotonic() - start < 3
+
+    assert connection.alive_sites() == ["fast"]
+    assert "No response" in str(connection.dead_sites()["slow"]["exception"])
+
+
+def test_query_stream_yields_rows_while_receiving(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("cmk.livestatus_client.STREAM_CHUNK_SIZE", 7)
+    response = b"[['heute', b'a,\\nb'],\n['gestern', 1],\n['morgen', [1, 2]]]\n"
+    with closing(_serve_livestatus(tmp_path / "live", response, response, b"[]\n")):
+        connection = livestatus.SingleSiteConnection(
+            f"unix:{tmp_path / 'live'}", livestatus.SiteId("local")
+        )
+
+        rows = connection.iter_table("GET hosts\nColumns: name state")
+        assert next(rows) == ["heute", b"a,\nb"]
+        rows.close()  # the rest of the response is discarded
+
+        assert list(connection.iter_table("GET hosts\nColumns: name state")) == [
+            ["heute", b"a,\nb"],
+            ["gestern", 1],
+            ["morgen", [1, 2]],
+        ]
+        assert not list(connection.iter_table("GET hosts\nColumns: name state"))